@@ -1,114 +1,327 @@
-import csv
 import os
 import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
 import asyncio
+import time
 from datetime import datetime
 from tqdm import tqdm
-from urllib.parse import unquote
+from resilient_fetch import ResilientFetcher, FetchError
+from download_metrics import DownloadMetrics, SNAPSHOT_INTERVAL
+from download_manifest import ManifestWriter, StreamHasher, MANIFEST_NAME
+from url_inventory import build_inventory, normalize_url, get_file_name, INVENTORY_NAME
+from download_scheduler import (
+    DownloadScheduler, probe_sizes, BANDWIDTH_LIMIT, MAX_LARGE_TRANSFERS
+)
+from passed.rate_limit import TokenBucket
+from download_sync import SyncState, scan_files, SYNC_STATE_NAME
+from download_layout import FileLayout, LAYOUT_MIRROR, LAYOUT_MANIFEST_NAME
+from download_archive import ArchiveWriter, new_spool, ARCHIVE_SIZE
+from passed.event_log import EventLog, default_log, CONSOLE_SAMPLE_EVERY
 
-def is_bubble_url(value: str) -> bool:
+# 동시에 받을 파일 수
+CONCURRENCY = 8
+
+# 매니페스트에 MD5도 기록할지 여부 (S3 ETag 비교용)
+COMPUTE_MD5 = False
+
+# 다운로드 전에 HEAD 요청으로 파일 크기를 확인할지 여부 (큰 파일/작은 파일 섞어 받기용)
+PROBE_SIZES = True
+
+# 파일 배치 방식 ('mirror': URL 경로 그대로, 'sharded': 해시 앞자리 폴더로 나눔)
+LAYOUT = LAYOUT_MIRROR
+
+# 낱개 파일 대신 묶음 파일로 저장할 형식 ('tar', 'zip', None이면 낱개 파일)
+ARCHIVE_FORMAT = None
+
+# 파일별 결과 기록과 오류 보고서 파일 이름 (다운로드 폴더 안에 저장)
+EVENT_LOG_NAME = 'download_events.jsonl'
+ERROR_REPORT_NAME = 'download_errors.csv'
+
+def _copy_body(response: requests.Response, out, hasher: Optional[StreamHasher] = None,
+               bandwidth: Optional[TokenBucket] = None) -> tuple:
     """
-    주어진 값이 bubble.io 파일 URL인지 확인하는 함수
+    응답 본문을 조각 단위로 out에 쓰는 함수
+    hasher가 있으면 같은 조각으로 해시도 계산하고,
+    bandwidth가 있으면 받은 바이트만큼 토큰을 꺼내 써서 전체 대역폭을 제한합니다
     
-    Args:
-        value (str): 확인할 URL 문자열
-        
     Returns:
-        bool: bubble.io URL이면 True, 아니면 False
+        tuple: (쓴 바이트 수, 첫 바이트를 받은 시각(time.monotonic))
     """
-    return isinstance(value, str) and 'bubble.io' in value
+    size = 0
+    first_byte_at = None
+    for chunk in response.iter_content(chunk_size=8192):
+        if chunk:
+            if first_byte_at is None:
+                first_byte_at = time.monotonic()
+            if bandwidth is not None:
+                bandwidth.acquire(len(chunk))
+            out.write(chunk)
+            size += len(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
+    return size, first_byte_at
 
-def normalize_url(url: str) -> str:
+def _write_response(response: requests.Response, save_path: str,
+                    hasher: Optional[StreamHasher] = None,
+                    bandwidth: Optional[TokenBucket] = None) -> tuple:
     """
-    URL을 정규화하는 함수
-    - '//'로 시작하는 URL을 'https://'로 변환
+    응답 본문을 파일로 저장하는 함수
+    다운로드가 중간에 끊겨도 불완전한 파일이 남지 않도록 임시 파일에 쓴 뒤 이름을 바꿉니다
     
-    Args:
-        url (str): 정규화할 URL
-        
     Returns:
-        str: 정규화된 URL
+        tuple: (저장한 바이트 수, 첫 바이트를 받은 시각(time.monotonic))
     """
-    # URL 디코딩
-    decoded_url = unquote(url)
-    
-    # '//'로 시작하는 경우 'https:'를 추가
-    if decoded_url.startswith('//'):
-        return f'https:{decoded_url}'
-    # 'http://' 또는 'https://'로 시작하지 않는 경우 'https://'를 추가
-    elif not decoded_url.startswith(('http://', 'https://')):
-        return f'https://{decoded_url}'
-    return decoded_url
+    temp_path = save_path + '.part'
+    try:
+        with open(temp_path, 'wb') as f:
+            size, first_byte_at = _copy_body(response, f, hasher, bandwidth)
+        os.replace(temp_path, save_path)
+        return size, first_byte_at
+    finally:
+        response.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
-def get_file_name(url: str) -> str:
+def _archive_response(response: requests.Response, archive: ArchiveWriter, stored_path: str,
+                      hasher: Optional[StreamHasher] = None,
+                      bandwidth: Optional[TokenBucket] = None) -> tuple:
     """
-    URL에서 파일 경로를 추출하는 함수
+    응답 본문을 묶음 파일에 넣는 함수
+    다 받은 뒤에만 묶음 파일 쓰기 스레드로 넘기므로 중간에 끊긴 파일은 들어가지 않습니다
     
-    Args:
-        url (str): 파일 URL
-        
     Returns:
-        str: 파일 경로
+        tuple: (받은 바이트 수, 첫 바이트를 받은 시각(time.monotonic))
     """
-    # URL 디코딩
-    decoded_url = unquote(url)
-    
-    # bubble.io 도메인 이후의 경로를 추출
-    path = decoded_url.split('.bubble.io/')[-1]
-    if not path:
-        return decoded_url.split('/')[-1]
-    
-    return path
+    spool = new_spool()
+    try:
+        size, first_byte_at = _copy_body(response, spool, hasher, bandwidth)
+    except BaseException:
+        spool.close()
+        raise
+    finally:
+        response.close()
+    archive.add(stored_path, spool, size)
+    return size, first_byte_at
 
-async def download_file(url: str, save_dir: str) -> bool:
+async def download_file(url: str, save_dir: str, fetcher: Optional[ResilientFetcher] = None,
+                        retry_queue: Optional[List[str]] = None,
+                        metrics: Optional[DownloadMetrics] = None, column: Optional[str] = None,
+                        manifest: Optional[ManifestWriter] = None, with_md5: bool = COMPUTE_MD5,
+                        bandwidth: Optional[TokenBucket] = None,
+                        existing: Optional[Set[str]] = None,
+                        sync_state: Optional[SyncState] = None,
+                        layout: Optional[FileLayout] = None,
+                        archive: Optional[ArchiveWriter] = None,
+                        log: Optional[EventLog] = None) -> bool:
     """
     파일을 다운로드하는 함수
     
     Args:
         url (str): 다운로드할 파일의 URL
         save_dir (str): 파일을 저장할 디렉토리 경로
+        fetcher (ResilientFetcher, optional): 재시도/속도 제한을 적용할 요청 도구
+        retry_queue (List[str], optional): 일시적인 오류로 실패한 URL을 모아둘 목록
+        metrics (DownloadMetrics, optional): 요청별 지표를 기록할 객체
+        column (str, optional): URL이 있던 CSV 컬럼 (지표 집계용)
+        manifest (ManifestWriter, optional): 파일별 해시/크기를 기록할 매니페스트
+        with_md5 (bool): 매니페스트에 MD5도 기록할지 여부
+        bandwidth (TokenBucket, optional): 전체 다운로드 대역폭 제한 (초당 바이트)
+        existing (Set[str], optional): 저장 폴더에 이미 있는 파일 경로 (scan_files 결과)
+        sync_state (SyncState, optional): 동기화 모드에서 파일별 ETag/Last-Modified 기록.
+            있으면 이미 있는 파일도 조건부 요청으로 바뀌었는지 확인합니다
+        layout (FileLayout, optional): 파일 배치 방식 (없으면 URL 경로 그대로 저장)
+        archive (ArchiveWriter, optional): 낱개 파일 대신 넣을 묶음 파일
+        log (EventLog, optional): 파일별 결과를 남길 기록 도구 (없으면 모두 화면에 출력)
         
     Returns:
-        bool: 다운로드 성공 여부
+        bool: 다운로드 성공 여부 (동기화 모드에서 바뀌지 않은 파일도 성공)
     """
+    if log is None:
+        log = default_log
+    if fetcher is None:
+        fetcher = ResilientFetcher(log=log)
+    
+    started = None
+    
+    def elapsed():
+        return time.monotonic() - started if started is not None else None
+    
+    def failed(e, retry):
+        # 나중에 다시 시도할 실패는 경고로, 더 시도하지 않을 실패는 오류로 남깁니다
+        if retry and retry_queue is not None:
+            retry_queue.append(url)
+            log.warning(f"🔁 다운로드 실패, 재시도 예정 ({url}): {str(e)}", item=url, column=column,
+                        duration=elapsed(), error=str(e), status=getattr(e, 'status', None))
+        else:
+            log.error(f"❌ 다운로드 실패 ({url}): {str(e)}", item=url, column=column,
+                      duration=elapsed(), error=str(e), status=getattr(e, 'status', None))
+    
+    def record(status, size=0, first_byte_at=None, attempts=1):
+        if metrics is None or started is None:
+            return
+        finished = time.monotonic()
+        ttfb = first_byte_at - started if first_byte_at is not None else None
+        metrics.record(normalize_url(url), column, status, size, ttfb, finished - started, attempts)
+    
     try:
         # URL 정규화
         normalized_url = normalize_url(url)
         file_path = get_file_name(normalized_url)
-        save_path = os.path.join(save_dir, file_path)
+        stored_path = layout.stored_path(file_path) if layout is not None else file_path
+        save_path = os.path.join(save_dir, stored_path)
+        
+        # 파일이 저장될 디렉토리 생성 (묶음 파일에 넣을 때는 필요 없음)
+        if archive is None:
+            if layout is not None:
+                layout.ensure_dir(save_path)
+            else:
+                os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        
+        exists = stored_path in existing if existing is not None else os.path.exists(save_path)
+        
+        # 이미 존재하는 파일인 경우 스킵 (동기화 모드에서는 바뀌었는지 확인)
+        headers = {}
+        if exists:
+            if sync_state is None:
+                log.warning(f"⚠️ 파일이 이미 존재합니다: {stored_path}", item=stored_path, url=url)
+                return False
+            headers = sync_state.conditional_headers(file_path)
+        
+        # 파일 다운로드 (요청과 저장은 다른 다운로드를 막지 않도록 스레드에서 실행)
+        started = time.monotonic()
+        response = await asyncio.to_thread(fetcher.get, normalized_url, stream=True, headers=headers)
+        headers_at = time.monotonic()
+        attempts = getattr(response, 'fetch_attempts', 1)
+        status = response.status_code
         
-        # 파일이 저장될 디렉토리 생성
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        # 바뀌지 않은 파일은 304 응답 하나로 끝납니다
+        if status == 304:
+            response.close()
+            record(status, 0, headers_at, attempts)
+            log.info(f"⏭️ 변경 없음: {file_path}", item=stored_path, url=url,
+                     duration=elapsed(), status=status)
+            return True
         
-        # 이미 존재하는 파일인 경우 스킵
-        if os.path.exists(save_path):
-            print(f"⚠️ 파일이 이미 존재합니다: {file_path}")
-            return False
+        hasher = StreamHasher(with_md5) if manifest is not None else None
+        content_type = response.headers.get('Content-Type')
+        etag = response.headers.get('ETag')
+        if archive is not None:
+            size, first_byte_at = await asyncio.to_thread(_archive_response, response, archive,
+                                                          stored_path, hasher, bandwidth)
+        else:
+            size, first_byte_at = await asyncio.to_thread(_write_response, response, save_path,
+                                                          hasher, bandwidth)
+        record(status, size, first_byte_at or headers_at, attempts)
         
-        # 파일 다운로드
-        response = requests.get(normalized_url, stream=True)
-        response.raise_for_status()
+        if existing is not None:
+            existing.add(stored_path)
+        if layout is not None:
+            layout.record(file_path, stored_path)
+        if sync_state is not None:
+            sync_state.update(file_path, normalized_url, etag, response.headers.get('Last-Modified'))
         
-        # 파일 저장
-        with open(save_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+        if manifest is not None:
+            digest = hasher.result()
+            manifest.add(stored_path, normalized_url, digest['size'], digest['sha256'],
+                         digest['md5'], content_type, etag)
         
-        print(f"✅ 다운로드 완료: {file_path}")
+        log.info(f"✅ 다운로드 완료: {file_path}", item=stored_path, url=url, column=column,
+                 duration=elapsed(), status=status, size=size, attempts=attempts)
         return True
         
+    except FetchError as e:
+        record(e.status or 'error', attempts=e.attempts)
+        failed(e, e.retryable)
+        return False
+    except requests.RequestException as e:
+        # 본문을 받는 도중 연결이 끊기거나 시간이 초과된 경우
+        record('error')
+        failed(e, True)
+        return False
     except Exception as e:
-        print(f"❌ 다운로드 실패 ({url}): {str(e)}")
+        record('error')
+        failed(e, False)
         return False
 
-async def process_csv(csv_path: str):
+async def download_all(urls: List[str], save_dir: str, fetcher: ResilientFetcher,
+                       concurrency: int = CONCURRENCY, retry_queue: Optional[List[str]] = None,
+                       desc: str = "다운로드 진행률", metrics: Optional[DownloadMetrics] = None,
+                       url_columns: Optional[Dict[str, str]] = None,
+                       manifest: Optional[ManifestWriter] = None, with_md5: bool = COMPUTE_MD5,
+                       sizes: Optional[Dict[str, Optional[int]]] = None,
+                       max_large: int = MAX_LARGE_TRANSFERS,
+                       bandwidth: Optional[TokenBucket] = None,
+                       existing: Optional[Set[str]] = None,
+                       sync_state: Optional[SyncState] = None,
+                       layout: Optional[FileLayout] = None,
+                       archive: Optional[ArchiveWriter] = None,
+                       log: Optional[EventLog] = None) -> int:
+    """
+    여러 파일을 동시에 다운로드하는 함수
+    CSV 순서 대신 파일 분류별로 작은 파일과 큰 파일을 섞어서 받습니다 (DownloadScheduler)
+    
+    Args:
+        urls (List[str]): 다운로드할 URL 목록
+        save_dir (str): 파일을 저장할 디렉토리 경로
+        fetcher (ResilientFetcher): 요청 도구
+        concurrency (int): 동시에 받을 파일 수
+        retry_queue (List[str], optional): 일시적인 오류로 실패한 URL을 모아둘 목록
+        desc (str): 진행률 표시 이름
+        metrics (DownloadMetrics, optional): 요청별 지표를 기록할 객체
+        url_columns (Dict[str, str], optional): URL별 CSV 컬럼 (지표 집계용)
+        manifest (ManifestWriter, optional): 파일별 해시/크기를 기록할 매니페스트
+        with_md5 (bool): 매니페스트에 MD5도 기록할지 여부
+        sizes (Dict[str, int], optional): URL별 예상 크기 (HEAD Content-Length)
+        max_large (int): 동시에 받을 큰 파일 수
+        bandwidth (TokenBucket, optional): 전체 다운로드 대역폭 제한 (초당 바이트)
+        existing (Set[str], optional): 저장 폴더에 이미 있는 파일 경로
+        sync_state (SyncState, optional): 동기화 모드의 파일별 ETag/Last-Modified 기록
+        layout (FileLayout, optional): 파일 배치 방식
+        archive (ArchiveWriter, optional): 낱개 파일 대신 넣을 묶음 파일
+        log (EventLog, optional): 파일별 결과를 남길 기록 도구
+        
+    Returns:
+        int: 성공한 다운로드 수
+    """
+    success_count = 0
+    url_columns = url_columns or {}
+    scheduler = DownloadScheduler(urls, sizes, max_large=max_large)
+    
+    with tqdm(total=len(urls), desc=desc) as pbar:
+        async def download(url):
+            nonlocal success_count
+            if await download_file(url, save_dir, fetcher, retry_queue, metrics,
+                                   url_columns.get(url), manifest, with_md5, bandwidth,
+                                   existing=existing, sync_state=sync_state, layout=layout,
+                                   archive=archive, log=log):
+                success_count += 1
+            pbar.update(1)
+        
+        await scheduler.run(download, concurrency)
+    
+    return success_count
+
+async def process_csv(csv_path: str, concurrency: int = CONCURRENCY,
+                      fetcher: Optional[ResilientFetcher] = None, with_md5: bool = COMPUTE_MD5,
+                      probe: bool = PROBE_SIZES, bandwidth_limit: Optional[float] = BANDWIDTH_LIMIT,
+                      sync_dir: Optional[str] = None, layout_mode: str = LAYOUT,
+                      archive_format: Optional[str] = ARCHIVE_FORMAT, archive_size: int = ARCHIVE_SIZE):
     """
     CSV 파일을 처리하는 메인 함수
     
     Args:
         csv_path (str): 처리할 CSV 파일 경로
+        concurrency (int): 동시에 받을 파일 수
+        fetcher (ResilientFetcher, optional): 재시도/속도 제한을 적용할 요청 도구
+        with_md5 (bool): 매니페스트에 MD5도 기록할지 여부 (S3 ETag 비교용)
+        probe (bool): 다운로드 전에 HEAD 요청으로 파일 크기를 확인할지 여부
+        bandwidth_limit (float, optional): 전체 다운로드 대역폭 제한(바이트/초)
+        sync_dir (str, optional): 동기화 모드로 받을 고정 폴더.
+            지정하면 새 폴더를 만들지 않고, 이미 있는 파일은 바뀐 경우에만 다시 받습니다
+        layout_mode (str): 파일 배치 방식 ('mirror' 또는 'sharded')
+        archive_format (str, optional): 낱개 파일 대신 묶음 파일로 저장할 형식 ('tar' 또는 'zip').
+            동기화 모드에서는 이전 묶음 파일 다음 번호부터 이어서 쓰고 색인에도 이어서 기록합니다
+        archive_size (int): 묶음 파일 하나의 최대 크기(바이트)
     """
     if not os.path.exists(csv_path):
         raise Exception(f"CSV 파일을 찾을 수 없습니다: {csv_path}")
@@ -116,57 +329,130 @@ async def process_csv(csv_path: str):
     # CSV 파일명 추출 (확장자 제외)
     csv_name = os.path.splitext(os.path.basename(csv_path))[0]
     
-    # 저장 디렉토리 생성
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    save_dir = f"{csv_name}_{timestamp}"
+    # 저장 디렉토리 생성 (동기화 모드에서는 고정 폴더 사용)
+    if sync_dir:
+        save_dir = sync_dir
+    else:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        save_dir = f"{csv_name}_{timestamp}"
     os.makedirs(save_dir, exist_ok=True)
     
-    # CSV 파일 읽기
-    rows = []
-    with open(csv_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        rows = list(reader)
+    # CSV를 한 번만 훑어서 URL 인벤토리 생성 (컬럼 찾기, 개수 세기, 다운로드에 함께 사용)
+    inventory = build_inventory(csv_path)
     
-    if not rows:
+    if not inventory.rows:
         print("❌ CSV 파일이 비어있습니다.")
         return
     
-    # bubble.io URL이 포함된 컬럼 찾기
-    columns = rows[0].keys()
-    file_columns = [
-        col for col in columns 
-        if any(is_bubble_url(row[col]) for row in rows)
-    ]
+    # bubble.io URL이 포함된 컬럼
+    file_columns = inventory.columns
     
     if not file_columns:
         print("❌ bubble.io URL을 포함한 컬럼을 찾을 수 없습니다.")
         return
     
-    print(f"🔍 총 {len(rows)}건의 데이터 처리 시작")
+    print(f"🔍 총 {len(inventory.rows)}건의 데이터 처리 시작")
     print(f"📁 저장 경로: {os.path.abspath(save_dir)}")
     print(f"🔍 처리할 컬럼: {', '.join(file_columns)}")
     
-    # 전체 URL 수 계산
-    total_urls = sum(1 for row in rows for col in file_columns if is_bubble_url(row[col]))
-    success_count = 0
+    # 이미 있는 파일 목록 (폴더를 한 번만 훑음)
+    existing = scan_files(save_dir)
+    sync_state = SyncState(os.path.join(save_dir, SYNC_STATE_NAME)) if sync_dir else None
+    layout = FileLayout(save_dir, layout_mode)
+    archive = ArchiveWriter(save_dir, csv_name, archive_format, archive_size) if archive_format else None
+    if archive is not None:
+        # 묶음 파일에 들어간 파일은 폴더를 훑어도 보이지 않으므로 색인에서 더합니다
+        existing |= archive.existing_paths
+    
+    # 파일별 결과 기록 (화면에는 일부만 보여주고 전체는 파일에 남김)
+    log = EventLog(os.path.join(save_dir, EVENT_LOG_NAME), console=tqdm.write,
+                   sample_every=CONSOLE_SAMPLE_EVERY)
+    if fetcher is None:
+        fetcher = ResilientFetcher(pool_size=concurrency, log=log)
+    
+    # 인벤토리 저장 (링크 변환/검사 단계에서 CSV를 다시 훑지 않고 사용)
+    inventory_path = os.path.join(save_dir, INVENTORY_NAME)
+    inventory.write(inventory_path)
+    
+    # 전체 URL 목록 (같은 파일을 동시에 두 번 받지 않도록 저장 경로 기준으로 중복 제거)
+    url_columns = {entry.url: entry.column for entry in inventory.unique_targets().values()}
+    urls = list(url_columns)
+    total_urls = len(urls)
+    
+    # 큰 파일과 작은 파일을 섞어 받기 위해 크기를 미리 확인
+    sizes = {}
+    if probe:
+        # 이미 있는 파일은 조건부 요청으로 확인하므로 새 파일만 크기를 확인합니다
+        normalized = {
+            url: normalize_url(url) for url in urls
+            if layout.stored_path(get_file_name(normalize_url(url))) not in existing
+        }
+        probed = probe_sizes(set(normalized.values()), fetcher) if normalized else {}
+        sizes = {url: probed.get(normalized[url]) for url in normalized}
+    bandwidth = TokenBucket(bandwidth_limit) if bandwidth_limit else None
+    
+    # 다운로드 지표 (긴 작업 중에는 주기적으로 중간 결과 저장)
+    metrics = DownloadMetrics()
+    metrics_json_path = os.path.join(save_dir, 'download_metrics.json')
+    metrics_prom_path = os.path.join(save_dir, 'download_metrics.prom')
+    metrics.start_snapshots(metrics_json_path, metrics_prom_path, SNAPSHOT_INTERVAL)
+    
+    # 파일별 해시/크기 매니페스트 (download_manifest.py로 나중에 검증)
+    manifest_path = os.path.join(save_dir, MANIFEST_NAME)
+    manifest = ManifestWriter(manifest_path)
+    
+    try:
+        # 각 행의 URL을 동시에 다운로드
+        retry_queue = []
+        success_count = await download_all(urls, save_dir, fetcher, concurrency, retry_queue,
+                                           metrics=metrics, url_columns=url_columns,
+                                           manifest=manifest, with_md5=with_md5,
+                                           sizes=sizes, bandwidth=bandwidth,
+                                           existing=existing, sync_state=sync_state, layout=layout,
+                                           archive=archive, log=log)
+        
+        # 일시적인 오류로 실패한 URL은 마지막에 한 번 더 시도
+        if retry_queue:
+            print(f"\n🔁 실패한 {len(retry_queue)}개 파일 재시도")
+            success_count += await download_all(retry_queue, save_dir, fetcher, concurrency,
+                                                desc="재시도 진행률", metrics=metrics,
+                                                url_columns=url_columns, manifest=manifest,
+                                                with_md5=with_md5, sizes=sizes, bandwidth=bandwidth,
+                                                existing=existing, sync_state=sync_state,
+                                                layout=layout, archive=archive, log=log)
+    finally:
+        manifest.close()
+        layout.close()
+        log.close()
+        if sync_state is not None:
+            sync_state.save()
+        metrics.stop_snapshots()
+        metrics.write(metrics_json_path, metrics_prom_path)
+        # 묶음 파일 쓰기 오류는 close()에서 올라오므로 다른 기록을 모두 저장한 뒤 마지막에 닫습니다
+        if archive is not None:
+            archive.close()
     
-    # 진행 상황 표시를 위한 tqdm 초기화
-    with tqdm(total=total_urls, desc="다운로드 진행률") as pbar:
-        # 각 행의 URL 처리
-        for row in rows:
-            for col in file_columns:
-                url = row[col]
-                if not is_bubble_url(url):
-                    continue
-                
-                if await download_file(url, save_dir):
-                    success_count += 1
-                pbar.update(1)
+    summary = metrics.summary()['total']
+    error_report_path = os.path.join(save_dir, ERROR_REPORT_NAME)
+    error_count = log.write_error_report(error_report_path) if log.errors else 0
     
     print(f"\n🎉 작업 완료!")
     print(f"✅ 성공: {success_count}개")
     print(f"❌ 실패: {total_urls - success_count}개")
+    if sync_state is not None:
+        print(f"⏭️ 변경 없음: {summary['statuses'].get('304', 0)}개")
+    print(f"📊 처리량: {summary['throughput_mb_s']} MB/s, 재시도: {summary['retries']}회")
     print(f"📁 다운로드 경로: {os.path.abspath(save_dir)}")
+    print(f"📊 지표: {metrics_json_path}, {metrics_prom_path}")
+    print(f"🔒 매니페스트: {manifest_path}")
+    print(f"🗂️ URL 인벤토리: {inventory_path}")
+    if archive is not None:
+        print(f"📦 묶음 파일: {archive.archive_count}개 ({archive.member_count}개 파일), 색인: {archive.index_path}")
+    if layout_mode != LAYOUT_MIRROR:
+        print(f"🗂️ 경로 대응표: {os.path.join(save_dir, LAYOUT_MANIFEST_NAME)}")
+    log.print_summary()
+    if error_count:
+        print(f"❌ 오류 보고서: {error_report_path}")
 
 def main():
     """
@@ -174,10 +460,11 @@ def main():
     """
     # CSV 파일 경로 입력 받기
     csv_path = input("CSV 파일 경로를 입력하세요: ").strip()
+    sync_dir = input("동기화할 폴더 경로를 입력하세요 (새 폴더에 받으려면 Enter): ").strip() or None
     
     try:
         # 비동기 함수 실행
-        asyncio.run(process_csv(csv_path))
+        asyncio.run(process_csv(csv_path, sync_dir=sync_dir))
     except Exception as e:
         print(f"❌ 오류 발생: {str(e)}")
 
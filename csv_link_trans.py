@@ -1,19 +1,48 @@
 import csv
 import os
 from datetime import datetime
-from urllib.parse import unquote
+import pandas as pd
+from passed.url_rewrite import UrlRewriter, DEFAULT_REWRITE_RULES, rules_from_bucket_configs
+from passed.formatter_config import BUCKET_CONFIGS
+from url_inventory import UrlInventory, load_inventory
 
-def is_bubble_url(value: str) -> bool:
+# 한 번에 읽어서 변환할 행 수
+CHUNK_SIZE = 200_000
+
+def build_rewriter(use_bucket_configs: bool = False) -> UrlRewriter:
     """
-    주어진 값이 bubble.io 파일 URL인지 확인하는 함수
+    URL 변환기를 만드는 함수
     
     Args:
-        value (str): 확인할 URL 문자열
+        use_bucket_configs (bool): True이면 BUCKET_CONFIGS의 테이블/컬럼별 폴더(path) 규칙을 먼저 적용
         
     Returns:
-        bool: bubble.io URL이면 True, 아니면 False
+        UrlRewriter: URL 변환기
     """
-    return isinstance(value, str) and 'bubble.io' in value
+    rules = list(DEFAULT_REWRITE_RULES)
+    if use_bucket_configs:
+        rules = rules_from_bucket_configs(BUCKET_CONFIGS) + rules
+    return UrlRewriter(rules)
+
+def find_table_name(file_name: str) -> str:
+    """
+    파일 이름에서 BUCKET_CONFIGS의 테이블 이름을 찾는 함수
+    
+    Args:
+        file_name (str): 파일 이름
+        
+    Returns:
+        str: 테이블 이름. 찾지 못한 경우 None
+    """
+    file_name = file_name.lower()
+    # 긴 이름부터 확인합니다 (예: 'shorts_channels'가 다른 이름에 먼저 걸리지 않도록)
+    for table_name in sorted(BUCKET_CONFIGS, key=len, reverse=True):
+        if table_name in file_name:
+            return table_name
+    return None
+
+# 기본 규칙을 쓰는 변환기 (convert_to_s3_url에서 재사용)
+_default_rewriter = UrlRewriter()
 
 def convert_to_s3_url(bubble_url: str) -> str:
     """
@@ -25,72 +54,153 @@ def convert_to_s3_url(bubble_url: str) -> str:
     Returns:
         str: 변환된 S3 URL
     """
-    # URL 디코딩
-    decoded_url = unquote(bubble_url)
+    return _default_rewriter.rewrite_value(bubble_url)
+
+def rewrite_inventory(inventory: UrlInventory, rewriter: UrlRewriter, table_name: str = None) -> dict:
+    """
+    인벤토리에 있는 URL만 컬럼별로 한 번씩 변환하는 함수
+    
+    Args:
+        inventory (UrlInventory): URL 인벤토리
+        rewriter (UrlRewriter): URL 변환기
+        table_name (str, optional): 테이블 이름 (테이블별 규칙 선택용)
+        
+    Returns:
+        dict: {(컬럼, 원본 URL): 변환된 URL} (변환되지 않은 URL은 제외)
+    """
+    by_column = {}
+    for entry in inventory:
+        by_column.setdefault(entry.column, {}).setdefault(entry.url, None)
+    
+    converted = {}
+    for col, urls in by_column.items():
+        originals = pd.Series(list(urls), dtype=object)
+        rewritten, _ = rewriter.rewrite_series(originals, column=col, table=table_name)
+        for old, new in zip(originals, rewritten):
+            if new != old:
+                converted[(col, old)] = new
+    return converted
+
+def process_chunks(input_csv_path: str, output_csv_path: str, rewriter: UrlRewriter,
+                   table_name: str = None) -> tuple:
+    """
+    CSV 파일을 조금씩 읽어서 컬럼 단위로 변환하는 함수
+    
+    Returns:
+        tuple: (컬럼별 변환된 URL 수, 전체 행 수)
+    """
+    # 원본 값을 그대로 유지하기 위해 모든 값을 문자열로 읽습니다
+    try:
+        reader = pd.read_csv(
+            input_csv_path, dtype=str, keep_default_na=False,
+            encoding='utf-8', chunksize=CHUNK_SIZE
+        )
+    except pd.errors.EmptyDataError:
+        # 헤더도 없는 빈 파일은 행이 없는 것으로 처리합니다 (process_csv가 비어 있다고 알려줌)
+        return {}, 0
+    
+    total_rows = 0
+    column_counts = {}
+    for i, chunk in enumerate(reader):
+        chunk, counts = rewriter.rewrite_frame(chunk, table=table_name)
+        for col, count in counts.items():
+            column_counts[col] = column_counts.get(col, 0) + count
+        
+        # 변환된 데이터를 새 CSV 파일로 저장
+        chunk.to_csv(output_csv_path, mode='w' if i == 0 else 'a', header=(i == 0),
+                     index=False, encoding='utf-8')
+        total_rows += len(chunk)
     
-    # bubble.io 도메인 이후의 경로 추출
-    path = decoded_url.split('.bubble.io/')[-1] if '.bubble.io/' in decoded_url else decoded_url.split('bubble.io/')[-1]
+    return column_counts, total_rows
+
+def process_inventory(input_csv_path: str, inventory: UrlInventory, output_csv_path: str,
+                      rewriter: UrlRewriter, table_name: str = None) -> tuple:
+    """
+    인벤토리의 행과 URL 위치를 이용해서 CSV를 다시 훑지 않고 변환하는 함수
     
-    # S3 URL 생성
-    s3_url = f"https://plpl-file-from-bubble.s3.ap-northeast-2.amazonaws.com/{path}"
+    Args:
+        input_csv_path (str): 원본 CSV 파일 경로 (인벤토리에 행이 없을 때만 읽음)
+        inventory (UrlInventory): URL 인벤토리
+        output_csv_path (str): 저장할 파일 경로
+        rewriter (UrlRewriter): URL 변환기
+        table_name (str, optional): 테이블 이름
+        
+    Returns:
+        tuple: (컬럼별 변환된 URL 수, 전체 행 수)
+    """
+    rows = inventory.rows
+    fieldnames = inventory.fieldnames
+    if rows is None:
+        # 매니페스트에서 읽은 인벤토리는 행이 없으므로 원본만 한 번 읽습니다
+        with open(input_csv_path, 'r', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            rows = list(reader)
+            fieldnames = list(reader.fieldnames or [])
+    
+    converted = rewrite_inventory(inventory, rewriter, table_name)
+    column_counts = {}
+    # 행 전체가 아니라 인벤토리에 기록된 칸만 바꿉니다
+    rows = [dict(row) for row in rows]
+    for entry in inventory:
+        new_url = converted.get((entry.column, entry.url))
+        if new_url is not None and rows[entry.row].get(entry.column) == entry.url:
+            rows[entry.row][entry.column] = new_url
+            column_counts[entry.column] = column_counts.get(entry.column, 0) + 1
     
-    return s3_url
+    with open(output_csv_path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return column_counts, len(rows)
 
-def process_csv(input_csv_path: str):
+def process_csv(input_csv_path: str, rewriter: UrlRewriter = None, table_name: str = None,
+                inventory: UrlInventory = None):
     """
     CSV 파일을 처리하는 메인 함수
     
     Args:
         input_csv_path (str): 처리할 CSV 파일 경로
+        rewriter (UrlRewriter, optional): URL 변환기 (기본값: 기본 규칙)
+        table_name (str, optional): 테이블 이름 (테이블별 규칙 선택용, 없으면 파일 이름에서 찾음)
+        inventory (UrlInventory, optional): 다운로드 단계에서 만든 URL 인벤토리.
+            있으면 인벤토리에 있는 칸만 변환합니다
     """
     if not os.path.exists(input_csv_path):
         raise Exception(f"CSV 파일을 찾을 수 없습니다: {input_csv_path}")
     
+    if rewriter is None:
+        rewriter = build_rewriter()
+    
     # CSV 파일명과 확장자 분리
     csv_name, csv_ext = os.path.splitext(os.path.basename(input_csv_path))
     
+    if table_name is None:
+        table_name = find_table_name(csv_name)
+    
     # 출력 파일명 생성
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     output_csv_path = f"{csv_name}_converted_{timestamp}{csv_ext}"
     
-    # CSV 파일 읽기
-    rows = []
-    with open(input_csv_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        rows = list(reader)
+    if inventory is not None:
+        column_counts, total_rows = process_inventory(input_csv_path, inventory, output_csv_path,
+                                                      rewriter, table_name)
+    else:
+        column_counts, total_rows = process_chunks(input_csv_path, output_csv_path, rewriter, table_name)
     
-    if not rows:
+    if total_rows == 0:
+        if os.path.exists(output_csv_path):
+            os.remove(output_csv_path)
         print("❌ CSV 파일이 비어있습니다.")
         return
     
-    # bubble.io URL이 포함된 컬럼 찾기
-    columns = rows[0].keys()
-    file_columns = [
-        col for col in columns 
-        if any(is_bubble_url(row[col]) for row in rows)
-    ]
-    
-    if not file_columns:
+    if not column_counts:
+        os.remove(output_csv_path)
         print("❌ bubble.io URL을 포함한 컬럼을 찾을 수 없습니다.")
         return
     
-    print(f"🔍 총 {len(rows)}건의 데이터 처리 시작")
-    print(f"🔍 처리할 컬럼: {', '.join(file_columns)}")
-    
-    # URL 변환
-    converted_count = 0
-    for row in rows:
-        for col in file_columns:
-            if is_bubble_url(row[col]):
-                row[col] = convert_to_s3_url(row[col])
-                converted_count += 1
-    
-    # 변환된 데이터를 새 CSV 파일로 저장
-    with open(output_csv_path, 'w', encoding='utf-8', newline='') as file:
-        writer = csv.DictWriter(file, fieldnames=columns)
-        writer.writeheader()
-        writer.writerows(rows)
-    
+    converted_count = sum(column_counts.values())
+    print(f"🔍 총 {total_rows}건의 데이터 처리")
+    print(f"🔍 처리한 컬럼: {', '.join(column_counts)}")
     print(f"\n🎉 작업 완료!")
     print(f"✅ 변환된 URL 수: {converted_count}개")
     print(f"📁 저장된 파일: {output_csv_path}")
@@ -102,8 +212,11 @@ def main():
     # CSV 파일 경로 입력 받기
     csv_path = input("CSV 파일 경로를 입력하세요: ").strip()
     
+    inventory_path = input("URL 인벤토리 경로를 입력하세요 (없으면 Enter): ").strip()
+    
     try:
-        process_csv(csv_path)
+        inventory = load_inventory(inventory_path) if inventory_path else None
+        process_csv(csv_path, inventory=inventory)
     except Exception as e:
         print(f"❌ 오류 발생: {str(e)}")
 
@@ -0,0 +1,174 @@
+import asyncio
+import csv
+import os
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from resilient_fetch import ResilientFetcher
+from download_metrics import DownloadMetrics, SNAPSHOT_INTERVAL
+from download_manifest import ManifestWriter, MANIFEST_NAME
+from url_inventory import build_inventory, INVENTORY_NAME
+from download_layout import FileLayout
+from csv_file_download import download_file, CONCURRENCY, COMPUTE_MD5, EVENT_LOG_NAME, ERROR_REPORT_NAME
+from csv_link_trans import build_rewriter, find_table_name, rewrite_inventory
+from passed.url_rewrite import UrlRewriter
+from passed.event_log import EventLog, CONSOLE_SAMPLE_EVERY
+
+# 다운로드에 실패한 파일의 링크를 원본 그대로 둘지 여부
+KEEP_ORIGINAL_ON_FAILURE = True
+
+async def run_pipeline(csv_path: str, rewriter: Optional[UrlRewriter] = None,
+                       table_name: Optional[str] = None,
+                       keep_original_on_failure: bool = KEEP_ORIGINAL_ON_FAILURE,
+                       concurrency: int = CONCURRENCY, fetcher: Optional[ResilientFetcher] = None,
+                       progress: Optional[Callable[[int, int, int, int], None]] = None,
+                       with_md5: bool = COMPUTE_MD5) -> Dict[str, object]:
+    """
+    CSV를 한 번만 읽고, 파일 다운로드와 링크 변환을 함께 처리하는 함수
+
+    다운로드는 동시에 진행하고, 앞쪽 행부터 그 행의 파일이 모두 끝나는 대로
+    변환된 행을 새 CSV에 바로 씁니다.
+
+    Args:
+        csv_path (str): 처리할 CSV 파일 경로
+        rewriter (UrlRewriter, optional): URL 변환기 (기본값: 기본 규칙)
+        table_name (str, optional): 테이블 이름 (없으면 파일 이름에서 찾음)
+        keep_original_on_failure (bool): 다운로드에 실패한 파일의 링크를 원본 그대로 둘지 여부
+        concurrency (int): 동시에 받을 파일 수
+        fetcher (ResilientFetcher, optional): 재시도/속도 제한을 적용할 요청 도구
+        progress (callable, optional): 행 하나를 쓸 때마다 호출할 함수
+            (완료한 행 수, 전체 행 수, 성공한 파일 수, 실패한 파일 수)
+        with_md5 (bool): 매니페스트에 MD5도 기록할지 여부
+
+    Returns:
+        Dict: 처리 결과 (저장 경로, 행/파일/변환 개수). 처리할 URL이 없으면 None
+    """
+    # CSV를 한 번만 읽어서 URL 인벤토리 생성
+    inventory = build_inventory(csv_path)
+
+    if not inventory.rows:
+        print("❌ CSV 파일이 비어있습니다.")
+        return None
+
+    if not inventory.columns:
+        print("❌ bubble.io URL을 포함한 컬럼을 찾을 수 없습니다.")
+        return None
+
+    if rewriter is None:
+        rewriter = build_rewriter()
+
+    csv_name, csv_ext = os.path.splitext(os.path.basename(csv_path))
+    if table_name is None:
+        table_name = find_table_name(csv_name)
+
+    # 저장 디렉토리와 출력 파일
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    save_dir = f"{csv_name}_{timestamp}"
+    os.makedirs(save_dir, exist_ok=True)
+    output_csv_path = f"{csv_name}_converted_{timestamp}{csv_ext}"
+
+    total_rows = len(inventory.rows)
+    print(f"🔍 총 {total_rows}건의 데이터 처리 시작")
+    print(f"📁 저장 경로: {os.path.abspath(save_dir)}")
+    print(f"🔍 처리할 컬럼: {', '.join(inventory.columns)}")
+
+    inventory.write(os.path.join(save_dir, INVENTORY_NAME))
+    converted = rewrite_inventory(inventory, rewriter, table_name)
+
+    metrics = DownloadMetrics()
+    metrics_json_path = os.path.join(save_dir, 'download_metrics.json')
+    metrics_prom_path = os.path.join(save_dir, 'download_metrics.prom')
+    metrics.start_snapshots(metrics_json_path, metrics_prom_path, SNAPSHOT_INTERVAL)
+    manifest = ManifestWriter(os.path.join(save_dir, MANIFEST_NAME))
+    layout = FileLayout(save_dir)
+    log = EventLog(os.path.join(save_dir, EVENT_LOG_NAME), sample_every=CONSOLE_SAMPLE_EVERY)
+    if fetcher is None:
+        fetcher = ResilientFetcher(pool_size=concurrency, log=log)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    success_count = 0
+    failed_count = 0
+    rewritten_count = 0
+
+    async def download(url, column):
+        nonlocal success_count, failed_count
+        async with semaphore:
+            ok = await download_file(url, save_dir, fetcher, metrics=metrics, column=column,
+                                     manifest=manifest, with_md5=with_md5, layout=layout,
+                                     log=log)
+        if ok:
+            success_count += 1
+        else:
+            failed_count += 1
+        return ok
+
+    # 같은 파일은 한 번만 받습니다 (모든 다운로드를 먼저 시작, 원본 값이 달라도 저장 경로가 같으면 한 번)
+    downloads = {
+        target_path: asyncio.ensure_future(download(entry.url, entry.column))
+        for target_path, entry in inventory.unique_targets().items()
+    }
+    entries_by_row = inventory.by_row()
+
+    try:
+        with open(output_csv_path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=inventory.fieldnames)
+            writer.writeheader()
+
+            for row_index, row in enumerate(inventory.rows):
+                entries = entries_by_row.get(row_index, [])
+                if entries:
+                    results = await asyncio.gather(*(downloads[entry.target_path] for entry in entries))
+                    row = dict(row)
+                    for entry, ok in zip(entries, results):
+                        new_url = converted.get((entry.column, entry.url))
+                        if new_url is None or (not ok and keep_original_on_failure):
+                            continue
+                        row[entry.column] = new_url
+                        rewritten_count += 1
+                writer.writerow(row)
+
+                if progress is not None:
+                    progress(row_index + 1, total_rows, success_count, failed_count)
+    finally:
+        for task in downloads.values():
+            task.cancel()
+        manifest.close()
+        log.close()
+        metrics.stop_snapshots()
+        metrics.write(metrics_json_path, metrics_prom_path)
+
+    print(f"\n🎉 작업 완료!")
+    print(f"✅ 다운로드 성공: {success_count}개")
+    print(f"❌ 다운로드 실패: {failed_count}개")
+    print(f"✅ 변환된 URL 수: {rewritten_count}개")
+    print(f"📁 다운로드 경로: {os.path.abspath(save_dir)}")
+    print(f"📁 저장된 파일: {output_csv_path}")
+    log.print_summary()
+    if log.errors:
+        error_report_path = os.path.join(save_dir, ERROR_REPORT_NAME)
+        log.write_error_report(error_report_path)
+        print(f"❌ 오류 보고서: {error_report_path}")
+
+    return {
+        'save_dir': save_dir,
+        'output_csv_path': output_csv_path,
+        'rows': total_rows,
+        'downloaded': success_count,
+        'failed': failed_count,
+        'rewritten': rewritten_count,
+    }
+
+def main():
+    """
+    메인 함수
+    """
+    # CSV 파일 경로 입력 받기
+    csv_path = input("CSV 파일 경로를 입력하세요: ").strip()
+    keep = input("다운로드에 실패한 링크를 원본으로 둘까요? (Y/n): ").strip().lower() != 'n'
+
+    try:
+        asyncio.run(run_pipeline(csv_path, keep_original_on_failure=keep))
+    except Exception as e:
+        print(f"❌ 오류 발생: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+import csv
+import os
+import queue
+import re
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from typing import BinaryIO, Dict, Iterator, Tuple
+
+# 묶음 파일 형식
+ARCHIVE_FORMATS = ('tar', 'zip')
+
+# 묶음 파일 하나의 최대 크기(바이트). 넘으면 다음 묶음 파일로 넘어갑니다
+ARCHIVE_SIZE = 4 * 1024 * 1024 * 1024
+
+# 받은 내용을 메모리에 두는 최대 크기(바이트). 넘으면 임시 파일에 둡니다
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+# 묶음 파일에 쓰기를 기다리는 파일의 최대 개수
+ARCHIVE_QUEUE_SIZE = 16
+
+# 묶음 파일 안의 위치를 기록하는 색인 파일 이름
+ARCHIVE_INDEX_NAME = 'archive_index.csv'
+
+def new_spool() -> BinaryIO:
+    """받은 내용을 잠시 담아둘 파일 객체 (작으면 메모리, 크면 임시 파일)"""
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+
+class ArchiveWriter:
+    """
+    다운로드한 파일을 낱개 파일 대신 tar/zip 묶음 파일에 바로 넣는 클래스
+
+    - 여러 다운로드 작업이 add()로 넘긴 내용을 쓰기 스레드 하나가 순서대로 묶음 파일에 씁니다
+    - 묶음 파일이 max_size를 넘으면 다음 번호의 묶음 파일로 넘어갑니다
+    - 파일마다 묶음 파일 이름, 내용 시작 위치(offset), 크기를 색인(archive_index.csv)에 기록하므로
+      묶음 파일을 풀지 않고도 원하는 파일만 바로 읽을 수 있습니다
+    - zip은 압축하지 않고(이미지/오디오는 이미 압축됨) 4GB가 넘어도 되도록 zip64로 씁니다
+    - 폴더에 색인이 이미 있으면(동기화 모드) 이전 묶음 파일은 그대로 두고 다음 번호부터 이어서 쓰고,
+      색인에도 이어서 기록합니다 (같은 경로가 여러 번 있으면 마지막 줄이 최신 내용)
+    """
+
+    def __init__(self, output_dir: str, name: str, fmt: str = 'tar',
+                 max_size: int = ARCHIVE_SIZE, queue_size: int = ARCHIVE_QUEUE_SIZE):
+        """
+        Args:
+            output_dir (str): 묶음 파일을 저장할 폴더
+            name (str): 묶음 파일 이름 앞부분 (예: 'album' -> album-00001.tar)
+            fmt (str): 묶음 파일 형식 ('tar' 또는 'zip')
+            max_size (int): 묶음 파일 하나의 최대 크기(바이트)
+            queue_size (int): 쓰기를 기다리는 파일의 최대 개수
+        """
+        if fmt not in ARCHIVE_FORMATS:
+            raise ValueError(f"지원하지 않는 묶음 형식입니다: {fmt}")
+        self.output_dir = output_dir
+        self.name = name
+        self.fmt = fmt
+        self.max_size = max_size
+        self.archive_count = 0
+        self.member_count = 0
+        self._last_number = 0
+        self._archive = None
+        self._archive_name = None
+        self._archive_size = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        # 이전 실행에서 묶음 파일에 넣은 파일 경로 (동기화 모드에서 이미 있는 파일로 취급)
+        self.existing_paths = set()
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.index_path = os.path.join(output_dir, ARCHIVE_INDEX_NAME)
+        resume = os.path.exists(self.index_path)
+        if resume:
+            self._load_index()
+        self._index_file = open(self.index_path, 'a' if resume else 'w', encoding='utf-8', newline='')
+        self._index = csv.writer(self._index_file)
+        if not resume:
+            self._index.writerow(['path', 'archive', 'offset', 'size'])
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def add(self, path: str, body: BinaryIO, size: int):
+        """
+        파일 하나를 묶음 파일에 넣도록 넘기는 함수 (쓰기 스레드가 처리한 뒤 body를 닫음)
+        쓰기가 밀려 있으면 자리가 날 때까지 기다립니다
+
+        Args:
+            path (str): 묶음 파일 안의 경로
+            body (BinaryIO): 내용 (처음 위치로 되돌려서 읽음)
+            size (int): 내용 크기(바이트)
+        """
+        if self._error is not None:
+            body.close()
+            raise self._error
+        self._queue.put((path, body, size))
+
+    def close(self):
+        """남은 파일을 모두 쓰고 묶음 파일과 색인을 닫습니다"""
+        self._queue.put(None)
+        self._thread.join()
+        self._close_archive()
+        self._index_file.close()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, body, size = item
+            try:
+                if self._error is None:
+                    self._write(path, body, size)
+            except Exception as e:
+                self._error = e
+            finally:
+                body.close()
+
+    def _load_index(self):
+        # 이전 색인에서 넣은 파일 경로와 이 이름의 마지막 묶음 파일 번호를 읽습니다
+        pattern = re.compile(rf'^{re.escape(self.name)}-(\d+)\.{self.fmt}$')
+        with open(self.index_path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                self.existing_paths.add(row['path'])
+                match = pattern.match(row['archive'])
+                if match:
+                    self._last_number = max(self._last_number, int(match.group(1)))
+
+    def _open_next(self):
+        self._close_archive()
+        # 이전 묶음 파일은 덮어쓰지 않습니다 (색인에 없는 파일이 남아 있어도 건너뜀)
+        while True:
+            self._last_number += 1
+            self._archive_name = f"{self.name}-{self._last_number:05d}.{self.fmt}"
+            archive_path = os.path.join(self.output_dir, self._archive_name)
+            if not os.path.exists(archive_path):
+                break
+        self.archive_count += 1
+        if self.fmt == 'tar':
+            self._archive = tarfile.open(archive_path, 'w', format=tarfile.PAX_FORMAT)
+        else:
+            self._archive = zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_STORED, allowZip64=True)
+        self._archive_size = 0
+
+    def _close_archive(self):
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def _write(self, path: str, body: BinaryIO, size: int):
+        # 지금 묶음 파일이 넘치면 다음 묶음 파일로 넘어갑니다 (빈 묶음 파일은 만들지 않음)
+        if self._archive is None or (self._archive_size and self._archive_size + size > self.max_size):
+            self._open_next()
+
+        body.seek(0)
+        if self.fmt == 'tar':
+            info = tarfile.TarInfo(path)
+            info.size = size
+            info.mtime = int(time.time())
+            self._archive.addfile(info, body)
+            # 내용은 512바이트 단위로 채워서 헤더 뒤에 쓰이므로 끝 위치에서 거꾸로 계산합니다
+            blocks = -(-size // tarfile.BLOCKSIZE)
+            offset = self._archive.offset - blocks * tarfile.BLOCKSIZE
+        else:
+            info = zipfile.ZipInfo(path, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            info.file_size = size
+            with self._archive.open(info, 'w', force_zip64=size >= zipfile.ZIP64_LIMIT) as member:
+                # 로컬 헤더를 쓴 바로 뒤가 내용의 시작 위치입니다
+                offset = self._archive.fp.tell()
+                shutil.copyfileobj(body, member)
+
+        self._archive_size += size
+        self.member_count += 1
+        self._index.writerow([path, self._archive_name, offset, size])
+
+def read_member(output_dir: str, archive: str, offset: int, size: int) -> bytes:
+    """
+    색인에 기록된 위치로 묶음 파일 안의 파일 하나를 바로 읽는 함수
+
+    Args:
+        output_dir (str): 묶음 파일이 있는 폴더
+        archive (str): 묶음 파일 이름
+        offset (int): 내용 시작 위치
+        size (int): 내용 크기
+
+    Returns:
+        bytes: 파일 내용
+    """
+    with open(os.path.join(output_dir, archive), 'rb') as f:
+        f.seek(int(offset))
+        return f.read(int(size))
+
+def load_archive_index(output_dir: str) -> Dict[str, Tuple[str, int, int]]:
+    """
+    색인을 읽어서 파일 경로별 위치를 돌려주는 함수 (같은 경로가 여러 번 있으면 마지막 줄이 최신 내용)
+
+    Args:
+        output_dir (str): 묶음 파일과 색인이 있는 폴더
+
+    Returns:
+        Dict[str, Tuple[str, int, int]]: {파일 경로: (묶음 파일 이름, 내용 시작 위치, 크기)} (색인이 없으면 빈 딕셔너리)
+    """
+    index_path = os.path.join(output_dir, ARCHIVE_INDEX_NAME)
+    if not os.path.exists(index_path):
+        return {}
+    members = {}
+    with open(index_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            members[row['path'].replace(os.sep, '/')] = (row['archive'], int(row['offset']), int(row['size']))
+    return members
+
+def iter_member(output_dir: str, archive: str, offset: int, size: int,
+                chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """
+    묶음 파일 안의 파일 하나를 chunk_size씩 나눠 읽는 함수 (큰 파일도 메모리를 적게 씀)
+
+    Args:
+        output_dir (str): 묶음 파일이 있는 폴더
+        archive (str): 묶음 파일 이름
+        offset (int): 내용 시작 위치
+        size (int): 내용 크기
+        chunk_size (int): 한 번에 읽는 크기
+
+    Yields:
+        bytes: 파일 내용 조각 (묶음 파일이 잘려 있으면 size보다 적게 나올 수 있음)
+    """
+    with open(os.path.join(output_dir, archive), 'rb') as f:
+        f.seek(int(offset))
+        remaining = int(size)
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,121 @@
+import csv
+import hashlib
+import os
+import posixpath
+import threading
+from typing import Dict
+
+# 파일 배치 방식
+LAYOUT_MIRROR = 'mirror'  # URL 경로를 그대로 폴더로 만듦 (기존 방식)
+LAYOUT_SHARDED = 'sharded'  # 경로 해시 앞자리로 나눈 폴더에 저장
+LAYOUTS = (LAYOUT_MIRROR, LAYOUT_SHARDED)
+
+# 해시 폴더 단계 수와 단계별 글자 수 (16진수 2글자 = 폴더 256개)
+SHARD_LEVELS = 2
+SHARD_WIDTH = 2
+
+# 원래 경로와 저장 경로의 대응표 파일 이름 (다운로드 폴더 안에 저장)
+LAYOUT_MANIFEST_NAME = 'layout.csv'
+
+def load_layout(base_dir: str) -> Dict[str, str]:
+    """
+    다운로드 폴더의 대응표를 읽는 함수
+
+    Args:
+        base_dir (str): 다운로드 폴더
+
+    Returns:
+        Dict[str, str]: {원래 경로: 저장 경로} (대응표가 없으면 빈 딕셔너리)
+    """
+    manifest_path = os.path.join(base_dir, LAYOUT_MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        return {row['original_path']: row['stored_path'] for row in csv.DictReader(f)}
+
+class FileLayout:
+    """
+    다운로드한 파일을 어느 폴더에 둘지 정하는 클래스
+
+    - mirror: URL 경로를 그대로 씁니다
+    - sharded: 경로 해시 앞자리로 폴더를 나눠서(기본 256 x 256) 한 폴더에 파일이 몰리지 않게 하고,
+      원래 경로는 layout.csv 대응표에 기록합니다
+
+    이미 만든 폴더를 기억해서 폴더마다 os.makedirs를 한 번만 부릅니다.
+    """
+
+    def __init__(self, base_dir: str, mode: str = LAYOUT_MIRROR,
+                 levels: int = SHARD_LEVELS, width: int = SHARD_WIDTH):
+        """
+        Args:
+            base_dir (str): 다운로드 폴더
+            mode (str): 배치 방식 (mirror 또는 sharded)
+            levels (int): 해시 폴더 단계 수
+            width (int): 단계별 폴더 이름 글자 수
+        """
+        if mode not in LAYOUTS:
+            raise ValueError(f"지원하지 않는 배치 방식입니다: {mode}")
+        self.base_dir = base_dir
+        self.mode = mode
+        self.levels = levels
+        self.width = width
+        self._created = set()
+        self._lock = threading.Lock()
+        self._manifest = None
+        self._recorded = {}
+
+        if mode == LAYOUT_SHARDED:
+            self._recorded = load_layout(base_dir)
+            manifest_path = os.path.join(base_dir, LAYOUT_MANIFEST_NAME)
+            is_new = not os.path.exists(manifest_path)
+            self._manifest = open(manifest_path, 'a', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._manifest)
+            if is_new:
+                self._writer.writerow(['original_path', 'stored_path'])
+
+    def stored_path(self, file_path: str) -> str:
+        """
+        원래 경로(URL 경로)에 해당하는 저장 경로 (다운로드 폴더 기준, '/' 구분)
+
+        sharded 방식에서는 '해시 앞자리/.../해시 일부-파일 이름' 형태가 되어
+        파일 이름은 알아볼 수 있고 같은 이름의 다른 파일과도 겹치지 않습니다.
+        """
+        if self.mode == LAYOUT_MIRROR:
+            return file_path
+        digest = hashlib.sha1(file_path.encode('utf-8')).hexdigest()
+        shards = [digest[i * self.width:(i + 1) * self.width] for i in range(self.levels)]
+        name = posixpath.basename(file_path) or digest
+        return '/'.join(shards + [f"{digest[:12]}-{name}"])
+
+    def ensure_dir(self, save_path: str):
+        """파일을 저장할 폴더를 만듭니다 (이미 만든 폴더는 건너뜀)"""
+        directory = os.path.dirname(save_path)
+        if not directory or directory in self._created:
+            return
+        with self._lock:
+            if directory not in self._created:
+                os.makedirs(directory, exist_ok=True)
+                self._created.add(directory)
+
+    def record(self, file_path: str, stored_path: str):
+        """저장한 파일의 원래 경로를 대응표에 기록합니다 (sharded 방식에서만)"""
+        if self._manifest is None:
+            return
+        with self._lock:
+            if self._recorded.get(file_path) == stored_path:
+                return
+            self._recorded[file_path] = stored_path
+            self._writer.writerow([file_path, stored_path])
+
+    def close(self):
+        with self._lock:
+            if self._manifest is not None:
+                self._manifest.close()
+                self._manifest = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import quote
+from tqdm import tqdm
+from resilient_fetch import ResilientFetcher, FetchError
+from download_archive import load_archive_index, iter_member
+
+# 매니페스트 파일 이름 (다운로드 폴더 안에 저장)
+MANIFEST_NAME = 'manifest.jsonl'
+
+# 파일을 다시 읽어 해시를 계산할 때 한 번에 읽는 크기
+READ_CHUNK_SIZE = 1024 * 1024
+
+# 검증에 쓸 작업 스레드 수
+VERIFY_WORKERS = min(32, (os.cpu_count() or 4) * 2)
+
+class StreamHasher:
+    """
+    다운로드 조각을 받는 대로 해시를 계산하는 클래스
+    파일을 저장한 뒤 다시 읽지 않아도 SHA-256(필요하면 MD5)을 얻을 수 있습니다
+    """
+
+    def __init__(self, md5: bool = False):
+        self.sha256 = hashlib.sha256()
+        self.md5 = hashlib.md5() if md5 else None
+        self.size = 0
+
+    def update(self, chunk: bytes):
+        self.sha256.update(chunk)
+        if self.md5 is not None:
+            self.md5.update(chunk)
+        self.size += len(chunk)
+
+    def result(self) -> Dict[str, object]:
+        return {
+            'size': self.size,
+            'sha256': self.sha256.hexdigest(),
+            'md5': self.md5.hexdigest() if self.md5 is not None else None,
+        }
+
+class ManifestWriter:
+    """
+    다운로드한 파일의 경로, URL, 크기, 해시, content-type을 JSON Lines로 기록하는 클래스
+    여러 다운로드가 동시에 기록해도 안전합니다
+    """
+
+    def __init__(self, manifest_path: str):
+        self.manifest_path = manifest_path
+        self._file = open(manifest_path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def add(self, path: str, url: str, size: int, sha256: str, md5: Optional[str] = None,
+            content_type: Optional[str] = None, etag: Optional[str] = None):
+        """
+        파일 하나의 정보를 기록하는 함수
+
+        Args:
+            path (str): 다운로드 폴더 기준 상대 경로
+            url (str): 원본 URL
+            size (int): 파일 크기
+            sha256 (str): SHA-256 해시
+            md5 (str, optional): MD5 해시 (S3 ETag 비교용)
+            content_type (str, optional): 응답의 Content-Type
+            etag (str, optional): 응답의 ETag
+        """
+        entry = {
+            'path': path.replace(os.sep, '/'),
+            'url': url,
+            'size': size,
+            'sha256': sha256,
+            'md5': md5,
+            'content_type': content_type,
+            'etag': etag,
+            'downloaded_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+def load_manifest(manifest_path: str) -> List[Dict[str, object]]:
+    """
+    매니페스트를 읽는 함수 (같은 경로가 여러 번 기록되었으면 마지막 기록을 사용)
+
+    Args:
+        manifest_path (str): 매니페스트 파일 경로
+
+    Returns:
+        List[Dict]: 파일 정보 목록
+    """
+    entries = {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entry = json.loads(line)
+                entries[entry['path']] = entry
+    return list(entries.values())
+
+def hash_file(file_path: str, md5: bool = False) -> Dict[str, object]:
+    """
+    파일의 크기와 해시를 계산하는 함수
+    """
+    hasher = StreamHasher(md5)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.result()
+
+def hash_archive_member(base_dir: str, archive: str, offset: int, size: int) -> Dict[str, object]:
+    """
+    묶음 파일 안의 파일 하나의 크기와 해시를 계산하는 함수 (색인의 위치로 바로 읽음)
+    """
+    hasher = StreamHasher()
+    for chunk in iter_member(base_dir, archive, offset, size, READ_CHUNK_SIZE):
+        hasher.update(chunk)
+    return hasher.result()
+
+def _verify_local_entry(entry: Dict[str, object], base_dir: str,
+                        archived: Dict[str, tuple]) -> Dict[str, object]:
+    file_path = os.path.join(base_dir, entry['path'])
+    member = archived.get(entry['path'])
+    if member is not None:
+        # 묶음 파일로 받은 경우 낱개 파일이 없으므로 색인에 기록된 위치에서 읽습니다
+        archive, offset, size = member
+        if not os.path.isfile(os.path.join(base_dir, archive)):
+            return {'path': entry['path'], 'problem': 'missing'}
+        if size != entry['size']:
+            return {'path': entry['path'], 'problem': 'size_mismatch',
+                    'expected': entry['size'], 'actual': size}
+        actual = hash_archive_member(base_dir, archive, offset, size)
+    elif not os.path.isfile(file_path):
+        return {'path': entry['path'], 'problem': 'missing'}
+    elif os.path.getsize(file_path) != entry['size']:
+        return {'path': entry['path'], 'problem': 'size_mismatch',
+                'expected': entry['size'], 'actual': os.path.getsize(file_path)}
+    else:
+        actual = hash_file(file_path)
+    if actual['sha256'] != entry['sha256']:
+        return {'path': entry['path'], 'problem': 'hash_mismatch',
+                'expected': entry['sha256'], 'actual': actual['sha256']}
+    return {'path': entry['path'], 'problem': None}
+
+def verify_local(manifest_path: str, base_dir: Optional[str] = None,
+                 workers: int = VERIFY_WORKERS) -> List[Dict[str, object]]:
+    """
+    로컬 파일을 매니페스트와 비교하는 함수 (여러 파일을 동시에 검사)
+    폴더에 묶음 파일 색인(archive_index.csv)이 있으면 묶음 파일 안의 파일은 색인의 위치로 읽어서 검사합니다
+
+    Args:
+        manifest_path (str): 매니페스트 파일 경로
+        base_dir (str, optional): 파일이 있는 폴더 (기본값: 매니페스트가 있는 폴더)
+        workers (int): 동시에 검사할 파일 수
+
+    Returns:
+        List[Dict]: 파일별 검사 결과 (problem이 None이면 정상)
+    """
+    entries = load_manifest(manifest_path)
+    base_dir = base_dir or os.path.dirname(os.path.abspath(manifest_path))
+    archived = load_archive_index(base_dir)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(tqdm(
+            executor.map(lambda entry: _verify_local_entry(entry, base_dir, archived), entries),
+            total=len(entries), desc="로컬 검증 진행률"
+        ))
+
+def _verify_remote_entry(entry: Dict[str, object], remote_base_url: Optional[str],
+                         fetcher: ResilientFetcher) -> Dict[str, object]:
+    url = remote_base_url.rstrip('/') + '/' + quote(entry['path']) if remote_base_url else entry['url']
+    try:
+        response = fetcher.head(url)
+        response.close()
+    except FetchError as e:
+        problem = 'missing' if e.status in (403, 404) else 'error'
+        return {'path': entry['path'], 'url': url, 'problem': problem, 'actual': str(e)}
+
+    size = response.headers.get('Content-Length')
+    if size is not None and int(size) != entry['size']:
+        return {'path': entry['path'], 'url': url, 'problem': 'size_mismatch',
+                'expected': entry['size'], 'actual': int(size)}
+
+    etag = (response.headers.get('ETag') or '').strip('"')
+    # 멀티파트로 올린 객체의 ETag는 MD5가 아니므로(예: "...-3") 크기만 비교합니다
+    if etag and entry.get('md5') and '-' not in etag and etag != entry['md5']:
+        return {'path': entry['path'], 'url': url, 'problem': 'etag_mismatch',
+                'expected': entry['md5'], 'actual': etag}
+    return {'path': entry['path'], 'url': url, 'problem': None}
+
+def verify_remote(manifest_path: str, remote_base_url: Optional[str] = None,
+                  workers: int = VERIFY_WORKERS,
+                  fetcher: Optional[ResilientFetcher] = None) -> List[Dict[str, object]]:
+    """
+    원격 객체의 크기와 ETag를 매니페스트와 비교하는 함수 (여러 파일을 동시에 검사)
+
+    Args:
+        manifest_path (str): 매니페스트 파일 경로
+        remote_base_url (str, optional): 옮겨간 저장소 주소 (예: S3 버킷 URL).
+            지정하면 '주소/상대 경로'를, 없으면 원본 URL을 검사합니다
+        workers (int): 동시에 검사할 파일 수
+        fetcher (ResilientFetcher, optional): 요청 도구
+
+    Returns:
+        List[Dict]: 파일별 검사 결과 (problem이 None이면 정상)
+    """
+    entries = load_manifest(manifest_path)
+    fetcher = fetcher or ResilientFetcher(pool_size=workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(tqdm(
+            executor.map(lambda entry: _verify_remote_entry(entry, remote_base_url, fetcher), entries),
+            total=len(entries), desc="원격 검증 진행률"
+        ))
+
+def print_report(results: List[Dict[str, object]]):
+    """검증 결과를 출력하는 함수"""
+    problems = [r for r in results if r['problem']]
+    for result in problems:
+        print(f"❌ {result['problem']}: {result['path']}")
+    print(f"\n🎉 검증 완료!")
+    print(f"✅ 정상: {len(results) - len(problems)}개")
+    print(f"❌ 문제: {len(problems)}개")
+
+def main():
+    """
+    메인 함수
+    """
+    manifest_path = input("매니페스트 파일 경로를 입력하세요: ").strip()
+    mode = input("검증 방식을 선택하세요 (local/remote): ").strip().lower() or 'local'
+
+    try:
+        if mode == 'remote':
+            remote_base_url = input("저장소 주소를 입력하세요 (원본 URL 검사는 Enter): ").strip() or None
+            results = verify_remote(manifest_path, remote_base_url)
+        else:
+            results = verify_local(manifest_path)
+        print_report(results)
+    except Exception as e:
+        print(f"❌ 오류 발생: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+# 지연 시간 히스토그램 구간(초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# 긴 작업 중 중간 결과를 저장하는 주기(초)
+SNAPSHOT_INTERVAL = 30
+
+# 요약에 넣을 백분위수
+PERCENTILES = (50, 90, 95, 99)
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """
+    정렬된 값 목록에서 백분위수를 구하는 함수 (선형 보간)
+    """
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * p / 100
+    lower, upper = math.floor(k), math.ceil(k)
+    if lower == upper:
+        return sorted_values[int(k)]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+def _escape_label(value: str) -> str:
+    """Prometheus 라벨 값 이스케이프"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class _Group:
+    """호스트/컬럼별 집계"""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.retries = 0
+        self.statuses: Dict[str, int] = {}
+        self.durations: List[float] = []
+        self.ttfbs: List[float] = []
+
+    def add(self, status, size, ttfb, duration, attempts):
+        self.requests += 1
+        self.bytes += size
+        self.retries += max(0, attempts - 1)
+        key = str(status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        self.durations.append(duration)
+        if ttfb is not None:
+            self.ttfbs.append(ttfb)
+
+    def summary(self, elapsed: float) -> Dict[str, object]:
+        durations = sorted(self.durations)
+        ttfbs = sorted(self.ttfbs)
+        busy = sum(durations)
+        return {
+            'requests': self.requests,
+            'bytes': self.bytes,
+            'retries': self.retries,
+            'statuses': dict(sorted(self.statuses.items())),
+            # 전체 경과 시간 기준 처리량과, 요청 하나하나의 평균 전송 속도
+            'throughput_mb_s': round(self.bytes / elapsed / 1e6, 3) if elapsed > 0 else None,
+            'per_request_mb_s': round(self.bytes / busy / 1e6, 3) if busy > 0 else None,
+            'duration_s': {f"p{p}": percentile(durations, p) for p in PERCENTILES},
+            'ttfb_s': {f"p{p}": percentile(ttfbs, p) for p in PERCENTILES},
+            'duration_histogram': self.histogram(durations),
+        }
+
+    @staticmethod
+    def histogram(sorted_values: List[float]) -> Dict[str, int]:
+        """누적 히스토그램 (Prometheus의 le 구간과 같은 방식)"""
+        counts = {}
+        index = 0
+        for bound in LATENCY_BUCKETS:
+            while index < len(sorted_values) and sorted_values[index] <= bound:
+                index += 1
+            counts[str(bound)] = index
+        counts['+Inf'] = len(sorted_values)
+        return counts
+
+class DownloadMetrics:
+    """
+    다운로드 요청별 지표(바이트, 첫 바이트까지 걸린 시간, 전체 시간, 상태, 재시도)를 모아서
+    처리량과 호스트/컬럼별 지연 시간 분포를 JSON 요약과 Prometheus 텍스트 파일로 저장하는 클래스
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self._total = _Group()
+        self._by_host: Dict[str, _Group] = {}
+        self._by_column: Dict[str, _Group] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._snapshot_thread = None
+
+    def record(self, url: str, column: Optional[str], status, size: int,
+               ttfb: Optional[float], duration: float, attempts: int = 1):
+        """
+        요청 하나의 결과를 기록하는 함수
+
+        Args:
+            url (str): 요청한 URL
+            column (str): URL이 있던 CSV 컬럼
+            status: HTTP 상태 코드 (연결 오류 등은 'error')
+            size (int): 받은 바이트 수
+            ttfb (float): 요청 시작부터 첫 바이트까지 걸린 시간(초)
+            duration (float): 요청 시작부터 저장 완료까지 걸린 시간(초)
+            attempts (int): 시도 횟수 (재시도 포함)
+        """
+        host = urlsplit(url).netloc.lower() or 'unknown'
+        column = column or 'unknown'
+        with self._lock:
+            for group in (self._total,
+                          self._by_host.setdefault(host, _Group()),
+                          self._by_column.setdefault(column, _Group())):
+                group.add(status, size, ttfb, duration, attempts)
+
+    def summary(self) -> Dict[str, object]:
+        """지금까지의 지표 요약"""
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                'started_at': self.started_at,
+                'elapsed_s': round(elapsed, 3),
+                'total': self._total.summary(elapsed),
+                'by_host': {host: group.summary(elapsed) for host, group in sorted(self._by_host.items())},
+                'by_column': {col: group.summary(elapsed) for col, group in sorted(self._by_column.items())},
+            }
+
+    def prometheus_text(self) -> str:
+        """Prometheus 텍스트 형식 (node_exporter textfile collector용)"""
+        lines = []
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            groups = [('host', h, g) for h, g in sorted(self._by_host.items())] + \
+                     [('column', c, g) for c, g in sorted(self._by_column.items())]
+
+            lines += ['# HELP bubble_download_requests_total Download requests by status.',
+                      '# TYPE bubble_download_requests_total counter']
+            for label, name, group in groups:
+                for status, count in sorted(group.statuses.items()):
+                    lines.append(f'bubble_download_requests_total{{{label}="{_escape_label(name)}",'
+                                 f'status="{_escape_label(status)}"}} {count}')
+
+            lines += ['# HELP bubble_download_bytes_total Downloaded bytes.',
+                      '# TYPE bubble_download_bytes_total counter']
+            for label, name, group in groups:
+                lines.append(f'bubble_download_bytes_total{{{label}="{_escape_label(name)}"}} {group.bytes}')
+
+            lines += ['# HELP bubble_download_retries_total Retried requests.',
+                      '# TYPE bubble_download_retries_total counter']
+            for label, name, group in groups:
+                lines.append(f'bubble_download_retries_total{{{label}="{_escape_label(name)}"}} {group.retries}')
+
+            for metric, attr in (('bubble_download_duration_seconds', 'durations'),
+                                 ('bubble_download_ttfb_seconds', 'ttfbs')):
+                lines += [f'# HELP {metric} Download latency.', f'# TYPE {metric} histogram']
+                for label, name, group in groups:
+                    values = sorted(getattr(group, attr))
+                    base = f'{label}="{_escape_label(name)}"'
+                    for bound, count in _Group.histogram(values).items():
+                        lines.append(f'{metric}_bucket{{{base},le="{bound}"}} {count}')
+                    lines.append(f'{metric}_sum{{{base}}} {sum(values):.6f}')
+                    lines.append(f'{metric}_count{{{base}}} {len(values)}')
+
+            throughput = self._total.bytes / elapsed if elapsed > 0 else 0
+            lines += ['# HELP bubble_download_throughput_bytes_per_second Overall download throughput.',
+                      '# TYPE bubble_download_throughput_bytes_per_second gauge',
+                      f'bubble_download_throughput_bytes_per_second {throughput:.3f}']
+        return '\n'.join(lines) + '\n'
+
+    def write(self, json_path: str, prom_path: str):
+        """
+        JSON 요약과 Prometheus 텍스트 파일을 저장하는 함수
+        읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 임시 파일에 쓴 뒤 이름을 바꿉니다
+        """
+        for path, content in ((json_path, json.dumps(self.summary(), ensure_ascii=False, indent=2)),
+                              (prom_path, self.prometheus_text())):
+            if not path:
+                continue
+            temp_path = path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+
+    def start_snapshots(self, json_path: str, prom_path: str, interval: float = SNAPSHOT_INTERVAL):
+        """긴 작업 중 interval초마다 중간 결과를 저장합니다"""
+        def run():
+            while not self._stop.wait(interval):
+                self.write(json_path, prom_path)
+
+        self._stop.clear()
+        self._snapshot_thread = threading.Thread(target=run, daemon=True)
+        self._snapshot_thread.start()
+
+    def stop_snapshots(self):
+        """중간 저장을 멈춥니다"""
+        self._stop.set()
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
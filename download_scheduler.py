@@ -0,0 +1,163 @@
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit, unquote
+from tqdm import tqdm
+from resilient_fetch import ResilientFetcher, FetchError
+from passed.formatter_config import FILE_TYPE_MAPPING, DEFAULT_UPLOAD_PATH
+
+# 이 크기(바이트) 이상이면 큰 파일로 보고 동시에 받는 수를 제한합니다
+LARGE_FILE_SIZE = 20 * 1024 * 1024
+
+# 동시에 받을 큰 파일 수
+MAX_LARGE_TRANSFERS = 2
+
+# 파일 크기를 확인할 때(HEAD 요청) 동시에 보낼 요청 수
+HEAD_CONCURRENCY = 16
+
+# 전체 다운로드 대역폭 제한(바이트/초, None이면 제한 없음)
+BANDWIDTH_LIMIT = None
+
+def file_category(url: str) -> str:
+    """
+    URL의 확장자로 파일 분류(image, track/mp3, track/wav, business, other)를 구하는 함수
+
+    Args:
+        url (str): 파일 URL
+
+    Returns:
+        str: 파일 분류
+    """
+    path = unquote(urlsplit(url).path)
+    extension = os.path.splitext(path)[1].lower()
+    return FILE_TYPE_MAPPING.get(extension, DEFAULT_UPLOAD_PATH)
+
+def _head_size(url: str, fetcher: ResilientFetcher) -> Optional[int]:
+    try:
+        response = fetcher.head(url)
+        response.close()
+    except FetchError:
+        return None
+    size = response.headers.get('Content-Length')
+    return int(size) if size and size.isdigit() else None
+
+def probe_sizes(urls: Iterable[str], fetcher: ResilientFetcher,
+                workers: int = HEAD_CONCURRENCY) -> Dict[str, Optional[int]]:
+    """
+    HEAD 요청의 Content-Length로 파일 크기를 미리 확인하는 함수
+
+    Args:
+        urls (Iterable[str]): 확인할 URL 목록 (정규화된 URL)
+        fetcher (ResilientFetcher): 요청 도구
+        workers (int): 동시에 보낼 요청 수
+
+    Returns:
+        Dict[str, Optional[int]]: URL별 크기 (알 수 없으면 None)
+    """
+    urls = list(urls)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        sizes = list(tqdm(executor.map(lambda url: _head_size(url, fetcher), urls),
+                          total=len(urls), desc="파일 크기 확인"))
+    return dict(zip(urls, sizes))
+
+class DownloadScheduler:
+    """
+    파일 분류별 대기열에서 작은 파일과 큰 파일을 섞어서 내주는 다운로드 순서 관리 클래스
+
+    - 작은 파일은 분류별 대기열에서 크기가 작은 것부터 번갈아 꺼냅니다
+      (이미지 썸네일이 wav 뒤에 밀려 기다리지 않도록)
+    - 큰 파일은 큰 것부터 꺼내되, 동시에 max_large개까지만 받습니다
+      (큰 파일이 대역폭을 계속 쓰는 동안 작은 파일이 빨리 끝나도록)
+    - 크기를 모르는 파일은 작은 파일로 취급합니다
+    """
+
+    def __init__(self, urls: Iterable[str], sizes: Optional[Dict[str, Optional[int]]] = None,
+                 categories: Optional[Dict[str, str]] = None,
+                 large_size: int = LARGE_FILE_SIZE, max_large: int = MAX_LARGE_TRANSFERS):
+        """
+        Args:
+            urls (Iterable[str]): 다운로드할 URL 목록
+            sizes (Dict, optional): URL별 예상 크기
+            categories (Dict, optional): URL별 파일 분류 (없으면 확장자로 구함)
+            large_size (int): 큰 파일 기준 크기(바이트)
+            max_large (int): 동시에 받을 큰 파일 수
+        """
+        sizes = sizes or {}
+        categories = categories or {}
+        self.max_large = max(1, max_large)
+        self.large = deque()
+        self.queues: Dict[str, deque] = {}
+
+        small: Dict[str, List[str]] = {}
+        large = []
+        for url in urls:
+            size = sizes.get(url)
+            if size is not None and size >= large_size:
+                large.append(url)
+            else:
+                category = categories.get(url) or file_category(url)
+                small.setdefault(category, []).append(url)
+
+        self.large.extend(sorted(large, key=lambda url: sizes[url], reverse=True))
+        for category, category_urls in small.items():
+            # 크기를 모르는 파일은 같은 분류의 아는 파일 뒤로 보냅니다 (원래 순서는 유지)
+            category_urls.sort(key=lambda url: (sizes.get(url) is None, sizes.get(url) or 0))
+            self.queues[category] = deque(category_urls)
+        self._order = deque(self.queues)
+        self._active_large = 0
+        self._large_urls = set(large)
+        self._condition = asyncio.Condition()
+
+    def __len__(self) -> int:
+        return len(self.large) + sum(len(queue) for queue in self.queues.values())
+
+    def _take(self) -> Optional[str]:
+        if self.large and self._active_large < self.max_large:
+            self._active_large += 1
+            return self.large.popleft()
+        # 분류별 대기열을 돌아가며 하나씩 꺼냅니다
+        for _ in range(len(self._order)):
+            category = self._order[0]
+            self._order.rotate(-1)
+            if self.queues[category]:
+                return self.queues[category].popleft()
+        return None
+
+    async def next(self) -> Optional[str]:
+        """다음에 받을 URL (남은 파일이 없으면 None)"""
+        async with self._condition:
+            while True:
+                url = self._take()
+                if url is not None or not self.large:
+                    return url
+                # 큰 파일만 남았고 자리가 없으면 하나가 끝날 때까지 기다립니다
+                await self._condition.wait()
+
+    async def done(self, url: str):
+        """URL 하나의 다운로드가 끝났음을 알립니다"""
+        if url in self._large_urls:
+            async with self._condition:
+                self._active_large -= 1
+                self._condition.notify_all()
+
+    async def run(self, download: Callable[[str], Awaitable[object]], concurrency: int):
+        """
+        concurrency개의 작업자가 순서대로 URL을 꺼내서 download를 실행하는 함수
+
+        Args:
+            download (callable): URL 하나를 받는 비동기 함수
+            concurrency (int): 동시에 받을 파일 수
+        """
+        async def worker():
+            while True:
+                url = await self.next()
+                if url is None:
+                    return
+                try:
+                    await download(url)
+                finally:
+                    await self.done(url)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
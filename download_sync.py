@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+from typing import Dict, Optional, Set
+
+# 파일별 ETag/Last-Modified를 저장하는 파일 이름 (동기화 폴더 안에 저장)
+SYNC_STATE_NAME = 'sync_state.json'
+
+def scan_files(base_dir: str) -> Set[str]:
+    """
+    폴더 안의 모든 파일 경로를 한 번에 모으는 함수 (os.scandir로 한 번만 훑음)
+    URL마다 os.path.exists를 부르지 않고 이 목록에서 찾습니다
+
+    Args:
+        base_dir (str): 훑을 폴더
+
+    Returns:
+        Set[str]: base_dir 기준 상대 경로 ('/' 구분)
+    """
+    found = set()
+    if not os.path.isdir(base_dir):
+        return found
+
+    stack = ['']
+    while stack:
+        relative_dir = stack.pop()
+        with os.scandir(os.path.join(base_dir, relative_dir)) as entries:
+            for entry in entries:
+                relative_path = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(relative_path)
+                elif entry.is_file() and not entry.name.endswith('.part'):
+                    found.add(relative_path)
+    return found
+
+class SyncState:
+    """
+    파일별 ETag/Last-Modified를 기록해서 다음 동기화 때 조건부 요청에 쓰는 클래스
+    여러 다운로드가 동시에 기록해도 안전합니다
+    """
+
+    def __init__(self, state_path: str):
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Optional[str]]] = {}
+        if os.path.exists(state_path):
+            with open(state_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+
+    def conditional_headers(self, path: str) -> Dict[str, str]:
+        """
+        저장된 값으로 조건부 요청 헤더를 만드는 함수
+
+        Args:
+            path (str): 동기화 폴더 기준 상대 경로
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since 헤더 (기록이 없으면 빈 딕셔너리)
+        """
+        with self._lock:
+            entry = self._entries.get(path) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def update(self, path: str, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """파일 하나의 ETag/Last-Modified를 기록합니다"""
+        with self._lock:
+            self._entries[path] = {'url': url, 'etag': etag, 'last_modified': last_modified}
+
+    def save(self):
+        """
+        기록을 파일로 저장합니다
+        중간에 멈춰도 기존 기록이 깨지지 않도록 임시 파일에 쓴 뒤 이름을 바꿉니다
+        """
+        with self._lock:
+            content = json.dumps(self._entries, ensure_ascii=False, indent=2, sort_keys=True)
+        temp_path = self.state_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, self.state_path)
@@ -1,12 +1,36 @@
 import sys
 import os
+import asyncio
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QVBoxLayout, 
     QHBoxLayout, QWidget, QFileDialog, QLabel,
-    QMessageBox
+    QMessageBox, QCheckBox, QProgressBar
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 import subprocess
+from csv_pipeline import run_pipeline
+
+class PipelineWorker(QThread):
+    """다운로드와 링크 변환을 함께 처리하는 작업 스레드"""
+    progress = pyqtSignal(int, int, int, int)
+    finished_with_result = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, csv_path, keep_original_on_failure):
+        super().__init__()
+        self.csv_path = csv_path
+        self.keep_original_on_failure = keep_original_on_failure
+
+    def run(self):
+        try:
+            result = asyncio.run(run_pipeline(
+                self.csv_path,
+                keep_original_on_failure=self.keep_original_on_failure,
+                progress=self.progress.emit
+            ))
+            self.finished_with_result.emit(result)
+        except Exception as e:
+            self.failed.emit(str(e))
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -15,7 +39,7 @@ class MainWindow(QMainWindow):
 
     def initUI(self):
         self.setWindowTitle('CSV 파일 처리 프로그램')
-        self.setGeometry(100, 100, 600, 200)
+        self.setGeometry(100, 100, 600, 260)
 
         # 메인 위젯과 레이아웃 설정
         main_widget = QWidget()
@@ -38,10 +62,25 @@ class MainWindow(QMainWindow):
         download_button.clicked.connect(self.download_files)
         convert_button = QPushButton('링크 변환')
         convert_button.clicked.connect(self.convert_links)
+        self.pipeline_button = QPushButton('다운로드 + 변환')
+        self.pipeline_button.clicked.connect(self.run_pipeline)
         button_layout.addWidget(download_button)
         button_layout.addWidget(convert_button)
+        button_layout.addWidget(self.pipeline_button)
         layout.addLayout(button_layout)
 
+        # 함께 처리 옵션과 진행 상황
+        self.keep_original_check = QCheckBox('다운로드에 실패한 링크는 원본 유지')
+        self.keep_original_check.setChecked(True)
+        layout.addWidget(self.keep_original_check)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel('')
+        layout.addWidget(self.status_label)
+
     def select_file(self):
         file_name, _ = QFileDialog.getOpenFileName(
             self,
@@ -69,8 +108,8 @@ class MainWindow(QMainWindow):
                 text=True
             )
             
-            # 파일 경로 입력
-            process.communicate(input=f"{self.selected_file}\n")
+            # 파일 경로 입력 (새 폴더에 다운로드)
+            process.communicate(input=f"{self.selected_file}\n\n")
             
             QMessageBox.information(self, '알림', '다운로드가 시작되었습니다.\n터미널에서 진행 상황을 확인해주세요.')
             
@@ -93,14 +132,56 @@ class MainWindow(QMainWindow):
                 text=True
             )
             
-            # 파일 경로 입력
-            process.communicate(input=f"{self.selected_file}\n")
+            # 파일 경로 입력 (URL 인벤토리는 사용하지 않음)
+            process.communicate(input=f"{self.selected_file}\n\n")
             
             QMessageBox.information(self, '알림', '변환이 시작되었습니다.\n터미널에서 진행 상황을 확인해주세요.')
             
         except Exception as e:
             QMessageBox.critical(self, '오류', f'오류가 발생했습니다:\n{str(e)}')
 
+    def run_pipeline(self):
+        if not hasattr(self, 'selected_file'):
+            QMessageBox.warning(self, '경고', '파일을 선택해주세요.')
+            return
+
+        self.pipeline_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.status_label.setText('처리 중...')
+
+        self.worker = PipelineWorker(self.selected_file, self.keep_original_check.isChecked())
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished_with_result.connect(self.pipeline_finished)
+        self.worker.failed.connect(self.pipeline_failed)
+        self.worker.start()
+
+    def update_progress(self, done_rows, total_rows, success, failed):
+        self.progress_bar.setMaximum(total_rows)
+        self.progress_bar.setValue(done_rows)
+        self.status_label.setText(
+            f'행 {done_rows}/{total_rows} 완료 · 다운로드 성공 {success}개 · 실패 {failed}개'
+        )
+
+    def pipeline_finished(self, result):
+        self.pipeline_button.setEnabled(True)
+        if result is None:
+            self.status_label.setText('')
+            QMessageBox.warning(self, '경고', '처리할 bubble.io URL을 찾을 수 없습니다.')
+            return
+        QMessageBox.information(
+            self, '알림',
+            f"작업이 완료되었습니다.\n"
+            f"다운로드 성공: {result['downloaded']}개, 실패: {result['failed']}개\n"
+            f"변환된 URL 수: {result['rewritten']}개\n"
+            f"다운로드 경로: {os.path.abspath(result['save_dir'])}\n"
+            f"저장된 파일: {result['output_csv_path']}"
+        )
+
+    def pipeline_failed(self, message):
+        self.pipeline_button.setEnabled(True)
+        self.status_label.setText('')
+        QMessageBox.critical(self, '오류', f'오류가 발생했습니다:\n{message}')
+
 def main():
     app = QApplication(sys.argv)
     window = MainWindow()
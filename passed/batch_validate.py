@@ -0,0 +1,164 @@
+# 일괄 변환 전에 헤더만 읽어서 검사하는 도구 (dry-run)
+# 데이터 행은 읽지 않으므로 파일이 커도 파일마다 금방 끝나고,
+# 30개 중 27번째 파일에서 컬럼이 없어 멈추는 일을 변환 시작 전에 막습니다
+import os
+import re
+import pandas as pd
+from formatter_config import TABLE_CONFIGS, DATE_COLUMNS
+from data_formatter import find_table_type
+from sheet_reader import read_sheet_headers
+from compressed_io import split_extension, list_zip_members, open_zip_member, zip_sheet_names
+
+# 변환할 수 있는 파일 확장자 (압축을 뺀 확장자, .csv.gz는 '.csv')
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xls', '.csv', '.zip')
+
+# 날짜 컬럼처럼 보이는 이름 (DATE_COLUMNS에 없으면 변환되지 않으므로 경고)
+# 'date'가 들어간 이름, created_at/'updated at'처럼 at으로 끝나는 단어, '가입일'처럼 일로 끝나는 이름
+# ('format', 'seat'처럼 at으로 끝나는 일반 단어는 제외)
+DATE_NAME_PATTERN = re.compile(r'date|(?:^|[\s_])at$|일$')
+
+def check_columns(columns, table_type):
+    """
+    컬럼 이름만으로 테이블 설정과 맞는지 검사하는 함수
+
+    Args:
+        columns (list): 컬럼 이름 목록
+        table_type (str): 테이블 타입
+
+    Returns:
+        tuple: (문제 목록, 경고 목록, 변환될 날짜 컬럼 목록)
+    """
+    config = TABLE_CONFIGS[table_type]
+    # format_sheet와 같은 방식으로 컬럼 이름을 맞춥니다
+    columns = [str(col).lower().strip() for col in columns]
+    column_set = set(columns)
+    problems = []
+    warnings = []
+
+    for col in config['required_columns']:
+        if col not in column_set:
+            problems.append(f"❌ '{col}' 컬럼이 없습니다")
+    for new_col, old_col in config['uuid_columns'].items():
+        if old_col not in column_set and old_col not in config['required_columns']:
+            problems.append(f"❌ '{old_col}' 컬럼이 없어 '{new_col}' 컬럼을 만들 수 없습니다")
+
+    date_columns = [col for col in DATE_COLUMNS if col in column_set]
+    date_targets = set(DATE_COLUMNS.values())
+    for col in columns:
+        if col in DATE_COLUMNS or col in date_targets:
+            continue
+        if DATE_NAME_PATTERN.search(col):
+            warnings.append(f"⚠️ '{col}' 컬럼은 날짜처럼 보이지만 DATE_COLUMNS에 없어 변환되지 않습니다")
+
+    return problems, warnings, date_columns
+
+def validate_file(file_path):
+    """
+    파일 하나의 헤더만 읽어서 변환 계획과 문제를 정리하는 함수
+
+    Args:
+        file_path (str): CSV(.csv.gz), zip 또는 엑셀 파일 경로
+
+    Returns:
+        list: 시트(CSV는 파일, zip은 안의 CSV)마다 하나씩 계획 항목 (dict)
+            - file, sheet, table_type, columns, date_columns, problems, warnings
+    """
+    def entry(sheet=None, table_type=None, columns=None, date_columns=None,
+              problems=None, warnings=None):
+        return {
+            'file': file_path,
+            'sheet': sheet,
+            'table_type': table_type,
+            'columns': len(columns or []),
+            'date_columns': date_columns or [],
+            'problems': problems or [],
+            'warnings': warnings or [],
+        }
+
+    file_extension, _ = split_extension(file_path)
+    if file_extension not in SUPPORTED_EXTENSIONS:
+        return [entry(problems=["❌ 지원하지 않는 파일 형식입니다."])]
+    if not os.path.exists(file_path):
+        return [entry(problems=["❌ 파일이 없습니다."])]
+
+    if file_extension == '.csv':
+        table_type = find_table_type(file_path)
+        if table_type is None:
+            return [entry(problems=["❌ 파일명에서 테이블 타입을 찾을 수 없습니다."])]
+        try:
+            columns = list(pd.read_csv(file_path, nrows=0).columns)
+        except Exception as e:
+            return [entry(table_type=table_type, problems=[f"❌ 헤더를 읽을 수 없습니다: {str(e)}"])]
+        problems, warnings, date_columns = check_columns(columns, table_type)
+        return [entry(None, table_type, columns, date_columns, problems, warnings)]
+
+    try:
+        if file_extension == '.zip':
+            headers = {}
+            table_types = {}
+            # 압축을 풀면서 첫 줄만 읽습니다 (format_data와 같은 시트 이름 사용)
+            for member, sheet_name in zip_sheet_names(list_zip_members(file_path)):
+                with open_zip_member(file_path, member) as handle:
+                    headers[sheet_name] = list(pd.read_csv(handle, nrows=0).columns)
+                table_types[sheet_name] = find_table_type(member)
+        else:
+            headers = read_sheet_headers(file_path)
+            table_types = {name: name.lower() for name in headers}
+    except Exception as e:
+        return [entry(problems=[f"❌ 헤더를 읽을 수 없습니다: {str(e)}"])]
+
+    entries = []
+    for sheet_name, columns in headers.items():
+        table_type = table_types[sheet_name]
+        if table_type not in TABLE_CONFIGS:
+            entries.append(entry(sheet_name, warnings=["⚠️ 테이블 타입이 아니어서 건너뜁니다"]))
+            continue
+        problems, warnings, date_columns = check_columns(columns, table_type)
+        entries.append(entry(sheet_name, table_type, columns, date_columns, problems, warnings))
+    if not any(item['table_type'] for item in entries):
+        entries.append(entry(problems=["❌ 테이블 타입인 시트가 없습니다."]))
+    return entries
+
+def validate_batch(file_paths):
+    """
+    여러 파일을 변환 전에 한꺼번에 검사하는 함수
+
+    Args:
+        file_paths (list): 파일 경로 목록
+
+    Returns:
+        tuple: (계획 항목 목록, 문제가 있는 파일 경로 목록)
+    """
+    plan = []
+    bad_files = []
+    for file_path in file_paths:
+        entries = validate_file(file_path)
+        plan.extend(entries)
+        if any(item['problems'] for item in entries):
+            bad_files.append(file_path)
+    return plan, bad_files
+
+def format_plan(plan):
+    """
+    검사 결과를 사람이 읽기 좋은 글로 만드는 함수
+
+    Args:
+        plan (list): validate_batch()가 돌려준 계획 항목 목록
+
+    Returns:
+        str: 검사 결과
+    """
+    lines = []
+    for item in plan:
+        name = os.path.basename(item['file'])
+        if item['sheet']:
+            name += f" [{item['sheet']}]"
+        if item['table_type']:
+            line = f"📁 {name} → {item['table_type']} (컬럼 {item['columns']}개"
+            if item['date_columns']:
+                line += f", 날짜 {', '.join(item['date_columns'])}"
+            lines.append(line + ")")
+        else:
+            lines.append(f"📁 {name}")
+        lines.extend(f"    {message}" for message in item['problems'] + item['warnings'])
+    return '\n'.join(lines)
@@ -0,0 +1,168 @@
+# 포맷팅하면서 함께 모으는 컬럼 품질 통계 (빈 값 비율, 고유값 수, 날짜 변환 실패, 기본값 채움)
+# 데이터를 한 번 더 읽지 않도록 format_sheet가 이미 만든 마스크를 그대로 받아서 셉니다
+import html
+import json
+import numpy as np
+import pandas as pd
+
+# 고유값 수 추정에 쓰는 레지스터 수 = 2 ** HLL_PRECISION (오차 약 1.04 / sqrt(레지스터 수) ≈ 1.6%)
+HLL_PRECISION = 12
+
+class HyperLogLog:
+    """
+    고유값 수를 고정된 메모리(2 ** precision 바이트)로 추정하는 HyperLogLog 스케치
+    표가 아무리 커도 컬럼마다 몇 KB만 씁니다
+    """
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = np.zeros(self.size, dtype=np.uint8)
+
+    def add(self, values):
+        """
+        값들을 스케치에 더합니다 (빈 값은 넘기기 전에 빼주세요)
+
+        Args:
+            values (pandas.Series): 더할 값들
+        """
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy(np.uint64)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        # 남은 비트의 앞쪽 0 개수 + 1 (위 32비트만 보면 float 변환이 정확하고 그 아래는 무시해도 됩니다)
+        remaining = (hashes << np.uint64(self.precision)) >> np.uint64(32)
+        high = remaining.astype(np.float64)
+        rank = np.where(high > 0, 32 - np.floor(np.log2(np.maximum(high, 1))), 33).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        """추정한 고유값 수"""
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * self.size and zeros:
+            # 값이 적을 때는 빈 레지스터 수로 세는 편이 정확합니다
+            estimate = self.size * np.log(self.size / zeros)
+        return int(round(estimate))
+
+def blank_mask(series):
+    """
+    빈 값(NaN 또는 공백뿐인 문자열) 위치를 돌려주는 함수
+
+    Args:
+        series (pandas.Series): 검사할 컬럼
+
+    Returns:
+        pandas.Series: 빈 값이면 True
+    """
+    mask = series.isna()
+    if series.dtype == object:
+        mask |= series.astype(str).str.strip().eq('')
+    return mask
+
+class TableProfile:
+    """
+    테이블(시트) 하나의 컬럼별 통계
+
+    - observe()로 원본 조각마다 행 수, 빈 값 수, 고유값 스케치를 더합니다
+    - add_defaults()/add_dates()로 format_sheet가 만든 마스크의 개수를 더합니다
+    - 조각으로 나눠 포맷팅해도 같은 객체에 계속 더하면 됩니다
+    """
+
+    def __init__(self, table_type, precision=HLL_PRECISION):
+        self.table_type = table_type
+        self.precision = precision
+        self.rows = 0
+        self.columns = {}
+
+    def _column(self, name):
+        if name not in self.columns:
+            self.columns[name] = {
+                'nulls': 0,
+                'sketch': HyperLogLog(self.precision),
+                'defaults_filled': 0,
+                'date_attempted': 0,
+                'date_failed': 0,
+            }
+        return self.columns[name]
+
+    def observe(self, df):
+        """원본 조각 하나의 행 수, 빈 값 수, 고유값을 더합니다"""
+        self.rows += len(df)
+        for name in df.columns:
+            series = df[name]
+            mask = blank_mask(series)
+            stats = self._column(name)
+            stats['nulls'] += int(mask.sum())
+            stats['sketch'].add(series[~mask])
+
+    def add_defaults(self, column, filled):
+        """기본값으로 채운 칸 수를 더합니다"""
+        self._column(column)['defaults_filled'] += int(filled)
+
+    def add_dates(self, column, attempted, failed):
+        """날짜 변환을 시도한 칸 수와 실패한 칸 수를 더합니다"""
+        stats = self._column(column)
+        stats['date_attempted'] += int(attempted)
+        stats['date_failed'] += int(failed)
+
+    def to_dict(self):
+        columns = {}
+        for name, stats in self.columns.items():
+            columns[name] = {
+                'nulls': stats['nulls'],
+                'null_rate': round(stats['nulls'] / self.rows, 4) if self.rows else 0,
+                'distinct_estimate': stats['sketch'].count(),
+                'defaults_filled': stats['defaults_filled'],
+                'date_attempted': stats['date_attempted'],
+                'date_failed': stats['date_failed'],
+                'date_failure_rate': (round(stats['date_failed'] / stats['date_attempted'], 4)
+                                      if stats['date_attempted'] else 0),
+            }
+        return {'table_type': self.table_type, 'rows': self.rows, 'columns': columns}
+
+def write_profile(profiles, base_path):
+    """
+    통계를 JSON과 HTML 파일로 저장하는 함수
+
+    Args:
+        profiles (dict): {시트/테이블 이름: TableProfile}
+        base_path (str): 확장자를 뺀 저장 경로 (예: 'out/album_formatted_profile')
+
+    Returns:
+        tuple: (JSON 경로, HTML 경로)
+    """
+    data = {name: profile.to_dict() for name, profile in profiles.items()}
+    json_path = base_path + '.json'
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><title>컬럼 통계</title>',
+             '<style>body{font-family:sans-serif;font-size:13px}'
+             'table{border-collapse:collapse;margin-bottom:24px}'
+             'th,td{border:1px solid #ddd;padding:4px 8px;text-align:right}'
+             'th:first-child,td:first-child{text-align:left}.bad{color:#dc3545}</style></head><body>']
+    for name, profile in data.items():
+        parts.append(f"<h2>{html.escape(str(name))} ({html.escape(str(profile['table_type']))}, "
+                     f"{profile['rows']}행)</h2>")
+        parts.append('<table><tr><th>컬럼</th><th>빈 값 비율</th><th>고유값(추정)</th>'
+                     '<th>기본값 채움</th><th>날짜 변환 실패</th></tr>')
+        for column, stats in profile['columns'].items():
+            date_cell = ''
+            if stats['date_attempted']:
+                css = ' class="bad"' if stats['date_failed'] else ''
+                date_cell = (f"<span{css}>{stats['date_failed']} / {stats['date_attempted']} "
+                             f"({stats['date_failure_rate']:.1%})</span>")
+            parts.append(f"<tr><td>{html.escape(str(column))}</td><td>{stats['null_rate']:.1%}</td>"
+                         f"<td>{stats['distinct_estimate']}</td><td>{stats['defaults_filled'] or ''}</td>"
+                         f"<td>{date_cell}</td></tr>")
+        parts.append('</table>')
+    parts.append('</body></html>')
+    html_path = base_path + '.html'
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(parts))
+    return json_path, html_path
@@ -0,0 +1,239 @@
+# 압축된 입력(.csv.gz, .zip)을 풀지 않고 바로 읽고, 결과를 여러 스레드로 gzip 압축해서 쓰는 도구
+import gzip
+import io
+import os
+import zlib
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+# 압축 형식별 확장자
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.zip': 'zip'}
+
+# 출력 압축 형식 (None이면 압축하지 않음)
+OUTPUT_COMPRESSIONS = (None, 'gzip')
+
+# gzip 압축 수준 (1: 빠름 ~ 9: 작음)
+GZIP_LEVEL = 6
+
+# 스레드마다 한 번에 압축할 크기(바이트)
+GZIP_BLOCK_SIZE = 4 * 1024 * 1024
+
+# 압축 스레드 수
+GZIP_WORKERS = os.cpu_count() or 4
+
+# zip 안에서 읽을 수 있는 파일 확장자
+ZIP_MEMBER_EXTENSIONS = ('.csv', '.csv.gz')
+
+# 엑셀 시트 이름 최대 길이
+SHEET_NAME_LIMIT = 31
+
+def split_extension(file_path):
+    """
+    파일 확장자와 압축 형식을 나누는 함수
+    예시: 'album.csv.gz' -> ('.csv', 'gzip'), 'export.zip' -> ('.zip', 'zip'), 'a.xlsx' -> ('.xlsx', None)
+
+    Args:
+        file_path (str): 파일 경로
+
+    Returns:
+        tuple: (압축을 뺀 확장자, 압축 형식)
+    """
+    root, extension = os.path.splitext(file_path)
+    extension = extension.lower()
+    if extension == '.gz':
+        return os.path.splitext(root)[1].lower(), 'gzip'
+    if extension == '.zip':
+        return '.zip', 'zip'
+    return extension, None
+
+def strip_extension(file_name):
+    """압축 확장자까지 뺀 파일 이름 (예: 'album.csv.gz' -> 'album')"""
+    root, extension = os.path.splitext(file_name)
+    if extension.lower() == '.gz':
+        root = os.path.splitext(root)[0]
+    return root
+
+def list_zip_members(file_path):
+    """
+    zip 파일 안에서 읽을 수 있는 CSV 파일 이름 목록 (폴더 구조와 macOS 메타데이터는 건너뜀)
+
+    Args:
+        file_path (str): zip 파일 경로
+
+    Returns:
+        list: zip 안의 파일 이름 목록
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        return [
+            info.filename for info in archive.infolist()
+            if not info.is_dir()
+            and not os.path.basename(info.filename).startswith('._')
+            and '__MACOSX/' not in info.filename
+            and info.filename.lower().endswith(ZIP_MEMBER_EXTENSIONS)
+        ]
+
+def zip_sheet_names(members):
+    """
+    zip 안의 파일마다 결과 시트 이름을 정하는 함수
+    파일 이름을 31자로 자르면 겹칠 수 있으므로 겹치면 '_2', '_3'을 붙입니다 (엑셀처럼 대소문자 구분 없음)
+
+    Args:
+        members (list): zip 안의 파일 이름 목록
+
+    Returns:
+        list: (zip 안의 파일 이름, 시트 이름) 목록
+    """
+    used = set()
+    names = []
+    for member in members:
+        base = strip_extension(os.path.basename(member))
+        sheet_name = base[:SHEET_NAME_LIMIT]
+        counter = 2
+        while sheet_name.lower() in used:
+            suffix = f"_{counter}"
+            sheet_name = base[:SHEET_NAME_LIMIT - len(suffix)] + suffix
+            counter += 1
+        used.add(sheet_name.lower())
+        names.append((member, sheet_name))
+    return names
+
+class ZipMemberReader(io.BufferedIOBase):
+    """
+    zip 안의 파일 하나를 압축을 풀면서 읽는 파일 객체 (디스크에 풀지 않음)
+    .gz 파일은 gzip 압축도 함께 풀고, 닫으면 gzip → zip 안의 파일 → zip 파일 순서로 모두 닫습니다
+    """
+
+    def __init__(self, file_path, member):
+        """
+        Args:
+            file_path (str): zip 파일 경로
+            member (str): zip 안의 파일 이름
+        """
+        super().__init__()
+        self._archive = zipfile.ZipFile(file_path)
+        self._member = None
+        self._gzip = None
+        try:
+            self._member = self._archive.open(member)
+            if member.lower().endswith('.gz'):
+                self._gzip = gzip.GzipFile(fileobj=self._member)
+        except Exception:
+            self.close()
+            raise
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return (self._gzip or self._member).read(size)
+
+    def read1(self, size=-1):
+        return (self._gzip or self._member).read1(size)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            for handle in (self._gzip, self._member, self._archive):
+                if handle is not None:
+                    handle.close()
+        finally:
+            super().close()
+
+def open_zip_member(file_path, member):
+    """
+    zip 안의 파일 하나를 압축을 풀면서 읽는 파일 객체로 여는 함수 (디스크에 풀지 않음)
+
+    Args:
+        file_path (str): zip 파일 경로
+        member (str): zip 안의 파일 이름
+
+    Returns:
+        ZipMemberReader: 읽기용 파일 객체 (with 문으로 쓰면 zip 파일까지 닫힘)
+    """
+    return ZipMemberReader(file_path, member)
+
+class ParallelGzipWriter(io.RawIOBase):
+    """
+    여러 스레드로 압축하는 gzip 파일 쓰기 객체 (텍스트는 'utf-8'로 바꿔서 씀)
+
+    - 쓴 내용을 block_size씩 나눠서 각 블록을 독립된 gzip 멤버로 압축합니다
+    - gzip 멤버를 이어 붙인 파일은 일반 gzip 파일과 똑같이 읽힙니다 (gzip, pandas, zcat 모두 지원)
+    - zlib은 압축하는 동안 GIL을 놓으므로 스레드 수만큼 빨라지고,
+      기다리는 블록 수를 workers * 2개로 제한해서 메모리도 일정하게 씁니다
+    """
+
+    def __init__(self, path, level=GZIP_LEVEL, block_size=GZIP_BLOCK_SIZE, workers=GZIP_WORKERS):
+        """
+        Args:
+            path (str): 저장할 파일 경로
+            level (int): 압축 수준
+            block_size (int): 블록 크기(바이트)
+            workers (int): 압축 스레드 수
+        """
+        super().__init__()
+        self.path = path
+        self.level = level
+        self.block_size = block_size
+        self.workers = max(1, workers)
+        self._file = open(path, 'wb')
+        self._buffer = bytearray()
+        self._pending = []
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            block = bytes(self._buffer[:self.block_size])
+            del self._buffer[:self.block_size]
+            self._submit(block)
+        return len(data)
+
+    def _compress(self, block):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)  # 31 = gzip 헤더 포함
+        return compressor.compress(block) + compressor.flush()
+
+    def _submit(self, block):
+        self._pending.append(self._pool.submit(self._compress, block))
+        # 앞 블록부터 순서대로 파일에 씁니다
+        while len(self._pending) > self.workers * 2 or (self._pending and self._pending[0].done()):
+            self._file.write(self._pending.pop(0).result())
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._buffer or (not self._pending and self._file.tell() == 0):
+                # 빈 파일도 올바른 gzip 파일이 되도록 마지막 블록은 비어 있어도 씁니다
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            for future in self._pending:
+                self._file.write(future.result())
+            self._pending.clear()
+        finally:
+            self._pool.shutdown()
+            self._file.close()
+            super().close()
+
+def open_text_output(path, compression=None):
+    """
+    결과를 쓸 텍스트 파일을 여는 함수
+
+    Args:
+        path (str): 저장할 파일 경로
+        compression (str, optional): 'gzip'이면 여러 스레드로 압축해서 씀
+
+    Returns:
+        TextIO: 쓰기용 텍스트 파일 객체
+    """
+    if compression is None:
+        return open(path, 'w', encoding='utf-8', newline='')
+    if compression != 'gzip':
+        raise ValueError(f"❌ 지원하지 않는 압축 형식입니다: {compression}")
+    return io.TextIOWrapper(io.BufferedWriter(ParallelGzipWriter(path), buffer_size=1024 * 1024),
+                            encoding='utf-8', newline='')
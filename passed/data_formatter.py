@@ -4,7 +4,20 @@ import hashlib  # 텍스트를 해시로 바꿀 때 사용하는 도구
 from datetime import datetime  # 날짜와 시간을 다룰 때 사용하는 도구
 import re  # 텍스트 패턴을 찾을 때 사용하는 도구
 import os  # 파일 경로를 다룰 때 사용하는 도구
-from formatter_config import TABLE_CONFIGS
+import time  # 처리 시간을 잴 때 사용하는 도구
+from formatter_config import TABLE_CONFIGS, DATE_COLUMNS
+from sheet_writer import SheetWriter, WRITER_BACKENDS
+from sheet_reader import DEFAULT_CHUNK_SIZE, READER_BACKENDS, iter_workbook_chunks, prefetch
+from event_log import default_log
+from column_profile import TableProfile, blank_mask, write_profile
+from uuid_index import UuidIndex
+from duplicate_check import DuplicateChecker, DUPLICATE_POLICY, DUPLICATE_KEEP_LAST, DUPLICATE_SIDE_FILE
+from result_cache import hash_config
+from compressed_io import (split_extension, strip_extension, list_zip_members, open_zip_member,
+                           zip_sheet_names, open_text_output, OUTPUT_COMPRESSIONS)
+
+# 포맷터 버전 (포맷팅 결과가 바뀌는 수정을 하면 올려주세요. 결과 캐시가 이 값으로 구분됩니다)
+FORMATTER_VERSION = '2'
 
 def generate_uuid_from_text(text):
     """
@@ -78,13 +91,17 @@ def parse_custom_date(input_str):
     except:
         return None
 
-def format_sheet(df, table_type):
+def format_sheet(df, table_type, url_rewriter=None, profile=None, duplicates=None):
     """
     데이터프레임을 포맷팅하는 함수
     
     Args:
         df (pandas.DataFrame): 처리할 데이터프레임
         table_type (str): 테이블 타입
+        url_rewriter (UrlRewriter, optional): 파일 URL을 새 저장소 URL로 바꿀 변환기
+        profile (TableProfile, optional): 포맷팅하면서 컬럼 통계를 함께 모을 객체
+            (빈 값 비율, 고유값 수, 기본값 채움 수, 날짜 변환 실패 수)
+        duplicates (DuplicateChecker, optional): unique_id 중복을 찾아서 처리할 객체
     
     Returns:
         pandas.DataFrame: 포맷팅된 데이터프레임
@@ -103,66 +120,223 @@ def format_sheet(df, table_type):
         if col not in df.columns:
             raise ValueError(f"❌ '{col}' 컬럼이 없습니다")
     
+    # 원본 값의 통계는 값을 바꾸기 전에 모읍니다
+    if profile is not None:
+        profile.observe(df)
+    
     # 1. 먼저 빈 값이 있는 컬럼들을 채웁니다
     for new_col, old_col in config['uuid_columns'].items():
-        # 원본 컬럼의 빈 값 채우기
+        # 원본 컬럼의 빈 값 채우기 (빈 칸 마스크를 한 번에 구해서 채움)
         if old_col in config.get('default_values', {}):
-            df[old_col] = df[old_col].apply(
-                lambda x: config['default_values'][old_col] if pd.isna(x) or str(x).strip() == "" else x
-            )
+            empty = blank_mask(df[old_col])
+            df[old_col] = df[old_col].mask(empty, config['default_values'][old_col])
+            if profile is not None:
+                profile.add_defaults(old_col, empty.sum())
     
     # 2. 그 다음 변환된 컬럼들을 생성합니다
     for new_col, old_col in config['uuid_columns'].items():
         df[new_col] = df[old_col].apply(generate_uuid_from_text)
     
-    # 날짜 컬럼 매핑 정의
-    date_columns = {
-        'creation date': 'created_date',
-        'modified date': 'modified_date',
-        'dateofbirth': 'date_of_birth',
-        'joinedat': 'joined_at',
-        'createdat': 'created_at',
-        # 'leftat': 'left_at', 안쓰는 컬럼
-        'cidexpiredat': 'cid_expired_at',
-        'cidpublishedat': 'cid_published_at',
-        'publishedat': 'published_at',
-        'registeredat': 'registered_at',
-        '발매일' : 'release_date',
-        'profit date' : 'profit_date',
-        'profitdate' : 'profit_date',
-        'payoutdate' : 'payout_date',
-        'requestdate' : 'request_date',
-        'registeredat' : 'registered_at',
-        'contractdate' : 'contract_date',
-        'testperiod' : 'test_period',
-        'dateupload' : 'date_upload',
-        'dateuploadplpl' : 'date_upload_plpl',
-    }
-
     # 날짜 컬럼 처리
-    for old_col, new_col in date_columns.items():
+    for old_col, new_col in DATE_COLUMNS.items():
         if old_col in df.columns:
             df[new_col] = df[old_col].apply(parse_custom_date)
+            if profile is not None:
+                # 값이 있었는데 날짜로 바꾸지 못한 칸이 변환 실패입니다
+                attempted = ~blank_mask(df[old_col])
+                profile.add_dates(old_col, attempted.sum(), (attempted & df[new_col].isna()).sum())
     
     # Boolean 변환 처리
     for col in df.columns:
         df[col] = df[col].apply(lambda x: True if str(x).strip() == '네' else (False if str(x).strip() == '아니오' else x))
     
+    # 파일 URL 변환
+    if url_rewriter is not None:
+        df, _ = url_rewriter.rewrite_frame(df, table=table_type)
+    
+    # unique_id 중복 처리 (앞 조각에서 나온 unique_id와도 비교)
+    if duplicates is not None:
+        df = duplicates.filter(df)
+    
     return df
 
-def format_data(file_path, output_dir=None):
+def find_table_type(file_path):
+    """
+    CSV 파일명에 들어있는 테이블 타입을 찾는 함수
+    예시: "album_export.csv" -> "album"
+    
+    Args:
+        file_path (str): CSV 파일 경로
+    
+    Returns:
+        str: 테이블 타입 (찾지 못하면 None)
+    """
+    file_name = os.path.basename(file_path).lower()
+    
+    # 파일명에 테이블 타입이 포함되어 있는지 확인
+    for type_name in TABLE_CONFIGS.keys():
+        if type_name in file_name:
+            return type_name
+    return None
+
+def new_duplicate_checker(policy, output_path, sheet_name=None):
+    """
+    출력 파일에 맞는 unique_id 중복 검사기를 만드는 함수
+
+    Args:
+        policy (str): 중복 처리 방식 (None이면 검사하지 않음)
+        output_path (str): 출력 파일 경로 (중복 행 파일 이름을 정할 때 사용)
+        sheet_name (str, optional): 시트 이름 (엑셀 파일인 경우)
+
+    Returns:
+        DuplicateChecker: 중복 검사기 (policy가 None이면 None)
+    """
+    if policy is None:
+        return None
+    side_path = strip_extension(output_path)
+    if sheet_name:
+        side_path += f"_{sheet_name}"
+    return DuplicateChecker(policy, side_path + '_duplicates.csv')
+
+def report_duplicates(duplicates, name, log, summary):
+    """찾은 unique_id 중복 수를 기록에 남기는 함수"""
+    if duplicates is None or not duplicates.duplicates:
+        return
+    summary['duplicates'] += duplicates.duplicates
+    message = f"⚠️ {name}: unique id 중복 {duplicates.duplicates}건 ({duplicates.policy})"
+    if duplicates.policy == DUPLICATE_SIDE_FILE:
+        message += f" → {duplicates.side_path}"
+    log.warning(message, item=name, duplicates=duplicates.duplicates,
+                samples=duplicates.samples)
+
+def read_reference_columns(output_path, file_path):
+    """
+    포맷팅 결과에서 unique_id와 외래 키 컬럼만 다시 읽는 함수 (캐시된 결과를 참조 검사에 넣을 때 사용)
+
+    Args:
+        output_path (str): 포맷팅 결과 경로 (CSV(.gz), 엑셀 파일 또는 시트별 CSV 폴더)
+        file_path (str): 원본 파일 경로 (CSV 결과의 테이블 타입을 찾을 때 사용)
+
+    Returns:
+        iterator: (테이블 타입, 데이터프레임) 튜플
+    """
+    def wanted(table_type):
+        columns = {'unique_id'} | set(TABLE_CONFIGS[table_type].get('foreign_keys', {}))
+        return lambda column: column in columns
+
+    if os.path.isdir(output_path):
+        sheets = [(strip_extension(name), os.path.join(output_path, name))
+                  for name in sorted(os.listdir(output_path)) if name.endswith(('.csv', '.csv.gz'))]
+    elif output_path.lower().endswith(('.csv', '.csv.gz')):
+        sheets = [(find_table_type(file_path), output_path)]
+    else:
+        sheets = [(name, None) for name in pd.ExcelFile(output_path).sheet_names]
+
+    for sheet_name, csv_path in sheets:
+        table_type = (sheet_name or '').lower()
+        if table_type not in TABLE_CONFIGS:
+            # zip 입력은 시트 이름이 원래 파일 이름이므로 그 안에서 테이블 타입을 찾습니다
+            table_type = find_table_type(sheet_name or '')
+        if table_type is None:
+            continue
+        if csv_path is not None:
+            yield table_type, pd.read_csv(csv_path, usecols=wanted(table_type))
+        else:
+            yield table_type, pd.read_excel(output_path, sheet_name=sheet_name,
+                                            usecols=wanted(table_type))
+
+def get_output_path(output_dir, base_name, extension):
+    """
+    겹치지 않는 출력 경로를 만드는 함수
+    파일이 이미 존재하면 번호를 붙입니다 (예: name_formatted_1.csv)
+    
+    Args:
+        output_dir (str): 출력 디렉토리 경로
+        base_name (str): 확장자를 뺀 파일 이름
+        extension (str): 확장자 (폴더로 저장하는 경우 빈 문자열)
+    
+    Returns:
+        str: 출력 경로
+    """
+    output_path = os.path.join(output_dir, base_name + extension)
+    counter = 1
+    while os.path.exists(output_path):
+        output_path = os.path.join(output_dir, f"{base_name}_{counter}{extension}")
+        counter += 1
+    return output_path
+
+def format_data(file_path, output_dir=None, writer_backend='pandas', reader_backend='pandas',
+                chunk_size=DEFAULT_CHUNK_SIZE, url_rewriter=None, log=None, summary=None,
+                profile=False, duplicate_policy=DUPLICATE_POLICY, references=None, uuid_index=None,
+                cache=None, compression=None):
     """
     엑셀 파일의 모든 시트를 포맷팅하는 함수
+    CSV(.csv, .csv.gz)와 zip 파일(안의 CSV마다 파일 이름으로 테이블 타입을 찾음)도 풀지 않고 바로 읽습니다
     
     Args:
-        file_path (str): 처리할 파일의 경로
+        file_path (str): 처리할 파일의 경로 (.xlsx, .xls, .csv, .csv.gz, .zip)
         output_dir (str, optional): 출력 파일을 저장할 디렉토리 경로
+        writer_backend (str, optional): 엑셀 저장 방식
+            - 'pandas': 기본 pd.ExcelWriter
+            - 'xlsxwriter': constant_memory 모드로 스트리밍 저장 (큰 시트용)
+            - 'openpyxl': write_only 모드로 스트리밍 저장 (큰 시트용)
+            - 'csv': 엑셀 대신 시트마다 CSV 파일로 저장 (폴더 경로를 반환)
+        reader_backend (str, optional): 엑셀 읽기 방식
+            - 'pandas': 기본 pd.read_excel (시트 전체를 한 번에 읽음)
+            - 'openpyxl': read_only 모드로 chunk_size 행씩 읽으면서 포맷팅 (.xlsx 전용)
+        chunk_size (int, optional): openpyxl 읽기 방식에서 한 번에 포맷팅할 행 수
+        url_rewriter (UrlRewriter, optional): 파일 URL을 새 저장소 URL로 바꿀 변환기
+            (예: UrlRewriter(rules_from_bucket_configs(BUCKET_CONFIGS) + DEFAULT_REWRITE_RULES))
+        log (EventLog, optional): 시트별 결과를 남길 기록 도구 (없으면 모두 화면에 출력)
+        summary (dict, optional): 처리 결과를 담아 돌려받을 딕셔너리
+            - 'tables': 처리한 테이블 타입 목록
+            - 'rows': 처리한 전체 행 수
+            - 'profile': 컬럼 통계 파일 경로 (profile=True인 경우)
+        profile (bool, optional): 포맷팅하면서 컬럼 통계를 모아 출력 파일 옆에
+            '<출력 파일 이름>_profile.json/.html'로 저장할지 여부
+        duplicate_policy (str, optional): unique_id 중복 처리 방식 (None이면 검사하지 않음)
+            - 'report': 중복 수만 기록하고 행은 그대로 둠 (기본값)
+            - 'fail': 중복이 있으면 오류
+            - 'keep_first': 처음 나온 행만 남김
+            - 'keep_last': 'modified date'가 가장 늦은 행만 남김 (시트 전체를 한 번에 읽음)
+            - 'side_file': 처음 나온 행만 남기고 나머지는 '<출력 파일 이름>_duplicates.csv'에 저장
+        references (ReferenceCollector, optional): 테이블 사이 참조 검사를 위해
+            포맷팅한 unique_id와 외래 키 값을 모을 객체
+        uuid_index (str, optional): UUID → 원래 값 역방향 색인 파일 경로
+            (예: os.path.join(output_dir, UUID_INDEX_NAME), 이미 있으면 이어서 합침)
+        cache (ResultCache, optional): 결과 캐시. 같은 내용의 파일을 같은 설정으로 변환한 적이 있으면
+            다시 포맷팅하지 않고 이전 결과를 돌려줌 (URL 변환, 통계, 역방향 색인을 쓰면 사용하지 않음)
+        compression (str, optional): CSV 결과 압축 형식 ('gzip'이면 여러 스레드로 압축해서 .csv.gz로 저장,
+            엑셀 결과는 이미 압축된 형식이라 그대로 저장)
     
     Returns:
         str: 포맷팅된 파일의 경로
     """
-    # 파일 확장자 확인
-    file_extension = os.path.splitext(file_path)[1].lower()
+    if log is None:
+        log = default_log
+    if summary is None:
+        summary = {}
+    summary['tables'] = []
+    summary['rows'] = 0
+    summary['duplicates'] = 0
+    # 시트(테이블)별 컬럼 통계
+    profiles = {} if profile else None
+    
+    # 가장 늦은 행을 고르려면 시트 전체를 봐야 하므로 조금씩 읽지 않습니다
+    if duplicate_policy == DUPLICATE_KEEP_LAST and reader_backend == 'openpyxl':
+        log.warning("⚠️ keep_last 중복 처리는 시트 전체를 한 번에 읽습니다 (pandas 읽기 방식 사용)",
+                    item=file_path)
+        reader_backend = 'pandas'
+    
+    if writer_backend not in WRITER_BACKENDS:
+        raise ValueError(f"❌ 지원하지 않는 저장 방식입니다: {writer_backend}")
+    if reader_backend not in READER_BACKENDS:
+        raise ValueError(f"❌ 지원하지 않는 읽기 방식입니다: {reader_backend}")
+    if compression not in OUTPUT_COMPRESSIONS:
+        raise ValueError(f"❌ 지원하지 않는 압축 형식입니다: {compression}")
+    
+    # 파일 확장자 확인 (.csv.gz는 '.csv', zip 파일은 '.zip')
+    file_extension, _ = split_extension(file_path)
     
     # 출력 디렉토리 설정
     if output_dir is None:
@@ -171,62 +345,182 @@ def format_data(file_path, output_dir=None):
         # 출력 디렉토리가 없으면 생성
         os.makedirs(output_dir, exist_ok=True)
     
-    if file_extension == '.csv':
-        # CSV 파일명에서 테이블 타입 추출
-        file_name = os.path.basename(file_path).lower()
-        table_type = None
-        
-        # 파일명에 테이블 타입이 포함되어 있는지 확인
-        for type_name in TABLE_CONFIGS.keys():
-            if type_name in file_name:
-                table_type = type_name
-                break
+    base_name = strip_extension(os.path.basename(file_path)) + '_formatted'
+    csv_extension = '.csv.gz' if compression == 'gzip' else '.csv'
+    
+    failed_sheets = []
+    
+    # 결과 캐시 확인 (입력 파일 내용 + 포맷팅 결과에 영향을 주는 설정이 같으면 이전 결과 사용)
+    cache_key = None
+    # 역방향 색인 (UUID → 원래 Bubble 값). 중간에 오류가 나도 연결을 닫습니다
+    index = UuidIndex(uuid_index) if uuid_index else None
+    
+    if cache is not None and url_rewriter is None and not profile and index is None:
+        if file_extension == '.csv':
+            table_configs = TABLE_CONFIGS.get(find_table_type(file_path))
+        else:
+            table_configs = TABLE_CONFIGS
+        cache_key = cache.key(file_path, hash_config(FORMATTER_VERSION, file_extension, table_configs,
+                                                     DATE_COLUMNS, writer_backend, duplicate_policy,
+                                                     compression))
+        cached = cache.get(cache_key, output_dir,
+                           lambda extension: get_output_path(output_dir, base_name, extension))
+        if cached is not None:
+            output_path, meta = cached
+            summary.update(meta)
+            if references is not None:
+                # 참조 검사에 필요한 컬럼만 이전 결과에서 다시 읽습니다
+                for table_type, df in read_reference_columns(output_path, file_path):
+                    references.add(table_type, df)
+            log.info(f"⏭️ 변경 없음: 이전 결과를 사용합니다 ({os.path.basename(output_path)})",
+                     item=file_path, cached=True)
+            return output_path
+    
+    try:
+        if file_extension == '.csv':
+            # CSV 파일명에서 테이블 타입 추출
+            table_type = find_table_type(file_path)
         
-        if table_type is None:
-            raise ValueError("❌ 파일명에서 테이블 타입을 찾을 수 없습니다.")
+            if table_type is None:
+                raise ValueError("❌ 파일명에서 테이블 타입을 찾을 수 없습니다.")
         
-        # CSV 파일 처리
-        df = pd.read_csv(file_path)
-        formatted_df = format_sheet(df, table_type)
+            # CSV 파일 처리 (.csv.gz는 pandas가 읽으면서 압축을 풉니다)
+            started = time.monotonic()
+            df = pd.read_csv(file_path)
+            if profiles is not None:
+                profiles[table_type] = TableProfile(table_type)
+            output_path = get_output_path(output_dir, base_name, csv_extension)
+            duplicates = new_duplicate_checker(duplicate_policy, output_path)
+            try:
+                formatted_df = format_sheet(df, table_type, url_rewriter,
+                                            profiles[table_type] if profiles is not None else None,
+                                            duplicates)
+            finally:
+                if duplicates is not None:
+                    duplicates.close()
         
-        # 결과 저장
-        base_name = os.path.splitext(os.path.basename(file_path))[0] + '_formatted'
-        output_path = os.path.join(output_dir, base_name + file_extension)
+            if references is not None:
+                references.add(table_type, formatted_df)
+            if index is not None:
+                index.add(table_type, formatted_df, TABLE_CONFIGS[table_type]['uuid_columns'],
+                          os.path.basename(file_path))
         
-        # 파일이 이미 존재하면 번호를 붙입니다
-        counter = 1
-        while os.path.exists(output_path):
-            output_path = os.path.join(output_dir, f"{base_name}_{counter}{file_extension}")
-            counter += 1
+            # 결과 저장
+            with open_text_output(output_path, compression) as output_file:
+                formatted_df.to_csv(output_file, index=False)
+            log.info(f"✅ {table_type} 테이블 처리 완료", item=file_path, table=table_type,
+                     rows=len(formatted_df), duration=time.monotonic() - started)
+            report_duplicates(duplicates, table_type, log, summary)
+            summary['tables'].append(table_type)
+            summary['rows'] += len(formatted_df)
+        else:
+            # 결과를 저장할 경로 결정
+            if writer_backend == 'csv':
+                # 시트마다 CSV 하나씩 담을 폴더
+                output_path = get_output_path(output_dir, base_name, '')
+            elif writer_backend == 'pandas' and file_extension != '.zip':
+                output_path = get_output_path(output_dir, base_name, file_extension)
+            else:
+                # 스트리밍 저장은 xlsx 형식만 지원합니다
+                output_path = get_output_path(output_dir, base_name, '.xlsx')
         
-        formatted_df.to_csv(output_path, index=False)
-        print(f"✅ {table_type} 테이블 처리 완료")
-    else:
-        # Excel 파일은 모든 시트를 처리
-        excel_file = pd.ExcelFile(file_path)
-        sheet_names = excel_file.sheet_names
+            # zip 안의 CSV는 파일마다 시트 하나로 저장합니다 (시트 이름과 테이블 타입을 따로 기억)
+            table_types = {}
         
-        # 결과를 저장할 ExcelWriter 객체 생성
-        base_name = os.path.splitext(os.path.basename(file_path))[0] + '_formatted'
-        output_path = os.path.join(output_dir, base_name + file_extension)
-        
-        # 파일이 이미 존재하면 번호를 붙입니다
-        counter = 1
-        while os.path.exists(output_path):
-            output_path = os.path.join(output_dir, f"{base_name}_{counter}{file_extension}")
-            counter += 1
+            if file_extension == '.zip':
+                def read_member(member):
+                    # 압축을 풀면서 chunk_size 행씩 읽습니다 (keep_last 중복 처리는 한 번에 읽음)
+                    with open_zip_member(file_path, member) as handle:
+                        if duplicate_policy == DUPLICATE_KEEP_LAST:
+                            yield pd.read_csv(handle)
+                        else:
+                            yield from pd.read_csv(handle, chunksize=chunk_size)
+            
+                def read_zip():
+                    # 엑셀 시트 이름은 31자까지만 쓸 수 있어서 잘린 이름이 겹치면 번호를 붙입니다
+                    for member, sheet_name in zip_sheet_names(list_zip_members(file_path)):
+                        table_type = find_table_type(member)
+                        if table_type is None:
+                            yield sheet_name, None
+                            continue
+                        table_types[sheet_name] = table_type
+                        yield sheet_name, read_member(member)
+            
+                sheets = read_zip()
+            # openpyxl read_only 모드는 .xls 파일을 읽지 못합니다
+            elif reader_backend == 'openpyxl' and file_extension != '.xls':
+                sheets = iter_workbook_chunks(
+                    file_path,
+                    sheet_filter=lambda name: name.lower() in TABLE_CONFIGS,
+                    chunk_size=chunk_size
+                )
+            else:
+                # Excel 파일은 모든 시트를 한 번에 처리
+                excel_file = pd.ExcelFile(file_path)
+            
+                def read_whole_sheet(sheet_name):
+                    yield excel_file.parse(sheet_name)
+            
+                # 테이블 타입이 아닌 시트(메모 등)는 실패로 세지 않고 건너뜁니다
+                sheets = (
+                    (sheet_name,
+                     read_whole_sheet(sheet_name) if sheet_name.lower() in TABLE_CONFIGS else None)
+                    for sheet_name in excel_file.sheet_names
+                )
         
-        with pd.ExcelWriter(output_path) as writer:
-            for sheet_name in sheet_names:
-                try:
-                    # 시트 이름을 테이블 타입으로 사용
-                    table_type = sheet_name.lower()
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
-                    formatted_df = format_sheet(df, table_type)
-                    formatted_df.to_excel(writer, sheet_name=sheet_name, index=False)
-                    print(f"✅ {sheet_name} 시트 처리 완료")
-                except Exception as e:
-                    print(f"❌ {sheet_name} 시트 처리 실패: {str(e)}")
+            with SheetWriter(output_path, writer_backend, compression) as writer:
+                for sheet_name, chunks in sheets:
+                    if chunks is None:
+                        log.warning(f"⚠️ {sheet_name} 시트는 테이블 타입이 아니어서 건너뜁니다",
+                                    item=sheet_name)
+                        continue
+                    started = time.monotonic()
+                    rows = 0
+                    duplicates = None
+                    try:
+                        # 시트 이름을 테이블 타입으로 사용 (zip 안의 CSV는 파일 이름에서 찾은 테이블 타입)
+                        table_type = table_types.get(sheet_name, sheet_name.lower())
+                        sheet_profile = None
+                        if profiles is not None:
+                            sheet_profile = profiles[sheet_name] = TableProfile(table_type)
+                        duplicates = new_duplicate_checker(duplicate_policy, output_path, sheet_name)
+                        # 다음 조각을 읽는 동안 현재 조각을 포맷팅합니다
+                        for df in prefetch(chunks):
+                            formatted_df = format_sheet(df, table_type, url_rewriter, sheet_profile,
+                                                        duplicates)
+                            writer.write_chunk(sheet_name, formatted_df)
+                            if references is not None:
+                                references.add(table_type, formatted_df)
+                            if index is not None:
+                                index.add(table_type, formatted_df,
+                                          TABLE_CONFIGS[table_type]['uuid_columns'],
+                                          os.path.basename(file_path))
+                            rows += len(formatted_df)
+                        log.info(f"✅ {sheet_name} 시트 처리 완료", item=sheet_name, rows=rows,
+                                 duration=time.monotonic() - started)
+                        summary['tables'].append(table_type)
+                        summary['rows'] += rows
+                        report_duplicates(duplicates, sheet_name, log, summary)
+                    except Exception as e:
+                        failed_sheets.append(sheet_name)
+                        log.error(f"❌ {sheet_name} 시트 처리 실패: {str(e)}", item=sheet_name,
+                                  rows=rows, duration=time.monotonic() - started, error=str(e))
+                    finally:
+                        if duplicates is not None:
+                            duplicates.close()
+    finally:
+        if index is not None:
+            index.close()
+    
+    if profiles:
+        json_path, html_path = write_profile(profiles, strip_extension(output_path) + '_profile')
+        summary['profile'] = json_path
+        log.info(f"📝 컬럼 통계 저장: {html_path}", item=file_path)
+    
+    # 시트가 실패한 결과는 다음에 다시 시도하도록 캐시에 넣지 않고,
+    # unique id 중복이 있던 결과도 중복 행 파일과 경고를 다시 만들도록 캐시에 넣지 않습니다
+    if cache_key is not None and not failed_sheets and not summary['duplicates']:
+        cache.put(cache_key, output_path, dict(summary))
     
     return output_path
 
@@ -1,20 +1,260 @@
 # 필요한 도구들을 가져옵니다
 import sys
 import os
+import time
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QLabel, QVBoxLayout, 
                            QWidget, QPushButton, QFileDialog, QMessageBox,
-                           QHBoxLayout, QTextEdit, QSplitter, QFrame)
-from PyQt5.QtCore import Qt, QMimeData
-from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QIcon
+                           QHBoxLayout, QTextEdit, QSplitter, QFrame,
+                           QTableView, QLineEdit, QComboBox, QHeaderView, QTabWidget, QCheckBox)
+from PyQt5.QtCore import Qt, QMimeData, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QIcon, QColor
 import pandas as pd
 from data_formatter import format_data
-from datetime import datetime
+from event_log import EventLog
+from result_cache import ResultCache
+from job_store import JobStore, JOB_COLUMNS, STATUS_SUCCESS, STATUS_ERROR
+from formatter_preview import PreviewSource, list_preview_sheets, PREVIEW_SAMPLE_SIZE
+from batch_validate import validate_batch, format_plan
+from part_merge import group_parts, merge_parts
+from duplicate_check import DUPLICATE_SIDE_FILE
+from reference_check import (ReferenceCollector, write_reference_report, format_reference_results,
+                             REFERENCE_REPORT_NAME)
+
+# 변환 이력을 한 번에 읽어올 행 수 (스크롤이 끝에 닿으면 다음 구간을 읽음)
+HISTORY_PAGE_SIZE = 200
+
+# 변환 이력 열 제목 (JOB_COLUMNS 순서)
+HISTORY_HEADERS = ('시각', '파일', '테이블', '행 수', '시간(초)', '상태', '오류', '출력 파일')
+
+class JobHistoryModel(QAbstractTableModel):
+    """
+    변환 이력을 표로 보여주는 모델
+
+    - 이력 전체를 읽지 않고 HISTORY_PAGE_SIZE개씩 스크롤할 때마다 이어서 읽습니다 (canFetchMore/fetchMore)
+    - 필터와 정렬은 JobStore(SQLite)에서 처리합니다
+    - 새 작업은 맨 위에 한 줄만 끼워 넣으므로 이력이 많아도 표 전체를 다시 그리지 않습니다
+    """
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.text = ''
+        self.status = None
+        self.sort_column = 'created_at'
+        self.descending = True
+        self._jobs = []
+        self._total = 0
+        self.reload()
+
+    def reload(self):
+        """현재 필터/정렬 조건으로 처음 구간부터 다시 읽습니다"""
+        self.beginResetModel()
+        self._total = self.store.count(self.text, self.status)
+        self._jobs = self.store.fetch(0, HISTORY_PAGE_SIZE, self.text, self.status,
+                                      self.sort_column, self.descending)
+        self.endResetModel()
+
+    def set_filter(self, text=None, status=None):
+        self.text = text or ''
+        self.status = status or None
+        self.reload()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._jobs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(JOB_COLUMNS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._jobs) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        jobs = self.store.fetch(len(self._jobs), HISTORY_PAGE_SIZE, self.text, self.status,
+                                self.sort_column, self.descending)
+        if not jobs:
+            # 다른 곳에서 이력이 지워진 경우 더 읽지 않습니다
+            self._total = len(self._jobs)
+            return
+        self.beginInsertRows(QModelIndex(), len(self._jobs), len(self._jobs) + len(jobs) - 1)
+        self._jobs.extend(jobs)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        job = self._jobs[index.row()]
+        column = JOB_COLUMNS[index.column()]
+        value = job[column]
+        if role == Qt.DisplayRole:
+            if column == 'status':
+                return '✅' if value == STATUS_SUCCESS else '❌'
+            if column == 'output_path':
+                return os.path.basename(value) if value else ''
+            return '' if value is None else str(value)
+        if role == Qt.ToolTipRole:
+            if column == 'file_name':
+                return job['file_path']
+            if column in ('error', 'output_path'):
+                return value
+        if role == Qt.ForegroundRole and job['status'] == STATUS_ERROR:
+            return QColor('#dc3545')
+        if role == Qt.TextAlignmentRole and column in ('rows', 'duration'):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HISTORY_HEADERS[section]
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column = JOB_COLUMNS[column]
+        self.descending = order == Qt.DescendingOrder
+        self.reload()
+
+    def _matches(self, job):
+        if self.status and job['status'] != self.status:
+            return False
+        if self.text:
+            text = self.text.lower()
+            return any(text in (job[key] or '').lower()
+                       for key in ('file_name', 'table_type', 'error'))
+        return True
+
+    def add_job(self, job):
+        """
+        새 작업을 표에 반영하는 함수
+        기본 정렬(최신순)이면 맨 위에 한 줄만 끼워 넣고, 다른 정렬이면 처음부터 다시 읽습니다
+        """
+        if not self._matches(job):
+            return
+        if self.sort_column != 'created_at' or not self.descending:
+            self.reload()
+            return
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._jobs.insert(0, job)
+        self._total += 1
+        self.endInsertRows()
+
+class PreviewModel(QAbstractTableModel):
+    """
+    원본과 포맷팅 결과를 나란히 보여주는 미리보기 모델
+
+    - 왼쪽에는 원본 열, 오른쪽에는 포맷팅된 열을 보여줍니다
+    - 처음부터 보기에서는 스크롤이 끝에 닿을 때마다 다음 페이지를 읽어서 포맷팅합니다 (canFetchMore/fetchMore)
+    - 무작위 표본 보기에서는 고른 행만 보여줍니다
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.source = None
+        self.error = None
+        self._original_columns = []
+        self._formatted_columns = []
+        self._row_numbers = []
+        self._rows = []
+
+    def _append(self, row_numbers, original, formatted):
+        if not self._original_columns:
+            self._original_columns = list(original.columns)
+            self._formatted_columns = list(formatted.columns)
+        # 페이지마다 열이 달라도 첫 페이지의 열 순서에 맞춥니다
+        original = original.reindex(columns=self._original_columns)
+        formatted = formatted.reindex(columns=self._formatted_columns)
+        rows = [left + right for left, right in zip(original.itertuples(index=False, name=None),
+                                                    formatted.itertuples(index=False, name=None))]
+        self._row_numbers.extend(row_numbers)
+        self._rows.extend(rows)
+
+    def _clear(self):
+        if self.source is not None:
+            self.source.close()
+        self.source = None
+        self.error = None
+        self._original_columns = []
+        self._formatted_columns = []
+        self._row_numbers = []
+        self._rows = []
+
+    def show_pages(self, source):
+        """처음부터 페이지 단위로 보여줍니다 (첫 페이지만 바로 읽음)"""
+        self.beginResetModel()
+        self._clear()
+        self.source = source
+        try:
+            page = source.next_page()
+            if page is not None:
+                self._append(*page)
+        except Exception as e:
+            self.error = str(e)
+            self.source = None
+        self.endResetModel()
+
+    def show_sample(self, source, size=PREVIEW_SAMPLE_SIZE):
+        """파일 전체에서 고른 무작위 표본만 보여줍니다"""
+        self.beginResetModel()
+        self._clear()
+        try:
+            self._append(*source.sample(size))
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            source.close()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._original_columns) + len(self._formatted_columns)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.source is not None and not self.source.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.source is None:
+            return
+        try:
+            page = self.source.next_page()
+        except Exception as e:
+            self.error = str(e)
+            self.source = None
+            return
+        if page is None or not page[0]:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page[0]) - 1)
+        self._append(*page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            value = self._rows[index.row()][index.column()]
+            return '' if value is None or (isinstance(value, float) and pd.isna(value)) else str(value)
+        if role == Qt.BackgroundRole and index.column() >= len(self._original_columns):
+            # 포맷팅된 열은 배경색으로 구분합니다
+            return QColor('#eef6ff')
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Vertical:
+            return str(self._row_numbers[section])
+        if section < len(self._original_columns):
+            return f"원본 · {self._original_columns[section]}"
+        return f"변환 · {self._formatted_columns[section - len(self._original_columns)]}"
 
 class DragDropWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.output_dir = None
-        self.conversion_history = []  # 변환 이력 저장
+        self.job_store = JobStore()  # 변환 이력 저장소 (다음 실행 때도 남음)
+        self.result_cache = ResultCache()  # 같은 파일을 다시 넣으면 이전 결과를 바로 돌려줌
         self.initUI()
         
     def initUI(self):
@@ -99,6 +339,29 @@ class DragDropWindow(QMainWindow):
         self.output_dir_button.clicked.connect(self.select_output_dir)
         button_layout.addWidget(self.output_dir_button)
         
+        # 검사만 하기 버튼 (헤더만 읽어서 변환 계획과 문제를 보여줌)
+        self.validate_button = QPushButton('검사만 하기')
+        self.validate_button.setStyleSheet("""
+            QPushButton {
+                background-color: #6c757d;
+                color: white;
+                border: none;
+                padding: 10px;
+                border-radius: 5px;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #5a6268;
+            }
+        """)
+        self.validate_button.clicked.connect(self.select_validate_files)
+        button_layout.addWidget(self.validate_button)
+        
+        # 파트로 나뉜 CSV(예: album_1.csv, album_2.csv)를 테이블마다 하나의 결과로 합쳐서 변환
+        # 파트 사이에 겹치는 unique id 행은 결과에서 빼고 '_duplicates.csv'에 따로 저장합니다
+        self.merge_parts_checkbox = QCheckBox('여러 파트를 하나로 합치기 (겹치는 행은 따로 저장)')
+        button_layout.addWidget(self.merge_parts_checkbox)
+        
         top_layout.addLayout(button_layout)
         
         # 출력 폴더 경로 표시 레이블
@@ -123,20 +386,77 @@ class DragDropWindow(QMainWindow):
         history_label.setStyleSheet("font-weight: bold; font-size: 14px;")
         bottom_layout.addWidget(history_label)
         
-        # 변환 이력 표시 영역
-        self.history_text = QTextEdit()
-        self.history_text.setReadOnly(True)
-        self.history_text.setStyleSheet("""
-            QTextEdit {
+        # 변환 이력 필터 (파일 이름/테이블/오류 검색 + 상태)
+        filter_layout = QHBoxLayout()
+        self.history_filter = QLineEdit()
+        self.history_filter.setPlaceholderText('파일 이름, 테이블, 오류 검색')
+        self.history_filter.textChanged.connect(self.filter_history)
+        filter_layout.addWidget(self.history_filter)
+        self.history_status = QComboBox()
+        self.history_status.addItem('전체', None)
+        self.history_status.addItem('성공', STATUS_SUCCESS)
+        self.history_status.addItem('실패', STATUS_ERROR)
+        self.history_status.currentIndexChanged.connect(self.filter_history)
+        filter_layout.addWidget(self.history_status)
+        bottom_layout.addLayout(filter_layout)
+        
+        # 변환 이력 표시 영역 (보이는 부분만 그리는 표)
+        self.history_model = JobHistoryModel(self.job_store, self)
+        self.history_view = QTableView()
+        self.history_view.setModel(self.history_model)
+        self.history_view.setSortingEnabled(True)
+        self.history_view.sortByColumn(JOB_COLUMNS.index('created_at'), Qt.DescendingOrder)
+        self.history_view.setSelectionBehavior(QTableView.SelectRows)
+        self.history_view.setEditTriggers(QTableView.NoEditTriggers)
+        self.history_view.verticalHeader().setVisible(False)
+        # 행 높이를 고정해서 행마다 크기를 계산하지 않게 합니다
+        self.history_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.history_view.horizontalHeader().setStretchLastSection(True)
+        self.history_view.setStyleSheet("""
+            QTableView {
                 background-color: #f8f9fa;
                 border: 1px solid #ddd;
                 border-radius: 5px;
-                padding: 5px;
             }
         """)
-        bottom_layout.addWidget(self.history_text)
+        bottom_layout.addWidget(self.history_view)
+        
+        # 미리보기 영역 (파일 일부만 포맷팅해서 원본과 나란히 보여줌)
+        preview_frame = QFrame()
+        preview_frame.setFrameStyle(QFrame.StyledPanel)
+        preview_layout = QVBoxLayout(preview_frame)
+        
+        preview_button_layout = QHBoxLayout()
+        self.preview_button = QPushButton('미리볼 파일 선택하기')
+        self.preview_button.clicked.connect(self.select_preview_file)
+        preview_button_layout.addWidget(self.preview_button)
+        self.preview_sheet = QComboBox()
+        self.preview_sheet.currentIndexChanged.connect(self.show_preview_pages)
+        preview_button_layout.addWidget(self.preview_sheet)
+        self.preview_pages_button = QPushButton('처음부터 보기')
+        self.preview_pages_button.clicked.connect(self.show_preview_pages)
+        preview_button_layout.addWidget(self.preview_pages_button)
+        self.preview_sample_button = QPushButton('무작위 표본 보기')
+        self.preview_sample_button.clicked.connect(self.show_preview_sample)
+        preview_button_layout.addWidget(self.preview_sample_button)
+        preview_layout.addLayout(preview_button_layout)
         
-        main_layout.addWidget(bottom_frame)
+        self.preview_status = QLabel('')
+        preview_layout.addWidget(self.preview_status)
+        
+        self.preview_model = PreviewModel(self)
+        self.preview_view = QTableView()
+        self.preview_view.setModel(self.preview_model)
+        self.preview_view.setEditTriggers(QTableView.NoEditTriggers)
+        self.preview_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        preview_layout.addWidget(self.preview_view)
+        self.preview_path = None
+        
+        # 변환 이력과 미리보기를 탭으로 나눕니다
+        tabs = QTabWidget()
+        tabs.addTab(bottom_frame, '변환 이력')
+        tabs.addTab(preview_frame, '미리보기')
+        main_layout.addWidget(tabs)
         
         # 드래그 앤 드롭 활성화
         self.setAcceptDrops(True)
@@ -186,11 +506,30 @@ class DragDropWindow(QMainWindow):
             self,
             "파일 선택",
             "",
-            "Excel Files (*.xlsx *.xls);;CSV Files (*.csv);;All Files (*.*)"
+            "Excel Files (*.xlsx *.xls);;CSV Files (*.csv *.csv.gz *.zip);;All Files (*.*)"
         )
         if file_paths:
             self.process_files(file_paths)
             
+    def select_validate_files(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            "검사할 파일 선택",
+            "",
+            "Excel Files (*.xlsx *.xls);;CSV Files (*.csv *.csv.gz *.zip);;All Files (*.*)"
+        )
+        if not file_paths:
+            return
+        plan, bad_files = validate_batch(file_paths)
+        if bad_files:
+            self.status_label.setText(f"❌ {len(bad_files)}개 파일에 문제가 있습니다")
+            self.status_label.setStyleSheet("color: #dc3545;")
+            QMessageBox.warning(self, "검사 결과", format_plan(plan))
+        else:
+            self.status_label.setText(f"✅ {len(file_paths)}개 파일 모두 변환할 수 있습니다")
+            self.status_label.setStyleSheet("color: #28a745;")
+            QMessageBox.information(self, "검사 결과", format_plan(plan))
+            
     def select_output_dir(self):
         dir_path = QFileDialog.getExistingDirectory(
             self,
@@ -202,45 +541,161 @@ class DragDropWindow(QMainWindow):
             self.output_dir = dir_path
             self.output_dir_label.setText(f'출력 폴더: {dir_path}')
             
-    def add_to_history(self, file_path, output_path, status, error=None):
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        history_entry = f"[{timestamp}] {os.path.basename(file_path)} → {os.path.basename(output_path)}"
-        if status == "success":
-            history_entry += " ✅"
-        else:
-            history_entry += f" ❌ ({error})"
-        self.conversion_history.append(history_entry)
-        self.history_text.setText("\n".join(self.conversion_history))
-        self.history_text.verticalScrollBar().setValue(
-            self.history_text.verticalScrollBar().maximum()
+    def select_preview_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "미리볼 파일 선택",
+            "",
+            "Excel Files (*.xlsx *.xls);;CSV Files (*.csv *.csv.gz *.zip);;All Files (*.*)"
         )
+        if not file_path:
+            return
+        try:
+            sheets = list_preview_sheets(file_path)
+        except Exception as e:
+            self.preview_status.setText(f"❌ 파일을 열 수 없습니다: {str(e)}")
+            return
+        if not sheets:
+            self.preview_status.setText("❌ 테이블 타입인 시트가 없습니다.")
+            return
+        self.preview_path = file_path
+        # 시트 목록을 바꾸는 동안에는 미리보기를 한 번만 읽습니다
+        self.preview_sheet.blockSignals(True)
+        self.preview_sheet.clear()
+        for sheet_name in sheets:
+            self.preview_sheet.addItem(sheet_name or os.path.basename(file_path), sheet_name)
+        self.preview_sheet.blockSignals(False)
+        self.show_preview_pages()
+        
+    def open_preview_source(self):
+        if self.preview_path is None:
+            return None
+        try:
+            return PreviewSource(self.preview_path, self.preview_sheet.currentData())
+        except Exception as e:
+            self.preview_status.setText(str(e))
+            self.preview_status.setStyleSheet("color: #dc3545;")
+            return None
+        
+    def show_preview_result(self, description):
+        if self.preview_model.error:
+            # 설정 오류(필수 컬럼 누락 등)를 전체 변환 전에 바로 보여줍니다
+            self.preview_status.setText(f"❌ 포맷팅 오류: {self.preview_model.error}")
+            self.preview_status.setStyleSheet("color: #dc3545;")
+        else:
+            self.preview_status.setText(f"🔍 {os.path.basename(self.preview_path)} {description}")
+            self.preview_status.setStyleSheet("color: #666;")
+        
+    def show_preview_pages(self, *args):
+        source = self.open_preview_source()
+        if source is None:
+            return
+        self.preview_model.show_pages(source)
+        self.show_preview_result("앞부분 (스크롤하면 더 읽습니다)")
+        
+    def show_preview_sample(self):
+        source = self.open_preview_source()
+        if source is None:
+            return
+        self.preview_status.setText("🔍 표본을 고르는 중...")
+        QApplication.processEvents()
+        self.preview_model.show_sample(source)
+        self.show_preview_result(f"무작위 표본 {self.preview_model.rowCount()}행")
+        
+    def filter_history(self, *args):
+        self.history_model.set_filter(self.history_filter.text().strip(),
+                                      self.history_status.currentData())
+            
+    def add_to_history(self, file_path, output_path, status, error=None,
+                       table_type=None, rows=None, duration=None):
+        job = self.job_store.add_job(file_path, status, output_path, table_type,
+                                     rows, duration, error)
+        self.history_model.add_job(job)
+        self.history_view.scrollToTop()
         
     def process_files(self, file_paths):
         try:
             processed_files = []
             failed_files = []
+            duplicate_files = []
             
-            for file_path in file_paths:
-                # 파일 확장자 확인
-                file_extension = os.path.splitext(file_path)[1].lower()
-                if file_extension not in ['.xlsx', '.xls', '.csv']:
-                    failed_files.append((file_path, "지원하지 않는 파일 형식입니다."))
-                    self.add_to_history(file_path, "", "error", "지원하지 않는 파일 형식입니다.")
-                    continue
-                
+            # 변환을 시작하기 전에 모든 파일의 헤더만 읽어서 검사합니다
+            # 문제가 있는 파일이 하나라도 있으면 아무것도 변환하지 않고 바로 알려줍니다
+            self.status_label.setText("🔍 파일 검사 중...")
+            self.status_label.setStyleSheet("color: #666;")
+            QApplication.processEvents()
+            plan, bad_files = validate_batch(file_paths)
+            if bad_files:
+                for item in plan:
+                    if item['problems']:
+                        self.add_to_history(item['file'], "", STATUS_ERROR, '; '.join(item['problems']),
+                                            table_type=item['table_type'])
+                self.status_label.setText(f"❌ {len(bad_files)}개 파일에 문제가 있어 변환하지 않았습니다")
+                self.status_label.setStyleSheet("color: #dc3545;")
+                QMessageBox.warning(self, "변환 전 검사 실패", format_plan(plan))
+                return
+            
+            # 이번 묶음에서 포맷팅한 테이블끼리 참조(외래 키)를 검사합니다
+            references = ReferenceCollector()
+            
+            # 합치기를 켜면 같은 테이블의 CSV 파트들을 한 작업으로 묶습니다
+            if self.merge_parts_checkbox.isChecked():
+                groups, others = group_parts(file_paths)
+                jobs = list(groups.values()) + [[file_path] for file_path in others]
+            else:
+                jobs = [[file_path] for file_path in file_paths]
+            
+            for parts in jobs:
+                file_path = parts[0]
+                started = time.monotonic()
                 try:
                     # 파일 처리
-                    self.status_label.setText(f"파일 처리 중... ({len(processed_files) + 1}/{len(file_paths)})")
+                    self.status_label.setText(f"파일 처리 중... ({len(processed_files) + 1}/{len(jobs)})")
                     self.status_label.setStyleSheet("color: #666;")
                     QApplication.processEvents()
                     
-                    output_path = format_data(file_path, self.output_dir)
+                    summary = {}
+                    # 시트별 결과는 이력 표에 남기므로 화면 출력은 하지 않습니다
+                    log = EventLog(console=None)
+                    if len(parts) > 1:
+                        output_path = merge_parts(parts, self.output_dir, log=log, summary=summary,
+                                                  references=references,
+                                                  duplicate_policy=DUPLICATE_SIDE_FILE)
+                    else:
+                        output_path = format_data(file_path, self.output_dir, log=log, summary=summary,
+                                                  references=references, cache=self.result_cache)
                     processed_files.append(output_path)
-                    self.add_to_history(file_path, output_path, "success")
+                    # 일부 시트만 실패한 경우 그 오류도 이력에 함께 남깁니다
+                    notes = [f"{record['item']}: {record['error']}" for record in log.errors]
+                    # unique id 중복은 변환이 끝나도 이력과 알림으로 꼭 보여줍니다
+                    if summary.get('duplicates'):
+                        notes.append(f"unique id 중복 {summary['duplicates']}건")
+                        duplicate_files.append((file_path, summary['duplicates'], len(parts) > 1))
+                    self.add_to_history(file_path, output_path, STATUS_SUCCESS, '; '.join(notes) or None,
+                                        table_type=', '.join(summary['tables']),
+                                        rows=summary['rows'],
+                                        duration=time.monotonic() - started)
                     
                 except Exception as e:
                     failed_files.append((file_path, str(e)))
-                    self.add_to_history(file_path, "", "error", str(e))
+                    self.add_to_history(file_path, "", STATUS_ERROR, str(e),
+                                        duration=time.monotonic() - started)
+            
+            # 끊어진 참조가 있으면 보고서를 저장하고 알려줍니다
+            reference_results = references.check()
+            if processed_files and any(result['dangling'] for result in reference_results):
+                report_path = os.path.join(os.path.dirname(processed_files[0]), REFERENCE_REPORT_NAME)
+                write_reference_report(reference_results, report_path)
+                QMessageBox.warning(self, "참조 검사",
+                                    f"{format_reference_results(reference_results)}\n\n보고서: {report_path}")
+            
+            # unique id 중복이 있으면 알려줍니다 (합치기에서만 행을 빼서 따로 저장, 나머지는 그대로 둠)
+            if duplicate_files:
+                duplicate_msg = "unique id가 겹치는 행이 있습니다:\n\n"
+                for file_path, count, removed in duplicate_files:
+                    action = "결과에서 빼고 _duplicates.csv에 저장" if removed else "결과에 그대로 남김"
+                    duplicate_msg += f"- {os.path.basename(file_path)}: {count}건 ({action})\n"
+                QMessageBox.warning(self, "unique id 중복", duplicate_msg)
             
             # 결과 메시지 생성
             if processed_files:
@@ -267,6 +722,11 @@ class DragDropWindow(QMainWindow):
             self.status_label.setStyleSheet("color: #dc3545;")
             QMessageBox.critical(self, "오류", str(e))
 
+    def closeEvent(self, event):
+        self.job_store.close()
+        self.result_cache.close()
+        super().closeEvent(event)
+
 def main():
     app = QApplication(sys.argv)
     window = DragDropWindow()
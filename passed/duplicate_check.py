@@ -0,0 +1,162 @@
+# 포맷팅하면서 unique_id 중복을 찾는 도구
+# 페이지를 나눠 내려받은 Bubble 데이터가 겹치면 같은 unique id 행이 두 번 들어오는데,
+# 그대로 넘기면 Postgres에 넣을 때 기본 키 오류가 나므로 포맷팅 단계에서 미리 잡습니다
+import csv
+import os
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+
+# 중복 처리 방식
+DUPLICATE_REPORT = 'report'  # 중복 수만 세고 행은 그대로 둠
+DUPLICATE_FAIL = 'fail'  # 중복이 있으면 오류를 내고 멈춤
+DUPLICATE_KEEP_FIRST = 'keep_first'  # 처음 나온 행만 남김
+DUPLICATE_KEEP_LAST = 'keep_last'  # 'modified date'가 가장 늦은 행만 남김 (시트 전체를 한 번에 읽어야 함)
+DUPLICATE_SIDE_FILE = 'side_file'  # 처음 나온 행만 남기고 나머지는 따로 CSV 파일에 저장
+DUPLICATE_POLICIES = (DUPLICATE_REPORT, DUPLICATE_FAIL, DUPLICATE_KEEP_FIRST, DUPLICATE_KEEP_LAST,
+                      DUPLICATE_SIDE_FILE)
+
+# 기본 중복 처리 방식 (결과는 바꾸지 않고 알려주기만 함, 행을 빼려면 다른 방식을 직접 골라야 함)
+DUPLICATE_POLICY = DUPLICATE_REPORT
+
+# 메모리(set)에 둘 최대 unique_id 수. 넘으면 임시 SQLite 파일로 옮깁니다 (약 100바이트/개)
+SEEN_MEMORY_LIMIT = 1000000
+
+# 중복을 따질 컬럼과 최신 행을 고를 때 쓰는 컬럼
+KEY_COLUMN = 'unique_id'
+MODIFIED_COLUMN = 'modified date'
+
+# 오류/기록에 보여줄 중복 unique id 예시 수
+SAMPLE_SIZE = 5
+
+class DuplicateChecker:
+    """
+    테이블 하나의 unique_id 중복을 찾는 클래스
+
+    - 이미 나온 unique_id는 set에 두고, memory_limit개를 넘으면 임시 SQLite 파일로 옮겨서 계속 찾습니다
+    - 조각으로 나눠 포맷팅해도 같은 객체에 계속 넘기면 앞 조각과의 중복도 찾습니다
+    """
+
+    def __init__(self, policy=DUPLICATE_POLICY, side_path=None,
+                 memory_limit=SEEN_MEMORY_LIMIT, key_column=KEY_COLUMN):
+        """
+        Args:
+            policy (str): 중복 처리 방식 (DUPLICATE_POLICIES 중 하나)
+            side_path (str, optional): 중복 행을 저장할 CSV 경로 (side_file 방식에서 필요)
+            memory_limit (int): 메모리에 둘 최대 unique_id 수
+            key_column (str): 중복을 따질 컬럼
+        """
+        if policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"❌ 지원하지 않는 중복 처리 방식입니다: {policy}")
+        if policy == DUPLICATE_SIDE_FILE and not side_path:
+            raise ValueError("❌ side_file 방식에는 중복 행을 저장할 경로가 필요합니다.")
+        self.policy = policy
+        self.side_path = side_path
+        self.memory_limit = memory_limit
+        self.key_column = key_column
+        self.duplicates = 0
+        self.samples = []
+        self._seen = set()
+        self._db = None
+        self._db_path = None
+        self._side_file = None
+        self._side_writer = None
+
+    def filter(self, df):
+        """
+        중복 행을 찾아서 처리 방식대로 처리하는 함수
+
+        Args:
+            df (pandas.DataFrame): unique_id 컬럼이 만들어진 데이터프레임
+
+        Returns:
+            pandas.DataFrame: 남길 행만 있는 데이터프레임
+        """
+        ids = df[self.key_column].astype(str)
+
+        if self.policy == DUPLICATE_KEEP_LAST and MODIFIED_COLUMN in df.columns:
+            # 같은 unique id 중 'modified date'가 가장 늦은 행을 남깁니다 (날짜가 같으면 뒤에 나온 행)
+            modified = pd.to_datetime(df[MODIFIED_COLUMN], errors='coerce', format='mixed')
+            order = modified.reset_index(drop=True).sort_values(kind='mergesort', na_position='first').index
+            in_batch = np.zeros(len(df), dtype=bool)
+            in_batch[order] = ids.iloc[order].duplicated(keep='last').to_numpy()
+        elif self.policy == DUPLICATE_KEEP_LAST:
+            in_batch = ids.duplicated(keep='last').to_numpy()
+        else:
+            in_batch = ids.duplicated(keep='first').to_numpy()
+
+        # 앞 조각에서 이미 나온 unique id도 중복입니다 (앞 조각은 이미 저장됐으므로 그쪽을 남김)
+        seen_before = self._check_and_add(ids[~in_batch])
+        duplicate = in_batch.copy()
+        duplicate[~in_batch] = seen_before
+
+        count = int(duplicate.sum())
+        if not count:
+            return df
+        self.duplicates += count
+        for value in ids[duplicate].head(SAMPLE_SIZE - len(self.samples)):
+            self.samples.append(value)
+
+        if self.policy == DUPLICATE_REPORT:
+            return df
+        if self.policy == DUPLICATE_FAIL:
+            raise ValueError(f"❌ unique id 중복 {count}건이 있습니다 (예: {', '.join(self.samples)})")
+        if self.policy == DUPLICATE_SIDE_FILE:
+            self._write_side(df[duplicate])
+        return df[~duplicate]
+
+    def _check_and_add(self, ids):
+        # 조각 안에서는 이미 중복이 빠진 unique id들이 들어옵니다
+        if self._db is None:
+            seen = self._seen
+            mask = np.fromiter((value in seen for value in ids), dtype=bool, count=len(ids))
+            seen.update(ids)
+            if len(seen) > self.memory_limit:
+                self._spill()
+            return mask
+
+        values = [(value,) for value in ids]
+        self._db.execute("DELETE FROM batch")
+        self._db.executemany("INSERT INTO batch (id) VALUES (?)", values)
+        found = {row[0] for row in self._db.execute("SELECT id FROM batch JOIN seen USING (id)")}
+        self._db.execute("INSERT OR IGNORE INTO seen (id) SELECT id FROM batch")
+        self._db.commit()
+        return np.fromiter((value in found for value in ids), dtype=bool, count=len(ids))
+
+    def _spill(self):
+        # 메모리의 unique id를 임시 SQLite 파일로 옮깁니다 (기본 키 색인으로 찾음)
+        handle, self._db_path = tempfile.mkstemp(suffix='.db', prefix='unique_ids_')
+        os.close(handle)
+        self._db = sqlite3.connect(self._db_path)
+        self._db.execute("PRAGMA journal_mode = OFF")
+        self._db.execute("PRAGMA synchronous = OFF")
+        self._db.execute("CREATE TABLE seen (id TEXT PRIMARY KEY) WITHOUT ROWID")
+        self._db.execute("CREATE TEMP TABLE batch (id TEXT)")
+        self._db.executemany("INSERT INTO seen (id) VALUES (?)", ((value,) for value in self._seen))
+        self._db.commit()
+        self._seen = set()
+
+    def _write_side(self, rows):
+        if self._side_writer is None:
+            self._side_file = open(self.side_path, 'w', encoding='utf-8', newline='')
+            self._side_writer = csv.writer(self._side_file)
+            self._side_writer.writerow(list(rows.columns))
+        self._side_writer.writerows(rows.itertuples(index=False, name=None))
+
+    def close(self):
+        """중복 행 파일과 임시 SQLite 파일을 정리합니다"""
+        if self._side_file is not None:
+            self._side_file.close()
+            self._side_file = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            os.remove(self._db_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
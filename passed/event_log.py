@@ -0,0 +1,184 @@
+# 작업 기록 도구 (JSON Lines 파일 + 간추린 화면 출력 + 오류 모음)
+import csv
+import json
+import sys
+import threading
+from datetime import datetime
+
+# passed 폴더의 스크립트는 'event_log'로, 저장소 루트의 스크립트는 'passed.event_log'로 import합니다.
+# 두 이름이 서로 다른 모듈(서로 다른 default_log)이 되지 않도록 처음 불러온 모듈을 두 이름에 모두 등록합니다
+for _name in ('event_log', 'passed.event_log'):
+    sys.modules.setdefault(_name, sys.modules[__name__])
+
+# 기록 단계
+DEBUG = 'debug'
+INFO = 'info'
+WARNING = 'warning'
+ERROR = 'error'
+LEVELS = (DEBUG, INFO, WARNING, ERROR)
+
+# 파일에 쓰기 전에 메모리에 모아둘 기록 수
+BUFFER_SIZE = 1000
+
+# 화면에 보여줄 비율 (info/warning 기록 N개마다 1개만 출력, 1이면 모두 출력)
+CONSOLE_SAMPLE_EVERY = 100
+
+# 화면에 그대로 보여줄 최대 오류 수 (넘으면 마지막 요약에서만 개수로 보여줌)
+MAX_CONSOLE_ERRORS = 20
+
+
+class EventLog:
+    """
+    항목별 작업 결과를 구조화된 기록(JSON Lines)으로 남기는 클래스
+
+    - 기록마다 시각, 단계(level), 메시지, 항목(item), 걸린 시간(duration), 오류(error)를 남깁니다
+    - 파일 쓰기는 buffer_size개씩 모아서 한 번에 합니다
+    - 화면에는 info/warning 기록을 sample_every개마다 하나만 보여주고,
+      오류는 max_console_errors개까지만 보여준 뒤 나머지는 마지막 요약에 개수로 보여줍니다
+    - 오류는 따로 모아서 작업이 끝난 뒤 보고서로 저장할 수 있습니다
+    - 여러 스레드에서 함께 써도 안전합니다
+    """
+
+    def __init__(self, path=None, console=print, sample_every=CONSOLE_SAMPLE_EVERY,
+                 buffer_size=BUFFER_SIZE, max_console_errors=MAX_CONSOLE_ERRORS):
+        """
+        Args:
+            path (str, optional): 기록 파일 경로 (없으면 파일에 쓰지 않음)
+            console (callable, optional): 화면 출력 함수 (None이면 화면에 출력하지 않음)
+            sample_every (int): info/warning 기록 N개마다 1개만 화면에 출력
+            buffer_size (int): 파일에 쓰기 전에 모아둘 기록 수
+            max_console_errors (int): 화면에 그대로 보여줄 최대 오류 수
+        """
+        self.path = path
+        self.console = console
+        self.sample_every = max(1, int(sample_every))
+        self.buffer_size = max(1, int(buffer_size))
+        self.max_console_errors = max_console_errors
+        self.counts = {level: 0 for level in LEVELS}
+        self.errors = []
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8') if path else None
+
+    def event(self, level, message, item=None, duration=None, error=None, **fields):
+        """
+        기록 하나를 남기는 함수
+
+        Args:
+            level (str): 기록 단계 (debug/info/warning/error)
+            message (str): 화면에 보여줄 메시지
+            item (str, optional): 대상 항목 (URL, 파일, 시트 이름 등)
+            duration (float, optional): 걸린 시간(초)
+            error (str, optional): 오류 내용
+            **fields: 함께 남길 값 (status, size, column 등)
+        """
+        record = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'level': level,
+            'message': message,
+            'item': item,
+            'duration': round(duration, 6) if duration is not None else None,
+            'error': error,
+        }
+        record.update(fields)
+
+        with self._lock:
+            self.counts[level] = self.counts.get(level, 0) + 1
+            count = self.counts[level]
+            if level == ERROR:
+                self.errors.append(record)
+            if self._file is not None:
+                self._buffer.append(json.dumps(record, ensure_ascii=False, default=str))
+                if len(self._buffer) >= self.buffer_size:
+                    self._flush_locked()
+
+        if self.console is None or level == DEBUG:
+            return
+        if level == ERROR:
+            show = self.max_console_errors is None or count <= self.max_console_errors
+        else:
+            show = (count - 1) % self.sample_every == 0
+        if show:
+            self.console(message)
+
+    def debug(self, message, **kwargs):
+        self.event(DEBUG, message, **kwargs)
+
+    def info(self, message, **kwargs):
+        self.event(INFO, message, **kwargs)
+
+    def warning(self, message, **kwargs):
+        self.event(WARNING, message, **kwargs)
+
+    def error(self, message, **kwargs):
+        self.event(ERROR, message, **kwargs)
+
+    def _flush_locked(self):
+        if self._buffer:
+            self._file.write('\n'.join(self._buffer) + '\n')
+            self._buffer.clear()
+
+    def flush(self):
+        """모아둔 기록을 파일에 씁니다"""
+        with self._lock:
+            if self._file is not None:
+                self._flush_locked()
+                self._file.flush()
+
+    def close(self):
+        """남은 기록을 쓰고 파일을 닫습니다"""
+        with self._lock:
+            if self._file is not None:
+                self._flush_locked()
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def write_error_report(self, report_path):
+        """
+        모은 오류를 CSV 보고서로 저장하는 함수
+
+        Args:
+            report_path (str): 보고서 파일 경로
+
+        Returns:
+            int: 오류 수
+        """
+        with self._lock:
+            errors = list(self.errors)
+        fieldnames = ['time', 'item', 'message', 'error', 'duration']
+        for record in errors:
+            for key in record:
+                if key not in fieldnames and key != 'level':
+                    fieldnames.append(key)
+        with open(report_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(errors)
+        return len(errors)
+
+    def print_summary(self):
+        """단계별 기록 수와 화면에 못 보여준 기록 수를 출력합니다"""
+        if self.console is None:
+            return
+        hidden_errors = 0
+        if self.max_console_errors is not None:
+            hidden_errors = max(0, self.counts[ERROR] - self.max_console_errors)
+        self.console(f"📝 기록: 정보 {self.counts[INFO]}건, 경고 {self.counts[WARNING]}건, "
+                     f"오류 {self.counts[ERROR]}건")
+        if self.sample_every > 1:
+            self.console(f"📝 정보/경고는 {self.sample_every}건마다 1건만 화면에 표시했습니다")
+        if hidden_errors:
+            self.console(f"📝 화면에 표시하지 않은 오류 {hidden_errors}건은 오류 보고서를 확인하세요")
+        if self.path:
+            self.console(f"📝 기록 파일: {self.path}")
+
+
+# 따로 설정하지 않은 경우에 쓰는 기록 도구 (예전처럼 모두 화면에 출력)
+default_log = EventLog(sample_every=1, max_console_errors=None)
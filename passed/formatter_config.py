@@ -31,6 +31,7 @@ DEFAULT_VALUE_MAPPING = {
 }
 
 # 테이블 타입별 설정
+# - 'foreign_keys': {변환된 컬럼: 그 컬럼이 가리키는 테이블 타입} (참조 검사에 사용, 없으면 검사하지 않음)
 TABLE_CONFIGS = {
     'user': {
         'required_columns': ['unique id'],
@@ -56,6 +57,9 @@ TABLE_CONFIGS = {
         },
         'default_values': {
             'label': DEFAULT_VALUE_MAPPING['label']
+        },
+        'foreign_keys': {
+            'label_formatted': 'label'
         }
     },
     'album': {
@@ -66,6 +70,9 @@ TABLE_CONFIGS = {
         },
         'default_values': {
             'label': DEFAULT_VALUE_MAPPING['label']
+        },
+        'foreign_keys': {
+            'label_formatted': 'label'
         }
     },
     'track': {
@@ -76,6 +83,9 @@ TABLE_CONFIGS = {
         },
         'default_values': {
             'ownershipshared': DEFAULT_VALUE_MAPPING['ownershipshared']
+        },
+        'foreign_keys': {
+            'ownership_shared': 'ownership'
         }
     },
     'ownership': {
@@ -88,6 +98,9 @@ TABLE_CONFIGS = {
         'default_values': {
             'ownershiplabel': DEFAULT_VALUE_MAPPING['ownershiplabel'],
             # 'ownershipuser': DEFAULT_VALUE_MAPPING['ownershipuser'],
+        },
+        'foreign_keys': {
+            'ownership_label': 'label'
         }
     },
     'settlement_melon': {
@@ -174,6 +187,9 @@ TABLE_CONFIGS = {
         },
         'default_values': {
             'contract': DEFAULT_VALUE_MAPPING['contract'],
+        },
+        'foreign_keys': {
+            'contract_formatted': 'shorts_contracts'
         }
     },
     'shorts_contracts': {
@@ -218,45 +234,87 @@ TABLE_CONFIGS = {
     # },
 }
 
-# BUCKET_CONFIGS = {
-#     'album': {
-#         'cover': {
-#             'name': 'image', 
-#             'path': 'album',
-#             'filename_pattern': lambda row: f"{row.get('codealbum', '')}_IMG.jpg"
-#         }
-#     },
-#     'label': {
-#         'logo': {'name': 'image', 'path': 'label'},
-#     },
-#     'musician': {
-#         'imageprofile': {'name': 'image', 'path': 'musician'},
-#         'imageverification': {'name': 'image', 'path': 'musician'},
-#     },
-#     'shorts_channels': {
-#         'thumbnails': {'name': 'image', 'path': 'shorts-channel'},
-#     },
-#     'shorts_contracts': {
-#         'contractfile': {'name': 'contract', 'path': 'contract'},
-#     },
-#     'shorts_licensed_video': {
-#         'thumbnails': {'name': 'image', 'path': 'shorts-video'},
-#     },
-#     'track': {
-#         'mp3 (ar)': {
-#             'name': 'track', 
-#             'path': 'mp3',
-#             'filename_pattern': lambda row: f"{row.get('trackcode', '')}-{row.get('tracknumber', '')}.mp3"
-#         },
-#         'wav (ar)': {
-#             'name': 'track', 
-#             'path': 'wav',
-#             'filename_pattern': lambda row: f"{row.get('trackcode', '')}-{row.get('tracknumber', '')}.wav"
-#         },
-#     },
-#     'user': {
-#         'imgprofile': {'name': 'profile-image', 'path': 'profile-image'},
-#         'businessbankaccountfile': {'name': 'business', 'path': 'business'},
-#         'businessreg-document': {'name': 'business', 'path': 'business'},
-#     }
-# }
\ No newline at end of file
+# 테이블/컬럼별 파일 저장 위치 설정
+BUCKET_CONFIGS = {
+    'album': {
+        'cover': {
+            'name': 'image', 
+            'path': 'album',
+            'filename_pattern': lambda row: f"{row.get('codealbum', '')}_IMG.jpg"
+        }
+    },
+    'label': {
+        'logo': {'name': 'image', 'path': 'label'},
+    },
+    'musician': {
+        'imageprofile': {'name': 'image', 'path': 'musician'},
+        'imageverification': {'name': 'image', 'path': 'musician'},
+    },
+    'shorts_channels': {
+        'thumbnails': {'name': 'image', 'path': 'shorts-channel'},
+    },
+    'shorts_contracts': {
+        'contractfile': {'name': 'contract', 'path': 'contract'},
+    },
+    'shorts_licensed_video': {
+        'thumbnails': {'name': 'image', 'path': 'shorts-video'},
+    },
+    'track': {
+        'mp3 (ar)': {
+            'name': 'track', 
+            'path': 'mp3',
+            'filename_pattern': lambda row: f"{row.get('trackcode', '')}-{row.get('tracknumber', '')}.mp3"
+        },
+        'wav (ar)': {
+            'name': 'track', 
+            'path': 'wav',
+            'filename_pattern': lambda row: f"{row.get('trackcode', '')}-{row.get('tracknumber', '')}.wav"
+        },
+    },
+    'user': {
+        'imgprofile': {'name': 'profile-image', 'path': 'profile-image'},
+        'businessbankaccountfile': {'name': 'business', 'path': 'business'},
+        'businessreg-document': {'name': 'business', 'path': 'business'},
+    }
+}
+
+# 날짜 컬럼 매핑 (원본 컬럼 이름 -> 변환된 컬럼 이름)
+DATE_COLUMNS = {
+    'creation date': 'created_date',
+    'modified date': 'modified_date',
+    'dateofbirth': 'date_of_birth',
+    'joinedat': 'joined_at',
+    'createdat': 'created_at',
+    # 'leftat': 'left_at', 안쓰는 컬럼
+    'cidexpiredat': 'cid_expired_at',
+    'cidpublishedat': 'cid_published_at',
+    'publishedat': 'published_at',
+    'registeredat': 'registered_at',
+    '발매일' : 'release_date',
+    'profit date' : 'profit_date',
+    'profitdate' : 'profit_date',
+    'payoutdate' : 'payout_date',
+    'requestdate' : 'request_date',
+    'contractdate' : 'contract_date',
+    'testperiod' : 'test_period',
+    'dateupload' : 'date_upload',
+    'dateuploadplpl' : 'date_upload_plpl',
+}
+
+# 파일 형식별 업로드 경로 매핑
+FILE_TYPE_MAPPING = {
+    # 이미지 파일
+    '.png': 'image',
+    '.jpg': 'image',
+    '.jfif': 'image',
+
+    # 오디오 파일
+    '.mp3': 'track/mp3',
+    '.wav': 'track/wav',
+
+    # 문서 파일
+    '.pdf': 'business',
+}
+
+# 기본 업로드 경로 (매핑되지 않은 파일 형식용)
+DEFAULT_UPLOAD_PATH = 'other'
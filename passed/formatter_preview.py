@@ -0,0 +1,162 @@
+# 포맷팅 결과 미리보기 도구
+# 파일 전체를 변환하지 않고 앞부분 몇 페이지나 무작위 표본만 읽어서 format_sheet 결과를 확인합니다
+import numpy as np
+import pandas as pd
+from formatter_config import TABLE_CONFIGS
+from data_formatter import format_sheet, find_table_type
+from sheet_reader import iter_sheet_chunks
+from compressed_io import split_extension, list_zip_members, open_zip_member
+
+# 한 번에 읽어서 보여줄 행 수 (스크롤이 끝에 닿으면 다음 페이지를 읽음)
+PREVIEW_PAGE_SIZE = 100
+
+# 무작위 표본 행 수
+PREVIEW_SAMPLE_SIZE = 100
+
+def list_preview_sheets(file_path):
+    """
+    미리보기할 수 있는 시트 목록을 구하는 함수
+
+    Args:
+        file_path (str): CSV(.csv.gz), zip 또는 엑셀 파일 경로
+
+    Returns:
+        list: 테이블 타입인 시트 이름 목록 (CSV 파일이면 [None], zip 파일이면 안의 CSV 이름 목록)
+    """
+    file_extension, _ = split_extension(file_path)
+    if file_extension == '.csv':
+        return [None]
+    if file_extension == '.zip':
+        return [member for member in list_zip_members(file_path) if find_table_type(member)]
+    sheet_names = pd.ExcelFile(file_path).sheet_names
+    return [name for name in sheet_names if name.lower() in TABLE_CONFIGS]
+
+def format_preview(df, table_type, url_rewriter=None):
+    """
+    원본과 포맷팅 결과를 함께 돌려주는 함수 (format_sheet가 원본을 바꾸므로 복사본을 씀)
+
+    Args:
+        df (pandas.DataFrame): 원본 데이터
+        table_type (str): 테이블 타입
+        url_rewriter (UrlRewriter, optional): 파일 URL 변환기
+
+    Returns:
+        tuple: (원본 데이터프레임, 포맷팅된 데이터프레임)
+    """
+    return df, format_sheet(df.copy(), table_type, url_rewriter)
+
+class PreviewSource:
+    """
+    파일 하나(엑셀이면 시트 하나)를 페이지 단위로 읽어서 포맷팅해주는 클래스
+
+    - next_page()는 다음 page_size행만 읽습니다 (CSV는 chunksize, .xlsx는 openpyxl read_only)
+    - sample()은 파일을 한 번 훑으면서 무작위 표본을 고릅니다 (포맷팅과 저장은 표본에만 함)
+    """
+
+    def __init__(self, file_path, sheet_name=None, page_size=PREVIEW_PAGE_SIZE, url_rewriter=None):
+        """
+        Args:
+            file_path (str): CSV(.csv.gz), zip 또는 엑셀 파일 경로
+            sheet_name (str, optional): 엑셀 시트 이름 또는 zip 안의 CSV 이름 (CSV 파일이면 None)
+            page_size (int): 한 페이지의 행 수
+            url_rewriter (UrlRewriter, optional): 파일 URL 변환기
+        """
+        self.file_path = file_path
+        self.sheet_name = sheet_name
+        self.page_size = page_size
+        self.url_rewriter = url_rewriter
+        self.file_extension, _ = split_extension(file_path)
+
+        if self.file_extension in ('.csv', '.zip'):
+            # zip 파일은 안의 CSV 이름에서 테이블 타입을 찾습니다
+            if self.file_extension == '.zip' and sheet_name is None:
+                raise ValueError("❌ 미리보기할 파일을 골라주세요.")
+            self.table_type = find_table_type(sheet_name or file_path)
+            if self.table_type is None:
+                raise ValueError("❌ 파일명에서 테이블 타입을 찾을 수 없습니다.")
+        else:
+            if sheet_name is None:
+                raise ValueError("❌ 미리보기할 시트를 골라주세요.")
+            self.table_type = sheet_name.lower()
+            if self.table_type not in TABLE_CONFIGS:
+                raise ValueError(f"❌ 지원하지 않는 테이블 타입입니다: {self.table_type}")
+
+        self.rows_read = 0
+        self.exhausted = False
+        self._pages = self._iter_pages(page_size)
+
+    def _iter_pages(self, page_size):
+        if self.file_extension == '.csv':
+            with pd.read_csv(self.file_path, chunksize=page_size) as reader:
+                yield from reader
+        elif self.file_extension == '.zip':
+            with open_zip_member(self.file_path, self.sheet_name) as handle:
+                yield from pd.read_csv(handle, chunksize=page_size)
+        elif self.file_extension == '.xls':
+            # openpyxl read_only 모드는 .xls 파일을 읽지 못하므로 시트를 한 번 읽고 나눕니다
+            df = pd.read_excel(self.file_path, sheet_name=self.sheet_name)
+            for start in range(0, len(df), page_size):
+                yield df.iloc[start:start + page_size].reset_index(drop=True)
+        else:
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+            try:
+                yield from iter_sheet_chunks(workbook[self.sheet_name], page_size)
+            finally:
+                workbook.close()
+
+    def next_page(self):
+        """
+        다음 페이지를 읽어서 포맷팅하는 함수
+
+        Returns:
+            tuple: (행 번호 목록, 원본 데이터프레임, 포맷팅된 데이터프레임). 더 읽을 행이 없으면 None
+        """
+        if self.exhausted:
+            return None
+        df = next(self._pages, None)
+        if df is None:
+            self.exhausted = True
+            return None
+        row_numbers = list(range(self.rows_read + 1, self.rows_read + len(df) + 1))
+        self.rows_read += len(df)
+        if len(df) < self.page_size:
+            self.exhausted = True
+        return (row_numbers,) + format_preview(df, self.table_type, self.url_rewriter)
+
+    def sample(self, size=PREVIEW_SAMPLE_SIZE, seed=None):
+        """
+        파일 전체에서 무작위로 size행을 골라 포맷팅하는 함수
+        행마다 난수를 붙이고 가장 작은 size개만 남기므로 메모리에는 표본과 페이지 하나만 둡니다
+
+        Args:
+            size (int): 표본 행 수
+            seed (int, optional): 난수 시드 (같은 값이면 같은 표본)
+
+        Returns:
+            tuple: (행 번호 목록, 원본 데이터프레임, 포맷팅된 데이터프레임)
+        """
+        rng = np.random.default_rng(seed)
+        kept = None
+        kept_keys = np.empty(0)
+        rows_seen = 0
+        # 표본을 고를 때는 큰 조각으로 읽어서 훑는 횟수를 줄입니다
+        for df in self._iter_pages(max(self.page_size, 10000)):
+            df.index = pd.RangeIndex(rows_seen + 1, rows_seen + len(df) + 1)
+            rows_seen += len(df)
+            keys = np.concatenate([kept_keys, rng.random(len(df))])
+            candidates = df if kept is None else pd.concat([kept, df])
+            order = np.argsort(keys)[:size]
+            kept = candidates.iloc[order]
+            kept_keys = keys[order]
+
+        if kept is None:
+            return [], pd.DataFrame(), pd.DataFrame()
+        kept = kept.sort_index()
+        row_numbers = list(kept.index)
+        return (row_numbers,) + format_preview(kept.reset_index(drop=True), self.table_type,
+                                               self.url_rewriter)
+
+    def close(self):
+        self._pages.close()
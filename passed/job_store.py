@@ -0,0 +1,151 @@
+# 변환 작업 이력 저장소 (SQLite)
+# 프로그램을 껐다 켜도 이력이 남고, 이력이 수천 건이어도 필요한 부분만 읽습니다
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# 이력 파일 기본 위치 (사용자 홈 폴더)
+JOB_STORE_PATH = os.path.join(os.path.expanduser('~'), '.data_formatter_history.db')
+
+# 작업 상태
+STATUS_SUCCESS = 'success'
+STATUS_ERROR = 'error'
+
+# 화면에 보여줄 열 순서 (DB 열 이름)
+JOB_COLUMNS = ('created_at', 'file_name', 'table_type', 'rows', 'duration',
+               'status', 'error', 'output_path')
+
+class JobStore:
+    """
+    변환 작업 이력을 SQLite 파일에 저장하고 조회하는 클래스
+
+    - add_job()은 한 줄만 추가하므로 이력이 쌓여도 걸리는 시간이 같습니다
+    - count()/fetch()는 필터/정렬 조건에 맞는 일부 구간만 읽어서 화면이 필요한 만큼만 가져갑니다
+    """
+
+    def __init__(self, path=JOB_STORE_PATH):
+        """
+        Args:
+            path (str): 이력 파일 경로 (':memory:'이면 메모리에만 저장)
+        """
+        self.path = path
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                table_type TEXT,
+                rows INTEGER,
+                duration REAL,
+                status TEXT NOT NULL,
+                error TEXT,
+                output_path TEXT
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+        self._conn.commit()
+
+    def add_job(self, file_path, status, output_path=None, table_type=None,
+                rows=None, duration=None, error=None):
+        """
+        작업 하나를 이력에 추가하는 함수
+
+        Args:
+            file_path (str): 입력 파일 경로
+            status (str): 작업 상태 ('success' 또는 'error')
+            output_path (str, optional): 출력 파일 경로
+            table_type (str, optional): 테이블 타입 (여러 개면 쉼표로 구분)
+            rows (int, optional): 처리한 행 수
+            duration (float, optional): 걸린 시간(초)
+            error (str, optional): 오류 내용
+
+        Returns:
+            dict: 추가한 작업 (id 포함)
+        """
+        job = {
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'file_path': file_path,
+            'file_name': os.path.basename(file_path),
+            'table_type': table_type,
+            'rows': rows,
+            'duration': round(duration, 3) if duration is not None else None,
+            'status': status,
+            'error': error,
+            'output_path': output_path or None,
+        }
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (created_at, file_path, file_name, table_type, rows, duration, "
+                "status, error, output_path) VALUES (:created_at, :file_path, :file_name, "
+                ":table_type, :rows, :duration, :status, :error, :output_path)",
+                job
+            )
+            self._conn.commit()
+        job['id'] = cursor.lastrowid
+        return job
+
+    def _where(self, text=None, status=None):
+        clauses = []
+        params = []
+        if text:
+            pattern = f"%{text}%"
+            clauses.append("(file_name LIKE ? OR table_type LIKE ? OR error LIKE ?)")
+            params.extend([pattern, pattern, pattern])
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def count(self, text=None, status=None):
+        """
+        조건에 맞는 작업 수
+
+        Args:
+            text (str, optional): 파일 이름/테이블 타입/오류에 들어있는 글자
+            status (str, optional): 작업 상태
+
+        Returns:
+            int: 작업 수
+        """
+        where, params = self._where(text, status)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+
+    def fetch(self, offset=0, limit=200, text=None, status=None,
+              sort_column='created_at', descending=True):
+        """
+        조건에 맞는 작업 중 일부 구간을 읽는 함수
+
+        Args:
+            offset (int): 건너뛸 작업 수
+            limit (int): 읽을 작업 수
+            text (str, optional): 파일 이름/테이블 타입/오류에 들어있는 글자
+            status (str, optional): 작업 상태
+            sort_column (str): 정렬할 열 (JOB_COLUMNS 중 하나)
+            descending (bool): 내림차순 여부
+
+        Returns:
+            list: 작업 목록 (각 작업은 dict)
+        """
+        if sort_column not in JOB_COLUMNS:
+            raise ValueError(f"❌ 정렬할 수 없는 열입니다: {sort_column}")
+        where, params = self._where(text, status)
+        direction = 'DESC' if descending else 'ASC'
+        # 같은 값끼리는 추가한 순서로 정렬해서 구간을 나눠 읽어도 순서가 흔들리지 않게 합니다
+        query = (f"SELECT id, {', '.join(JOB_COLUMNS)}, file_path FROM jobs{where} "
+                 f"ORDER BY {sort_column} {direction}, id {direction} LIMIT ? OFFSET ?")
+        with self._lock:
+            cursor = self._conn.execute(query, params + [limit, offset])
+            names = [description[0] for description in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,327 +1,468 @@
-# import csv
-# import os
-# import uuid
-# import mimetypes
-# from datetime import datetime
-# import requests
-# from dotenv import load_dotenv
-# from supabase import create_client, Client
-# from typing import List, Dict, Any, Optional
-# from formatter_config import BUCKET_CONFIGS  # formatter_config 설정 임포트
-# from urllib.parse import unquote  # URL 디코딩을 위해 추가
-
-# load_dotenv()
-
-# # 🔧 Supabase 설정
-# # Supabase 프로젝트 URL과 API 키를 설정합니다
-# SUPABASE_URL = os.getenv('SUPABASE_URL')
-# SUPABASE_KEY = os.getenv('SUPABASE_KEY')
-# PUBLIC_BUCKET = ['image', 'track/mp3', 'track/wav', 'business', 'other']  # 버킷 이름 목록
-
-# # 파일 형식별 업로드 경로 매핑
-# FILE_TYPE_MAPPING = {
-#     # 이미지 파일
-#     '.png': 'image',
-#     '.jpg': 'image',
-#     '.jfif': 'image',
-    
-#     # 오디오 파일
-#     '.mp3': 'track/mp3',
-#     '.wav': 'track/wav',
-    
-#     # 문서 파일
-#     '.pdf': 'business',
-# }
-
-# # 기본 업로드 경로 (매핑되지 않은 파일 형식용)
-# DEFAULT_UPLOAD_PATH = 'other'
-
-# # 입출력 CSV 파일 설정
-# INPUT_CSV = 'bubble_files.csv'  # 원본 bubble.io URL이 있는 CSV 파일
-# OUTPUT_CSV = 'updated_bubble_files.csv'  # 변환된 URL이 저장될 CSV 파일
-
-# # Supabase 클라이언트 초기화
-# supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-# # 파일 카운터를 저장할 전역 딕셔너리
-# file_counters = {}
-
-# def get_next_file_number(table_name: str, column_name: str) -> int:
-#     """
-#     테이블과 컬럼에 대한 다음 파일 번호를 반환합니다.
-    
-#     Args:
-#         table_name (str): 테이블 이름
-#         column_name (str): 컬럼 이름
-        
-#     Returns:
-#         int: 다음 파일 번호
-#     """
-#     key = f"{table_name}_{column_name}"
-#     if key not in file_counters:
-#         file_counters[key] = 0
-#     file_counters[key] += 1
-#     return file_counters[key]
-
-# def get_file_name(original_name: str, bucket_config: Dict[str, Any], row: Dict[str, Any], 
-#                   table_name: str = None, column_name: str = None) -> str:
-#     """
-#     파일 이름을 생성합니다. filename_pattern이 있으면 사용하고, 
-#     없으면 테이블명_컬럼명_순번.확장자 형식으로 생성합니다.
-    
-#     Args:
-#         original_name (str): 원본 파일 이름
-#         bucket_config (Dict[str, Any]): 버킷 설정
-#         row (Dict[str, Any]): 현재 처리 중인 데이터 행
-#         table_name (str, optional): 테이블 이름
-#         column_name (str, optional): 컬럼 이름
-        
-#     Returns:
-#         str: 생성된 파일 이름
-#     """
-#     # filename_pattern이 있으면 사용
-#     if 'filename_pattern' in bucket_config:
-#         try:
-#             return bucket_config['filename_pattern'](row)
-#         except:
-#             pass
-    
-#     # filename_pattern이 없거나 실패한 경우
-#     # 원본 파일의 확장자 추출
-#     _, ext = os.path.splitext(original_name.lower())
-#     if not ext and '?' in original_name:  # URL에 쿼리 파라미터가 있는 경우
-#         ext = os.path.splitext(original_name.split('?')[0].lower())[1]
-    
-#     if not ext:  # 확장자가 없는 경우 MIME 타입으로 확장자 추정
-#         mime_type = mimetypes.guess_type(original_name)[0]
-#         if mime_type:
-#             ext = mimetypes.guess_extension(mime_type) or '.bin'
-#         else:
-#             ext = '.bin'
-    
-#     # 테이블명과 컬럼명이 제공된 경우 사용
-#     if table_name and column_name:
-#         file_number = get_next_file_number(table_name, column_name)
-#         return f"{table_name}_{column_name}_{file_number}{ext}"
-    
-#     # 테이블명과 컬럼명이 없는 경우 기본 형식 사용
-#     timestamp = int(datetime.now().timestamp() * 1000)
-#     unique_id = str(uuid.uuid4())
-#     return f"{timestamp}_{unique_id}{ext}"
-
-# async def upload_file_to_supabase(file_content: bytes, original_name: str, mime_type: str, 
-#                                 table_name: str, column_name: str, row: Dict[str, Any]) -> str:
-#     """
-#     파일을 Supabase 스토리지에 업로드하는 함수
-    
-#     Args:
-#         file_content (bytes): 업로드할 파일의 바이너리 내용
-#         original_name (str): 원본 파일 이름
-#         mime_type (str): 파일의 MIME 타입
-#         table_name (str): 테이블 이름
-#         column_name (str): 컬럼 이름
-#         row (Dict[str, Any]): 현재 처리 중인 데이터 행
-        
-#     Returns:
-#         str: Supabase에 업로드된 파일의 경로 (버킷 이름 포함)
-#     """
-#     bucket_config = get_bucket_config(table_name, column_name)
-#     if not bucket_config:
-#         raise Exception(f"버킷 설정을 찾을 수 없습니다: {table_name}.{column_name}")
-    
-#     bucket_name = bucket_config['name']
-#     storage_path = bucket_config['path']
-    
-#     try:
-#         # 첫 번째 시도: 원본 파일 이름으로 업로드
-#         file_name = original_name.split('/')[-1]
-#         upload_path = f"{storage_path}/{file_name}"
-        
-#         try:
-#             # 기존 파일이 있다면 삭제
-#             try:
-#                 supabase.storage.from_(bucket_name).remove([upload_path])
-#             except:
-#                 pass  # 파일이 없어도 무시
-            
-#             # 새로운 파일 업로드
-#             result = supabase.storage.from_(bucket_name).upload(
-#                 upload_path,
-#                 file_content,
-#                 {"content-type": mime_type}
-#             )
-#             return f"{bucket_name}/{upload_path}"  # 버킷 이름과 경로 조합
-#         except Exception as e:
-#             if '400' in str(e):  # 400 에러 발생 시 filename_pattern으로 재시도
-#                 file_name = get_file_name(original_name, bucket_config, row, table_name, column_name)
-#                 upload_path = f"{storage_path}/{file_name}"
-                
-#                 # 기존 파일이 있다면 삭제
-#                 try:
-#                     supabase.storage.from_(bucket_name).remove([upload_path])
-#                 except:
-#                     pass  # 파일이 없어도 무시
-                
-#                 # 새로운 파일 업로드
-#                 result = supabase.storage.from_(bucket_name).upload(
-#                     upload_path,
-#                     file_content,
-#                     {"content-type": mime_type}
-#                 )
-#                 return f"{bucket_name}/{upload_path}"  # 버킷 이름과 경로 조합
-#             raise e
-            
-#     except Exception as e:
-#         raise Exception(f"Upload failed: {str(e)}")
-
-# def get_public_url(path: str) -> str:
-#     """
-#     Supabase 스토리지의 파일에 대한 공개 URL을 생성하는 함수
-    
-#     Args:
-#         path (str): Supabase 스토리지 내 파일 경로 (버킷 이름 포함)
-        
-#     Returns:
-#         str: 파일의 공개 접근 URL
-#     """
-#     # 경로에서 버킷 이름과 파일 경로 분리
-#     parts = path.split('/', 1)
-#     bucket = parts[0]
-#     file_path = parts[1] if len(parts) > 1 else ''
-    
-#     return f"{SUPABASE_URL}/storage/v1/object/public/{bucket}/{file_path}"
-
-# def find_table_for_column(column_name: str) -> Optional[str]:
-#     """
-#     주어진 컬럼이 어느 테이블에 속하는지 찾습니다.
-    
-#     Args:
-#         column_name (str): 찾을 컬럼 이름
-        
-#     Returns:
-#         Optional[str]: 테이블 이름. 찾지 못한 경우 None
-#     """
-#     for table_name, config in BUCKET_CONFIGS.items():
-#         if column_name in config:
-#             return table_name
-#     return None
-
-# def is_file_url(value: str) -> bool:
-#     """
-#     주어진 값이 bubble.io 파일 URL인지 확인하는 함수
-    
-#     Args:
-#         value (str): 확인할 URL 문자열
-        
-#     Returns:
-#         bool: bubble.io URL이면 True, 아니면 False
-#     """
-#     return isinstance(value, str) and 'bubble.io' in value
-
-# def normalize_url(url: str) -> str:
-#     """
-#     URL을 정규화하는 함수
-#     - '//'로 시작하는 URL을 'https://'로 변환
-#     - URL 인코딩된 문자를 디코딩
-    
-#     Args:
-#         url (str): 정규화할 URL
-        
-#     Returns:
-#         str: 정규화된 URL
-#     """
-#     # URL 디코딩
-#     decoded_url = unquote(url)
-    
-#     # '//'로 시작하는 경우 'https:'를 추가
-#     if decoded_url.startswith('//'):
-#         return f'https:{decoded_url}'
-#     # 'http://' 또는 'https://'로 시작하지 않는 경우 'https://'를 추가
-#     elif not decoded_url.startswith(('http://', 'https://')):
-#         return f'https://{decoded_url}'
-#     return decoded_url
-
-# async def process_csv():
-#     """
-#     CSV 파일을 처리하는 메인 함수
-#     """
-#     if not os.path.exists(INPUT_CSV):
-#         raise Exception(f"입력 파일을 찾을 수 없습니다: {INPUT_CSV}")
-            
-#     # CSV 파일 읽기
-#     rows = []
-#     with open(INPUT_CSV, 'r', encoding='utf-8') as file:
-#         reader = csv.DictReader(file)
-#         rows = list(reader)
-            
-#     if not rows:
-#         print("❌ CSV 파일이 비어있습니다.")
-#         return
-            
-#     print(f"🔍 총 {len(rows)}건 처리 시작")
-    
-#     # 처리할 컬럼 찾기
-#     columns = rows[0].keys()
-#     file_columns = [
-#         col for col in columns 
-#         if any(is_file_url(row[col]) for row in rows)
-#     ]
-    
-#     if not file_columns:
-#         print("❌ bubble.io URL을 포함한 컬럼을 찾을 수 없습니다.")
-#         return
-    
-#     print(f"✅ 파일 URL 컬럼: {', '.join(file_columns)}")
-    
-#     # 각 행의 URL 처리
-#     for row in rows:
-#         for col in file_columns:
-#             raw_url = row[col]
-#             if not is_file_url(raw_url):
-#                 continue
-            
-#             # 테이블 찾기
-#             table_name = None
-#             for t_name, t_config in BUCKET_CONFIGS.items():
-#                 if col in t_config:
-#                     table_name = t_name
-#                     break
-            
-#             if not table_name:
-#                 print(f"⚠️ 컬럼 '{col}'에 대한 테이블을 찾을 수 없습니다.")
-#                 continue
-                
-#             file_url = normalize_url(raw_url)
-#             original_name = file_url.split('/')[-1]
-            
-#             try:
-#                 response = requests.get(file_url)
-#                 response.raise_for_status()
-                
-#                 mime_type = mimetypes.guess_type(original_name)[0] or 'application/octet-stream'
-#                 storage_path = await upload_file_to_supabase(
-#                     response.content,
-#                     original_name,
-#                     mime_type,
-#                     table_name,
-#                     col,
-#                     row
-#                 )
-#                 public_url = get_public_url(storage_path)
-#                 row[col] = public_url
-#                 print(f"📤 업로드 완료: {original_name}")
-                
-#             except Exception as e:
-#                 print(f"⚠️ 실패 ({file_url}): {str(e)}")
-                    
-#     # 변환된 데이터를 새로운 CSV 파일로 저장
-#     with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as file:
-#         writer = csv.DictWriter(file, fieldnames=columns)
-#         writer.writeheader()
-#         writer.writerows(rows)
-            
-#     print(f"🎉 완료! 업데이트된 CSV 저장됨 → {OUTPUT_CSV}")
-
-# if __name__ == "__main__":
-#     import asyncio
-#     asyncio.run(process_csv())
+import asyncio
+import csv
+import os
+import re
+import threading
+import uuid
+import mimetypes
+from datetime import datetime
+import aiohttp
+from dotenv import load_dotenv
+from typing import List, Dict, Any, Optional
+from formatter_config import BUCKET_CONFIGS  # formatter_config 설정 임포트
+from event_log import EventLog  # 파일별 결과 기록
+from urllib.parse import unquote, quote  # URL 디코딩/인코딩을 위해 추가
+
+load_dotenv()
+
+# 🔧 Supabase 설정
+# Supabase 프로젝트 URL과 API 키를 설정합니다
+SUPABASE_URL = os.getenv('SUPABASE_URL')
+SUPABASE_KEY = os.getenv('SUPABASE_KEY')
+PUBLIC_BUCKET = ['image', 'track/mp3', 'track/wav', 'business', 'other']  # 버킷 이름 목록
+
+# 입출력 CSV 파일 설정
+INPUT_CSV = 'bubble_files.csv'  # 원본 bubble.io URL이 있는 CSV 파일
+OUTPUT_CSV = 'updated_bubble_files.csv'  # 변환된 URL이 저장될 CSV 파일
+
+# 전송 파이프라인 설정
+DOWNLOAD_CONCURRENCY = 8  # 동시에 받을 파일 수
+UPLOAD_CONCURRENCY = 8  # 동시에 올릴 파일 수
+TRANSFER_QUEUE_SIZE = 16  # 다운로드는 시작했지만 업로드가 아직 시작되지 않은 파일의 최대 개수
+CHUNK_SIZE = 64 * 1024  # 한 번에 옮기는 바이트 수
+CHUNK_QUEUE_SIZE = 32  # 파일 하나당 메모리에 쌓아둘 최대 조각 수
+
+# Supabase 스토리지에서 허용하는 파일 경로 문자
+VALID_STORAGE_KEY = re.compile(r"^[A-Za-z0-9_/!\-.*'() &$@=;:+,?]+$")
+
+# 파일 카운터를 저장할 전역 딕셔너리
+file_counters = {}
+file_counters_lock = threading.Lock()
+
+def get_next_file_number(table_name: str, column_name: str) -> int:
+    """
+    테이블과 컬럼에 대한 다음 파일 번호를 반환합니다.
+    여러 작업이 동시에 불러도 번호가 겹치지 않습니다.
+
+    Args:
+        table_name (str): 테이블 이름
+        column_name (str): 컬럼 이름
+
+    Returns:
+        int: 다음 파일 번호
+    """
+    key = f"{table_name}_{column_name}"
+    with file_counters_lock:
+        file_counters[key] = file_counters.get(key, 0) + 1
+        return file_counters[key]
+
+def get_bucket_config(table_name: str, column_name: str) -> Optional[Dict[str, Any]]:
+    """
+    테이블과 컬럼에 대한 버킷 설정을 찾습니다.
+
+    Args:
+        table_name (str): 테이블 이름
+        column_name (str): 컬럼 이름
+
+    Returns:
+        Optional[Dict[str, Any]]: 버킷 설정. 찾지 못한 경우 None
+    """
+    return BUCKET_CONFIGS.get(table_name, {}).get(column_name)
+
+def get_file_name(original_name: str, bucket_config: Dict[str, Any], row: Dict[str, Any],
+                  table_name: str = None, column_name: str = None) -> str:
+    """
+    파일 이름을 생성합니다. filename_pattern이 있으면 사용하고,
+    없으면 테이블명_컬럼명_순번.확장자 형식으로 생성합니다.
+
+    Args:
+        original_name (str): 원본 파일 이름
+        bucket_config (Dict[str, Any]): 버킷 설정
+        row (Dict[str, Any]): 현재 처리 중인 데이터 행
+        table_name (str, optional): 테이블 이름
+        column_name (str, optional): 컬럼 이름
+
+    Returns:
+        str: 생성된 파일 이름
+    """
+    # filename_pattern이 있으면 사용
+    if 'filename_pattern' in bucket_config:
+        try:
+            return bucket_config['filename_pattern'](row)
+        except:
+            pass
+
+    # filename_pattern이 없거나 실패한 경우
+    # 원본 파일의 확장자 추출
+    _, ext = os.path.splitext(original_name.lower())
+    if not ext and '?' in original_name:  # URL에 쿼리 파라미터가 있는 경우
+        ext = os.path.splitext(original_name.split('?')[0].lower())[1]
+
+    if not ext:  # 확장자가 없는 경우 MIME 타입으로 확장자 추정
+        mime_type = mimetypes.guess_type(original_name)[0]
+        if mime_type:
+            ext = mimetypes.guess_extension(mime_type) or '.bin'
+        else:
+            ext = '.bin'
+
+    # 테이블명과 컬럼명이 제공된 경우 사용
+    if table_name and column_name:
+        file_number = get_next_file_number(table_name, column_name)
+        return f"{table_name}_{column_name}_{file_number}{ext}"
+
+    # 테이블명과 컬럼명이 없는 경우 기본 형식 사용
+    timestamp = int(datetime.now().timestamp() * 1000)
+    unique_id = str(uuid.uuid4())
+    return f"{timestamp}_{unique_id}{ext}"
+
+def get_upload_path(original_name: str, bucket_config: Dict[str, Any], row: Dict[str, Any],
+                    table_name: str, column_name: str) -> str:
+    """
+    파일을 올릴 스토리지 경로를 정합니다.
+    원본 파일 이름을 스토리지에서 쓸 수 없으면(한글, 특수문자 등)
+    filename_pattern 또는 테이블명_컬럼명_순번 이름을 사용합니다.
+
+    스트리밍 업로드는 본문을 다시 보낼 수 없기 때문에, 업로드 후 400 오류가 나면
+    다른 이름으로 재시도하던 방식 대신 업로드 전에 이름을 정합니다.
+
+    Args:
+        original_name (str): 원본 파일 이름
+        bucket_config (Dict[str, Any]): 버킷 설정
+        row (Dict[str, Any]): 현재 처리 중인 데이터 행
+        table_name (str): 테이블 이름
+        column_name (str): 컬럼 이름
+
+    Returns:
+        str: 버킷 안의 파일 경로
+    """
+    storage_path = bucket_config['path']
+    file_name = original_name.split('/')[-1]
+    if not VALID_STORAGE_KEY.match(file_name):
+        file_name = get_file_name(original_name, bucket_config, row, table_name, column_name)
+    return f"{storage_path}/{file_name}"
+
+class SupabaseStorage:
+    """
+    Supabase 스토리지 REST API 클라이언트
+
+    파일 본문을 메모리에 모으지 않고 조각 단위로 보내며,
+    x-upsert 헤더로 삭제 없이 한 번에 덮어씁니다.
+    base_url을 바꾸면 로컬 테스트 서버에도 그대로 쓸 수 있습니다.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, base_url: str = None, key: str = None):
+        """
+        Args:
+            session (aiohttp.ClientSession): 공유 HTTP 세션
+            base_url (str, optional): Supabase 프로젝트 URL (기본값: SUPABASE_URL)
+            key (str, optional): Supabase API 키 (기본값: SUPABASE_KEY)
+        """
+        self.session = session
+        self.base_url = (base_url or SUPABASE_URL or '').rstrip('/')
+        self.key = key or SUPABASE_KEY
+        if not self.base_url:
+            raise Exception("SUPABASE_URL이 설정되지 않았습니다.")
+
+    async def upsert(self, bucket_name: str, upload_path: str, body, mime_type: str) -> str:
+        """
+        파일을 업로드합니다 (같은 경로에 파일이 있으면 덮어씀).
+
+        Args:
+            bucket_name (str): 버킷 이름
+            upload_path (str): 버킷 안의 파일 경로
+            body: 업로드할 내용 (bytes 또는 bytes 조각을 돌려주는 async iterator)
+            mime_type (str): 파일의 MIME 타입
+
+        Returns:
+            str: 버킷 이름과 경로 조합
+        """
+        url = f"{self.base_url}/storage/v1/object/{bucket_name}/{quote(upload_path)}"
+        headers = {
+            'content-type': mime_type,
+            'x-upsert': 'true',
+        }
+        if self.key:
+            headers['apikey'] = self.key
+            headers['Authorization'] = f"Bearer {self.key}"
+
+        async with self.session.post(url, data=body, headers=headers) as response:
+            if response.status >= 400:
+                raise Exception(f"Upload failed ({response.status}): {await response.text()}")
+        return f"{bucket_name}/{upload_path}"  # 버킷 이름과 경로 조합
+
+def get_public_url(path: str, base_url: str = None) -> str:
+    """
+    Supabase 스토리지의 파일에 대한 공개 URL을 생성하는 함수
+
+    Args:
+        path (str): Supabase 스토리지 내 파일 경로 (버킷 이름 포함)
+        base_url (str, optional): 스토리지 URL (기본값: SUPABASE_URL)
+
+    Returns:
+        str: 파일의 공개 접근 URL
+    """
+    # 경로에서 버킷 이름과 파일 경로 분리
+    parts = path.split('/', 1)
+    bucket = parts[0]
+    file_path = parts[1] if len(parts) > 1 else ''
+
+    return f"{base_url or SUPABASE_URL}/storage/v1/object/public/{bucket}/{file_path}"
+
+def find_table_for_column(column_name: str) -> Optional[str]:
+    """
+    주어진 컬럼이 어느 테이블에 속하는지 찾습니다.
+
+    Args:
+        column_name (str): 찾을 컬럼 이름
+
+    Returns:
+        Optional[str]: 테이블 이름. 찾지 못한 경우 None
+    """
+    for table_name, config in BUCKET_CONFIGS.items():
+        if column_name in config:
+            return table_name
+    return None
+
+def is_file_url(value: str) -> bool:
+    """
+    주어진 값이 bubble.io 파일 URL인지 확인하는 함수
+
+    Args:
+        value (str): 확인할 URL 문자열
+
+    Returns:
+        bool: bubble.io URL이면 True, 아니면 False
+    """
+    return isinstance(value, str) and 'bubble.io' in value
+
+def normalize_url(url: str) -> str:
+    """
+    URL을 정규화하는 함수
+    - '//'로 시작하는 URL을 'https://'로 변환
+    - URL 인코딩된 문자를 디코딩
+
+    Args:
+        url (str): 정규화할 URL
+
+    Returns:
+        str: 정규화된 URL
+    """
+    # URL 디코딩
+    decoded_url = unquote(url)
+
+    # '//'로 시작하는 경우 'https:'를 추가
+    if decoded_url.startswith('//'):
+        return f'https:{decoded_url}'
+    # 'http://' 또는 'https://'로 시작하지 않는 경우 'https://'를 추가
+    elif not decoded_url.startswith(('http://', 'https://')):
+        return f'https://{decoded_url}'
+    return decoded_url
+
+async def _pump_chunks(response: aiohttp.ClientResponse, chunks: asyncio.Queue):
+    """
+    다운로드 응답을 조각 단위로 큐에 넣습니다.
+    큐가 가득 차면 업로드가 따라올 때까지 기다리므로 메모리 사용량이 제한됩니다.
+    """
+    try:
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            await chunks.put(chunk)
+        await chunks.put(None)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        await chunks.put(e)
+
+async def _iter_chunks(chunks: asyncio.Queue):
+    """큐에 들어온 조각을 업로드 본문으로 돌려줍니다."""
+    while True:
+        chunk = await chunks.get()
+        if chunk is None:
+            return
+        if isinstance(chunk, Exception):
+            raise chunk
+        yield chunk
+
+async def download_worker(jobs: asyncio.Queue, transfers: asyncio.Queue, session: aiohttp.ClientSession):
+    """
+    다운로드 작업자: 파일 응답을 열어 업로드 작업자에게 넘기고, 본문을 조각 단위로 흘려보냅니다.
+    """
+    while True:
+        job = await jobs.get()
+        if job is None:
+            return
+        try:
+            async with session.get(job['url']) as response:
+                response.raise_for_status()
+                if not mimetypes.guess_type(job['original_name'])[0] and response.content_type:
+                    job['mime_type'] = response.content_type
+
+                chunks = asyncio.Queue(maxsize=CHUNK_QUEUE_SIZE)
+                done = asyncio.get_running_loop().create_future()
+                await transfers.put((job, chunks, done))
+
+                pump = asyncio.create_task(_pump_chunks(response, chunks))
+                # 업로드가 끝날 때까지(실패해서 멈춘 경우 포함) 응답을 열어둡니다
+                await done
+                if not pump.done():
+                    pump.cancel()
+                await asyncio.gather(pump, return_exceptions=True)
+        except Exception as e:
+            job['error'] = str(e)
+
+async def upload_worker(transfers: asyncio.Queue, storage: SupabaseStorage):
+    """
+    업로드 작업자: 다운로드 중인 본문을 그대로 스토리지에 올립니다.
+    """
+    while True:
+        item = await transfers.get()
+        if item is None:
+            return
+        job, chunks, done = item
+        try:
+            job['storage_path'] = await storage.upsert(
+                job['bucket_name'], job['upload_path'], _iter_chunks(chunks), job['mime_type']
+            )
+        except Exception as e:
+            job['error'] = str(e)
+        finally:
+            done.set_result(None)
+
+async def transfer_files(jobs: List[Dict[str, Any]], session: aiohttp.ClientSession, storage: SupabaseStorage,
+                         download_concurrency: int = DOWNLOAD_CONCURRENCY,
+                         upload_concurrency: int = UPLOAD_CONCURRENCY,
+                         queue_size: int = TRANSFER_QUEUE_SIZE):
+    """
+    다운로드 → 업로드 스트리밍 파이프라인
+
+    다운로드 작업자들이 응답을 열면 크기가 제한된 큐를 통해 업로드 작업자들에게 넘기고,
+    본문은 파일 전체를 메모리에 모으지 않고 조각 단위로 바로 업로드됩니다.
+    결과는 각 작업의 'storage_path' 또는 'error'에 기록됩니다.
+
+    Args:
+        jobs (List[Dict[str, Any]]): 전송할 작업 목록
+        session (aiohttp.ClientSession): 다운로드에 쓸 HTTP 세션
+        storage (SupabaseStorage): 업로드할 스토리지
+        download_concurrency (int): 동시에 받을 파일 수
+        upload_concurrency (int): 동시에 올릴 파일 수
+        queue_size (int): 업로드를 기다리는 다운로드의 최대 개수
+    """
+    job_queue = asyncio.Queue()
+    transfer_queue = asyncio.Queue(maxsize=queue_size)
+    for job in jobs:
+        job_queue.put_nowait(job)
+    for _ in range(download_concurrency):
+        job_queue.put_nowait(None)
+
+    uploaders = [asyncio.create_task(upload_worker(transfer_queue, storage)) for _ in range(upload_concurrency)]
+    await asyncio.gather(*(download_worker(job_queue, transfer_queue, session) for _ in range(download_concurrency)))
+    for _ in range(upload_concurrency):
+        await transfer_queue.put(None)
+    await asyncio.gather(*uploaders)
+
+async def process_csv(input_csv: str = INPUT_CSV, output_csv: str = OUTPUT_CSV,
+                      storage_url: str = None, storage_key: str = None,
+                      download_concurrency: int = DOWNLOAD_CONCURRENCY,
+                      upload_concurrency: int = UPLOAD_CONCURRENCY):
+    """
+    CSV 파일을 처리하는 메인 함수
+
+    Args:
+        input_csv (str): 원본 bubble.io URL이 있는 CSV 파일
+        output_csv (str): 변환된 URL을 저장할 CSV 파일
+        storage_url (str, optional): 스토리지 URL (기본값: SUPABASE_URL)
+        storage_key (str, optional): 스토리지 API 키 (기본값: SUPABASE_KEY)
+        download_concurrency (int): 동시에 받을 파일 수
+        upload_concurrency (int): 동시에 올릴 파일 수
+    """
+    if not os.path.exists(input_csv):
+        raise Exception(f"입력 파일을 찾을 수 없습니다: {input_csv}")
+
+    # CSV 파일 읽기
+    rows = []
+    with open(input_csv, 'r', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        rows = list(reader)
+
+    if not rows:
+        print("❌ CSV 파일이 비어있습니다.")
+        return
+
+    print(f"🔍 총 {len(rows)}건 처리 시작")
+
+    # 처리할 컬럼 찾기
+    columns = rows[0].keys()
+    file_columns = [
+        col for col in columns
+        if any(is_file_url(row[col]) for row in rows)
+    ]
+
+    if not file_columns:
+        print("❌ bubble.io URL을 포함한 컬럼을 찾을 수 없습니다.")
+        return
+
+    print(f"✅ 파일 URL 컬럼: {', '.join(file_columns)}")
+
+    # 각 행의 URL로 전송 작업 만들기
+    # (파일 이름 순번이 동시 처리 순서에 따라 바뀌지 않도록 행 순서대로 미리 정합니다)
+    column_tables = {}
+    for col in file_columns:
+        column_tables[col] = find_table_for_column(col)
+        if not column_tables[col]:
+            print(f"⚠️ 컬럼 '{col}'에 대한 테이블을 찾을 수 없습니다.")
+
+    jobs = []
+    for row in rows:
+        for col in file_columns:
+            raw_url = row[col]
+            table_name = column_tables[col]
+            if not table_name or not is_file_url(raw_url):
+                continue
+
+            bucket_config = get_bucket_config(table_name, col)
+            file_url = normalize_url(raw_url)
+            original_name = file_url.split('/')[-1]
+            jobs.append({
+                'row': row,
+                'column': col,
+                'url': file_url,
+                'original_name': original_name,
+                'bucket_name': bucket_config['name'],
+                'upload_path': get_upload_path(original_name, bucket_config, row, table_name, col),
+                'mime_type': mimetypes.guess_type(original_name)[0] or 'application/octet-stream',
+            })
+
+    async with aiohttp.ClientSession() as session:
+        storage = SupabaseStorage(session, storage_url, storage_key)
+        await transfer_files(jobs, session, storage, download_concurrency, upload_concurrency)
+        public_base_url = storage.base_url
+
+    # 결과를 행에 반영 (파일별 결과는 기록 파일에 남기고 화면에는 일부만 출력)
+    log = EventLog(f"{os.path.splitext(output_csv)[0]}_events.jsonl")
+    success_count = 0
+    for job in jobs:
+        if job.get('storage_path') and not job.get('error'):
+            job['row'][job['column']] = get_public_url(job['storage_path'], public_base_url)
+            success_count += 1
+            log.info(f"📤 업로드 완료: {job['original_name']}", item=job['url'],
+                     column=job['column'], path=job['storage_path'])
+        else:
+            log.error(f"⚠️ 실패 ({job['url']}): {job.get('error')}", item=job['url'],
+                      column=job['column'], error=str(job.get('error')))
+    log.close()
+
+    # 변환된 데이터를 새로운 CSV 파일로 저장
+    with open(output_csv, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"✅ 성공: {success_count}개 / ❌ 실패: {len(jobs) - success_count}개")
+    log.print_summary()
+    if log.errors:
+        error_report_path = f"{os.path.splitext(output_csv)[0]}_errors.csv"
+        log.write_error_report(error_report_path)
+        print(f"❌ 오류 보고서: {error_report_path}")
+    print(f"🎉 완료! 업데이트된 CSV 저장됨 → {output_csv}")
+
+if __name__ == "__main__":
+    asyncio.run(process_csv())
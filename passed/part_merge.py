@@ -0,0 +1,214 @@
+# 여러 파트로 나뉜 Bubble 내보내기 CSV를 하나의 테이블로 합쳐서 포맷팅하는 도구
+# 예시: settlement_melon_1.csv, settlement_melon_2.csv, ... -> settlement_melon_formatted.csv
+# 파트를 미리 이어 붙이지 않고 chunk_size 행씩 차례로 읽어서 포맷팅하므로 메모리는 조각 크기만큼만 씁니다
+import os
+import re
+import time
+import pandas as pd
+from data_formatter import (format_sheet, find_table_type, get_output_path, new_duplicate_checker,
+                            report_duplicates)
+from duplicate_check import DUPLICATE_POLICY, DUPLICATE_KEEP_LAST, DUPLICATE_SIDE_FILE
+from sheet_reader import DEFAULT_CHUNK_SIZE, prefetch
+from event_log import default_log
+from compressed_io import split_extension, strip_extension, open_text_output, OUTPUT_COMPRESSIONS
+
+# 파일 이름 끝의 파트 번호 (예: 'settlement_melon_2', 'album-part3', 'track (4)')
+PART_NUMBER_PATTERN = re.compile(r'[\s_\-]*(?:part)?[\s_\-]*\(?(\d+)\)?$', re.IGNORECASE)
+
+def split_part_name(file_path):
+    """
+    파일 이름을 (파트 번호를 뺀 이름, 파트 번호)로 나누는 함수
+    예시: 'settlement_melon_2.csv.gz' -> ('settlement_melon', 2), 'album.csv' -> ('album', 0)
+
+    Args:
+        file_path (str): 파일 경로
+
+    Returns:
+        tuple: (파트 번호를 뺀 이름, 파트 번호)
+    """
+    name = strip_extension(os.path.basename(file_path))
+    match = PART_NUMBER_PATTERN.search(name)
+    if match is None or match.start() == 0:
+        return name, 0
+    return name[:match.start()], int(match.group(1))
+
+def group_parts(file_paths):
+    """
+    CSV 파일들을 파트끼리 묶는 함수 (묶음 안은 파트 번호 순서)
+    테이블 타입과 파트 번호를 뺀 이름이 모두 같고 이름 끝에 파트 번호가 있는 파일만 묶습니다
+    예시: album_1.csv, album_2.csv는 묶고 album_backup.csv, album.csv는 묶지 않음
+
+    Args:
+        file_paths (list): 파일 경로 목록
+
+    Returns:
+        tuple: ({(테이블 타입, 파트 번호를 뺀 이름): 파트 경로 목록}, 묶지 않은 파일 경로 목록)
+            CSV가 아니거나, 테이블 타입을 찾지 못했거나, 파트 번호가 없거나,
+            같은 묶음의 다른 파트가 없는 파일은 묶지 않습니다
+    """
+    groups = {}
+    others = []
+    for file_path in file_paths:
+        file_extension, _ = split_extension(file_path)
+        table_type = find_table_type(file_path) if file_extension == '.csv' else None
+        stem, part_number = split_part_name(file_path)
+        if table_type is None or part_number == 0:
+            others.append(file_path)
+            continue
+        groups.setdefault((table_type, stem), []).append(file_path)
+    for key, parts in list(groups.items()):
+        if len(parts) == 1:
+            others.extend(groups.pop(key))
+            continue
+        parts.sort(key=split_part_name)
+    return groups, others
+
+def normalize_columns(columns):
+    """format_sheet와 같은 방식으로 컬럼 이름을 맞추는 함수"""
+    return [str(col).lower().strip() for col in columns]
+
+def check_part_headers(parts):
+    """
+    파트들의 헤더만 읽어서 컬럼이 모두 같은지 검사하는 함수 (순서는 달라도 됨)
+
+    Args:
+        parts (list): 파트 경로 목록
+
+    Returns:
+        list: 첫 파트의 컬럼 이름 목록 (이 순서로 모든 파트를 맞춤)
+
+    Raises:
+        ValueError: 컬럼이 다른 파트가 있는 경우
+    """
+    columns = None
+    problems = []
+    for part in parts:
+        part_columns = normalize_columns(pd.read_csv(part, nrows=0).columns)
+        if columns is None:
+            columns = part_columns
+            continue
+        missing = [col for col in columns if col not in part_columns]
+        extra = [col for col in part_columns if col not in columns]
+        if missing or extra:
+            problem = f"{os.path.basename(part)}:"
+            if missing:
+                problem += f" 없는 컬럼 {missing}"
+            if extra:
+                problem += f" 추가 컬럼 {extra}"
+            problems.append(problem)
+    if problems:
+        raise ValueError(f"❌ 파트마다 컬럼이 다릅니다 (기준: {os.path.basename(parts[0])})\n"
+                         + '\n'.join(problems))
+    return columns
+
+def merge_parts(parts, output_dir=None, chunk_size=DEFAULT_CHUNK_SIZE, url_rewriter=None, log=None,
+                summary=None, duplicate_policy=DUPLICATE_POLICY, references=None, compression=None):
+    """
+    같은 테이블의 파트들을 하나의 테이블로 포맷팅해서 CSV 파일 하나로 저장하는 함수
+
+    - 파트를 순서대로 chunk_size 행씩 읽어서 포맷팅하고 바로 이어서 씁니다
+    - 중간에 실패해도 잘린 결과가 남지 않도록 임시 파일에 쓴 뒤 다 끝나면 이름을 바꿉니다
+    - 중복 검사기를 모든 파트가 함께 쓰므로 파트 사이에 겹치는 unique id도 찾습니다
+      (행을 빼는 것은 duplicate_policy로 직접 고른 경우만)
+
+    Args:
+        parts (list): 같은 테이블 타입의 CSV(.csv.gz) 파트 경로 목록 (이 순서대로 합침)
+        output_dir (str, optional): 출력 디렉토리 경로 (없으면 첫 파트와 같은 폴더)
+        chunk_size (int): 한 번에 읽어서 포맷팅할 행 수
+        url_rewriter (UrlRewriter, optional): 파일 URL 변환기
+        log (EventLog, optional): 처리 기록을 남길 로그 (없으면 화면에만 출력)
+        summary (dict, optional): 처리 결과 요약을 담을 딕셔너리 (tables, rows, duplicates, parts)
+        duplicate_policy (str, optional): unique id 중복 처리 방식 (기본값 'report'는 중복 수만 기록,
+            파트 사이 중복 행을 빼려면 'side_file'이나 'keep_first'를 넘김, keep_last는 쓸 수 없음)
+        references (ReferenceCollector, optional): 포맷팅한 unique_id와 외래 키 값을 모을 객체
+        compression (str, optional): 결과 압축 형식 ('gzip'이면 .csv.gz로 저장)
+
+    Returns:
+        str: 합쳐서 포맷팅된 파일의 경로
+    """
+    if log is None:
+        log = default_log
+    if summary is None:
+        summary = {}
+    summary['tables'] = []
+    summary['rows'] = 0
+    summary['duplicates'] = 0
+    summary['parts'] = len(parts)
+
+    if not parts:
+        raise ValueError("❌ 합칠 파일이 없습니다.")
+    if compression not in OUTPUT_COMPRESSIONS:
+        raise ValueError(f"❌ 지원하지 않는 압축 형식입니다: {compression}")
+    # 가장 늦은 행을 고르려면 모든 파트를 한 번에 읽어야 하므로 메모리를 일정하게 유지할 수 없습니다
+    if duplicate_policy == DUPLICATE_KEEP_LAST:
+        raise ValueError("❌ keep_last 중복 처리는 파트를 합칠 때 쓸 수 없습니다.")
+
+    table_types = {find_table_type(part) for part in parts}
+    if len(table_types) != 1 or None in table_types:
+        raise ValueError(f"❌ 같은 테이블 타입의 파일만 합칠 수 있습니다: {sorted(map(str, table_types))}")
+    table_type = table_types.pop()
+    columns = check_part_headers(parts)
+
+    # 출력 디렉토리 설정
+    if output_dir is None:
+        output_dir = os.path.dirname(parts[0])
+    else:
+        os.makedirs(output_dir, exist_ok=True)
+
+    base_name = split_part_name(parts[0])[0] + '_formatted'
+    output_path = get_output_path(output_dir, base_name, '.csv.gz' if compression == 'gzip' else '.csv')
+
+    def read_parts():
+        for part in parts:
+            with pd.read_csv(part, chunksize=chunk_size) as reader:
+                for df in reader:
+                    # 헤더 이름과 순서를 첫 파트에 맞춥니다
+                    df.columns = normalize_columns(df.columns)
+                    yield df[columns]
+
+    started = time.monotonic()
+    rows = 0
+    temp_path = output_path + '.part'
+    duplicates = new_duplicate_checker(duplicate_policy, output_path)
+    try:
+        with open_text_output(temp_path, compression) as output_file:
+            header = True
+            # 다음 조각을 읽는 동안 현재 조각을 포맷팅합니다
+            for df in prefetch(read_parts()):
+                formatted_df = format_sheet(df, table_type, url_rewriter, duplicates=duplicates)
+                formatted_df.to_csv(output_file, index=False, header=header)
+                header = False
+                if references is not None:
+                    references.add(table_type, formatted_df)
+                rows += len(formatted_df)
+        os.replace(temp_path, output_path)
+    finally:
+        if duplicates is not None:
+            duplicates.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    log.info(f"✅ {table_type} 테이블 파트 {len(parts)}개 합치기 완료", item=output_path,
+             table=table_type, rows=rows, duration=time.monotonic() - started)
+    report_duplicates(duplicates, table_type, log, summary)
+    summary['tables'].append(table_type)
+    summary['rows'] += rows
+    return output_path
+
+if __name__ == "__main__":
+    # 파트 파일들이 있는 폴더 입력 받기
+    folder = input("파트 파일들이 있는 폴더 경로를 입력하세요: ").strip()
+    file_paths = [os.path.join(folder, name) for name in sorted(os.listdir(folder))]
+    # 중복 행은 물어보고 뺍니다 (기본값은 중복 수만 알려줌)
+    answer = input("파트 사이에 겹치는 unique id 행을 결과에서 빼고 따로 저장할까요? (y/N): ").strip().lower()
+    policy = DUPLICATE_SIDE_FILE if answer == 'y' else DUPLICATE_POLICY
+    groups, _ = group_parts(file_paths)
+    if not groups:
+        print("❌ 합칠 CSV 파일이 없습니다.")
+    for (table_type, _), parts in groups.items():
+        print(f"\n📁 {table_type}: {', '.join(os.path.basename(part) for part in parts)}")
+        try:
+            output_path = merge_parts(parts, duplicate_policy=policy)
+            print(f"🎉 결과가 {output_path}에 저장되었습니다.")
+        except Exception as e:
+            print(f"오류 발생: {str(e)}")
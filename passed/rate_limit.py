@@ -0,0 +1,91 @@
+# 요청 속도를 제한하는 도구 (토큰 버킷)
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    토큰 버킷 방식의 속도 제한 클래스
+
+    초당 rate개의 토큰이 쌓이고 최대 capacity개까지 모아둘 수 있습니다.
+    요청 하나(또는 바이트 n개)를 보낼 때마다 토큰을 꺼내 쓰고,
+    토큰이 모자라면 쌓일 때까지 기다립니다.
+    스레드와 asyncio 양쪽에서 함께 쓸 수 있습니다.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Args:
+            rate (float): 초당 채워지는 토큰 수
+            capacity (float, optional): 최대 토큰 수 (기본값: rate)
+        """
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount):
+        """
+        토큰을 예약하고 기다려야 하는 시간(초)을 돌려주는 함수
+        토큰이 모자라면 미리 빌려 쓰고(음수), 그만큼 기다리게 합니다
+        """
+        # 한 번에 capacity보다 많이 요청하면 영원히 기다리지 않도록 나눠서 처리합니다
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, amount=1):
+        """토큰을 꺼내 씁니다 (스레드용, 필요하면 기다림)"""
+        wait = self._reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, amount=1):
+        """토큰을 꺼내 씁니다 (asyncio용, 필요하면 기다림)"""
+        wait = self._reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class HostRateLimiter:
+    """
+    호스트별로 토큰 버킷을 따로 두는 속도 제한 클래스
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Args:
+            rate (float): 호스트별 초당 요청 수
+            capacity (float, optional): 호스트별 최대 연속 요청 수
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url):
+        """URL의 호스트에 해당하는 토큰 버킷을 돌려줍니다"""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url, amount=1):
+        self.bucket_for(url).acquire(amount)
+
+    async def acquire_async(self, url, amount=1):
+        await self.bucket_for(url).acquire_async(amount)
@@ -0,0 +1,198 @@
+# 여러 테이블을 함께 포맷팅할 때 외래 키(foreign_keys)가 실제로 있는 행을 가리키는지 검사하는 도구
+# pandas merge 대신 테이블마다 정렬된 unique_id 배열(색인)을 만들고 searchsorted로 한 번에 찾습니다
+import csv
+import os
+import numpy as np
+from formatter_config import TABLE_CONFIGS
+from data_formatter import format_data, generate_uuid_from_text
+
+# 참조 검사 보고서 파일 이름 (출력 폴더에 저장)
+REFERENCE_REPORT_NAME = 'reference_report.csv'
+
+# 보고서에 남길 끊어진 참조 예시 수
+SAMPLE_SIZE = 5
+
+# UUID 문자열 길이 (색인은 36바이트 고정 길이 배열로 저장)
+UUID_DTYPE = 'S36'
+
+def split_references(series):
+    """
+    외래 키 컬럼 값을 UUID 하나씩으로 나누는 함수
+    generate_uuid_from_text는 쉼표로 구분된 값을 'a, b' 형태로 이어 붙이므로 다시 나눕니다
+
+    Args:
+        series (pandas.Series): 외래 키 컬럼
+
+    Returns:
+        numpy.ndarray: UUID 배열 (빈 값 제외)
+    """
+    values = series.dropna().astype(str)
+    values = values[values.str.strip() != '']
+    if values.str.contains(',', regex=False).any():
+        values = values.str.split(',').explode().str.strip()
+        values = values[values != '']
+    return values.to_numpy(dtype=UUID_DTYPE)
+
+class KeyIndex:
+    """
+    테이블 하나의 unique_id 색인 (정렬된 고정 길이 배열)
+    UUID 하나에 36바이트만 쓰고, 찾을 때는 searchsorted로 한 번에 찾습니다
+    """
+
+    def __init__(self, keys):
+        """
+        Args:
+            keys (numpy.ndarray): unique_id 배열 (UUID_DTYPE)
+        """
+        self.keys = np.unique(keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def contains(self, values):
+        """
+        값마다 색인에 있는지 돌려주는 함수
+
+        Args:
+            values (numpy.ndarray): 찾을 UUID 배열 (UUID_DTYPE)
+
+        Returns:
+            numpy.ndarray: 있으면 True
+        """
+        if len(self.keys) == 0:
+            return np.zeros(len(values), dtype=bool)
+        positions = np.searchsorted(self.keys, values)
+        positions = np.minimum(positions, len(self.keys) - 1)
+        return self.keys[positions] == values
+
+class ReferenceCollector:
+    """
+    포맷팅한 데이터에서 unique_id와 외래 키 값만 모아두었다가 한 번에 검사하는 클래스
+
+    - format_data(..., references=collector)로 넘기면 조각마다 add()가 불립니다
+    - 행 전체가 아니라 필요한 컬럼만 고정 길이 배열로 모으므로 수백만 행도 메모리를 적게 씁니다
+    """
+
+    def __init__(self):
+        self._keys = {}
+        self._references = {}
+
+    def add(self, table_type, df):
+        """
+        포맷팅한 조각 하나의 unique_id와 외래 키 값을 모으는 함수
+
+        Args:
+            table_type (str): 테이블 타입
+            df (pandas.DataFrame): 포맷팅된 데이터프레임
+        """
+        config = TABLE_CONFIGS.get(table_type, {})
+        if 'unique_id' in df.columns:
+            self._keys.setdefault(table_type, []).append(split_references(df['unique_id']))
+        for column, target in config.get('foreign_keys', {}).items():
+            if column in df.columns:
+                self._references.setdefault((table_type, column, target), []).append(
+                    split_references(df[column])
+                )
+
+    def check(self):
+        """
+        모은 외래 키 값이 가리키는 테이블에 있는지 검사하는 함수
+
+        Returns:
+            list: 외래 키 컬럼마다 하나씩 결과 (dict)
+                - table, column, target, references, dangling, default_fallbacks, samples, checked
+                  (checked가 False이면 가리키는 테이블이 이번 묶음에 없어서 검사하지 못한 것)
+        """
+        indexes = {table: KeyIndex(np.concatenate(chunks)) for table, chunks in self._keys.items()}
+        results = []
+        for (table, column, target), chunks in self._references.items():
+            values = np.concatenate(chunks) if chunks else np.empty(0, dtype=UUID_DTYPE)
+
+            # 기본값(DEFAULT_VALUE_MAPPING)으로 채워진 참조 수
+            config = TABLE_CONFIGS[table]
+            source_column = config['uuid_columns'].get(column)
+            default = config.get('default_values', {}).get(source_column)
+            is_default = np.zeros(len(values), dtype=bool)
+            if default is not None:
+                is_default = values == generate_uuid_from_text(default).encode()
+            default_fallbacks = int(np.count_nonzero(is_default))
+
+            result = {
+                'table': table,
+                'column': column,
+                'target': target,
+                'references': len(values),
+                'dangling': 0,
+                'default_fallbacks': default_fallbacks,
+                'samples': [],
+                'checked': target in indexes,
+            }
+            if target in indexes:
+                # 기본값 UUID는 가리키는 테이블에 없는 자리표시자이므로 끊어진 참조로 세지 않습니다
+                missing = values[~indexes[target].contains(values) & ~is_default]
+                result['dangling'] = len(missing)
+                result['samples'] = [value.decode() for value in np.unique(missing)[:SAMPLE_SIZE]]
+            results.append(result)
+        return results
+
+def write_reference_report(results, report_path):
+    """
+    참조 검사 결과를 CSV 파일로 저장하는 함수
+
+    Args:
+        results (list): ReferenceCollector.check() 결과
+        report_path (str): 보고서 파일 경로
+    """
+    with open(report_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['table', 'column', 'target', 'checked', 'references', 'dangling',
+                         'default_fallbacks', 'samples'])
+        for result in results:
+            writer.writerow([result['table'], result['column'], result['target'], result['checked'],
+                             result['references'], result['dangling'], result['default_fallbacks'],
+                             ' '.join(result['samples'])])
+
+def format_reference_results(results):
+    """
+    참조 검사 결과를 사람이 읽기 좋은 글로 만드는 함수
+
+    Args:
+        results (list): ReferenceCollector.check() 결과
+
+    Returns:
+        str: 검사 결과
+    """
+    lines = []
+    for result in results:
+        name = f"{result['table']}.{result['column']} → {result['target']}"
+        if not result['checked']:
+            lines.append(f"⚠️ {name}: {result['target']} 테이블이 없어 검사하지 못했습니다")
+            continue
+        line = f"{'❌' if result['dangling'] else '✅'} {name}: 참조 {result['references']}건"
+        if result['dangling']:
+            line += f", 끊어진 참조 {result['dangling']}건 (예: {', '.join(result['samples'])})"
+        if result['default_fallbacks']:
+            line += f", 기본값 사용 {result['default_fallbacks']}건"
+        lines.append(line)
+    return '\n'.join(lines)
+
+def format_batch(file_paths, output_dir=None, **options):
+    """
+    여러 파일을 포맷팅하고 테이블 사이의 참조를 검사하는 함수
+
+    Args:
+        file_paths (list): 처리할 파일 경로 목록
+        output_dir (str, optional): 출력 폴더 (없으면 첫 파일과 같은 폴더에 보고서 저장)
+        **options: format_data에 넘길 옵션
+
+    Returns:
+        tuple: (출력 파일 경로 목록, 참조 검사 결과, 보고서 경로)
+    """
+    collector = ReferenceCollector()
+    output_paths = [format_data(file_path, output_dir, references=collector, **options)
+                    for file_path in file_paths]
+    results = collector.check()
+    report_dir = output_dir or os.path.dirname(file_paths[0])
+    report_path = os.path.join(report_dir, REFERENCE_REPORT_NAME)
+    write_reference_report(results, report_path)
+    return output_paths, results, report_path
@@ -0,0 +1,232 @@
+# 포맷팅 결과 캐시
+# 같은 파일을 같은 설정으로 다시 변환하면 다시 포맷팅하지 않고 이전 결과를 바로 돌려줍니다
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+# 캐시 폴더 기본 위치 (사용자 홈 폴더)
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.data_formatter_cache')
+
+# 캐시 폴더 최대 크기(바이트). 넘으면 가장 오래 안 쓴 결과부터 지웁니다
+CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+# 파일 내용을 해시할 때 한 번에 읽을 크기
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def hash_file(file_path):
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_path(path):
+    """결과 파일(또는 시트별 CSV 폴더) 내용의 SHA-256 해시"""
+    if not os.path.isdir(path):
+        return hash_file(path)
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(path)):
+        digest.update(f"{name}:{hash_file(os.path.join(path, name))}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def hash_config(*values):
+    """
+    설정 값들의 해시 (딕셔너리 키 순서와 상관없이 같은 값이면 같은 해시)
+    함수(lambda)처럼 JSON으로 바꿀 수 없는 값은 이름으로 바꿔서 씁니다
+    """
+    text = json.dumps(values, sort_keys=True, ensure_ascii=False,
+                      default=lambda value: getattr(value, '__qualname__', repr(value)))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _path_size(path):
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    return os.path.getsize(path)
+
+def _remove(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+def _copy(source, target):
+    # 하드 링크를 쓰면 돌려준 결과를 엑셀 등에서 고쳐 저장할 때 캐시도 함께 바뀌므로 항상 복사합니다
+    if os.path.isdir(source):
+        shutil.copytree(source, target)
+    else:
+        shutil.copy2(source, target)
+    return target
+
+class ResultCache:
+    """
+    (입력 파일 내용 해시 + 설정 해시) → 포맷팅 결과를 저장하는 캐시
+
+    - 입력 파일 해시는 (경로, 크기, 수정 시각)이 같으면 다시 계산하지 않습니다
+    - 이전에 돌려준 출력 파일이 내용(해시)까지 그대로면 그 경로를 돌려주고, 아니면 캐시에서 복사해서 만듭니다
+    - 캐시에 저장한 결과도 해시가 달라졌으면 쓰지 않고 지웁니다
+    - 캐시 폴더가 max_bytes를 넘으면 가장 오래 안 쓴 결과부터 지웁니다 (LRU)
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        """
+        Args:
+            cache_dir (str): 캐시 폴더
+            max_bytes (int): 캐시 폴더 최대 크기(바이트)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(cache_dir, 'results'), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, 'cache.db'), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                output_path TEXT,
+                meta TEXT,
+                digest TEXT
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            );
+        """)
+        try:
+            # 결과 해시 컬럼이 없던 이전 캐시 파일
+            self._conn.execute("ALTER TABLE entries ADD COLUMN digest TEXT")
+        except sqlite3.OperationalError:
+            pass
+        self._conn.commit()
+
+    def file_digest(self, file_path):
+        """
+        입력 파일 내용 해시 (크기와 수정 시각이 그대로면 저장해둔 값을 씀)
+
+        Args:
+            file_path (str): 입력 파일 경로
+
+        Returns:
+            str: SHA-256 해시
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        with self._lock:
+            row = self._conn.execute("SELECT size, mtime_ns, digest FROM file_hashes WHERE path = ?",
+                                     (path,)).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        digest = hash_file(path)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, digest) "
+                               "VALUES (?, ?, ?, ?)", (path, stat.st_size, stat.st_mtime_ns, digest))
+        return digest
+
+    def key(self, file_path, config_hash):
+        """캐시 키 (입력 파일 내용 해시 + 설정 해시)"""
+        return hashlib.sha256(f"{self.file_digest(file_path)}:{config_hash}".encode()).hexdigest()
+
+    def _result_path(self, key, name):
+        return os.path.join(self.cache_dir, 'results', key, name)
+
+    def get(self, key, output_dir, make_output_path):
+        """
+        캐시된 결과를 찾는 함수
+
+        Args:
+            key (str): 캐시 키
+            output_dir (str): 결과를 둘 폴더
+            make_output_path (callable): 새 출력 경로를 만드는 함수 (확장자를 받음)
+
+        Returns:
+            tuple: (출력 경로, 저장해둔 부가 정보 dict). 캐시에 없으면 None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT name, output_path, meta, digest FROM entries WHERE key = ?",
+                                     (key,)).fetchone()
+        if row is None:
+            return None
+        name, output_path, meta, digest = row
+        cached = self._result_path(key, name)
+        if not digest or not os.path.exists(cached):
+            self._delete(key)
+            return None
+
+        # 이전에 돌려준 출력이 같은 폴더에 내용까지 그대로 있으면 새로 만들지 않습니다
+        if not (output_path and os.path.exists(output_path)
+                and os.path.abspath(os.path.dirname(output_path)) == os.path.abspath(output_dir)
+                and _path_size(output_path) == _path_size(cached)
+                and hash_path(output_path) == digest):
+            # 캐시에 저장한 결과가 바뀌었으면 쓰지 않습니다
+            if hash_path(cached) != digest:
+                self._delete(key)
+                return None
+            root, extension = os.path.splitext(name)
+            if extension == '.gz':
+                # 'name.csv.gz'처럼 압축 확장자가 붙은 결과는 확장자 두 개를 함께 씁니다
+                extension = os.path.splitext(root)[1] + extension
+            output_path = _copy(cached, make_output_path(extension))
+
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE entries SET last_used = ?, output_path = ? WHERE key = ?",
+                               (time.time(), output_path, key))
+        return output_path, json.loads(meta or '{}')
+
+    def put(self, key, output_path, meta=None):
+        """
+        포맷팅 결과를 캐시에 저장하는 함수
+
+        Args:
+            key (str): 캐시 키
+            output_path (str): 포맷팅 결과 경로 (파일 또는 폴더)
+            meta (dict, optional): 함께 저장할 부가 정보 (처리한 테이블, 행 수 등)
+        """
+        name = os.path.basename(output_path)
+        cached = self._result_path(key, name)
+        _remove(os.path.dirname(cached))
+        os.makedirs(os.path.dirname(cached))
+        if os.path.isdir(output_path):
+            shutil.copytree(output_path, cached)
+        else:
+            shutil.copy2(output_path, cached)
+        size = _path_size(cached)
+        digest = hash_path(cached)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, name, size, last_used, output_path, meta, digest) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, name, size, time.time(), output_path, json.dumps(meta or {}, ensure_ascii=False),
+                 digest)
+            )
+        self.evict()
+
+    def _delete(self, key):
+        _remove(os.path.join(self.cache_dir, 'results', key))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def evict(self):
+        """캐시 폴더가 max_bytes 이하가 될 때까지 가장 오래 안 쓴 결과부터 지웁니다"""
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._delete(key)
+            total -= size
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
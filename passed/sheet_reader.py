@@ -0,0 +1,161 @@
+# 큰 엑셀 파일을 조금씩 읽어오는 도구들
+import queue
+import threading
+import pandas as pd
+
+# 한 번에 포맷터로 넘길 기본 행 수
+DEFAULT_CHUNK_SIZE = 10000
+
+# 사용할 수 있는 읽기 방식
+# - pandas: 기본 pd.read_excel (시트 전체를 한 번에 읽음)
+# - openpyxl: read_only 모드로 행을 조금씩 읽음 (큰 워크북용)
+READER_BACKENDS = ('pandas', 'openpyxl')
+
+
+def _make_header(values):
+    """
+    첫 행으로 컬럼 이름을 만드는 함수
+    비어있는 컬럼 이름은 pandas와 같이 'Unnamed: N' 형식으로 채웁니다
+    """
+    return [
+        f"Unnamed: {i}" if value is None or str(value).strip() == "" else value
+        for i, value in enumerate(values)
+    ]
+
+
+def iter_sheet_chunks(worksheet, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    read_only 모드로 연 시트를 chunk_size 행씩 데이터프레임으로 읽는 함수
+
+    Args:
+        worksheet: openpyxl read_only 워크시트
+        chunk_size (int): 한 번에 읽을 행 수
+
+    Returns:
+        iterator: pandas.DataFrame 조각들
+    """
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = _make_header(header)
+
+    buffer = []
+    for row in rows:
+        # 완전히 빈 행은 건너뜁니다 (pandas와 동일)
+        if all(value is None for value in row):
+            continue
+        # 헤더보다 짧거나 긴 행은 헤더 길이에 맞춥니다
+        row = tuple(row[:len(columns)]) + (None,) * (len(columns) - len(row))
+        buffer.append(row)
+        if len(buffer) >= chunk_size:
+            yield pd.DataFrame(buffer, columns=columns)
+            buffer = []
+
+    if buffer:
+        yield pd.DataFrame(buffer, columns=columns)
+
+
+def iter_workbook_chunks(file_path, sheet_filter=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    워크북의 시트들을 순서대로 조금씩 읽는 함수
+    sheet_filter를 통과하지 못한 시트는 데이터를 읽기 전에 건너뜁니다
+
+    Args:
+        file_path (str): 엑셀 파일 경로 (.xlsx)
+        sheet_filter (callable, optional): 시트 이름을 받아 처리 여부를 돌려주는 함수
+        chunk_size (int): 한 번에 읽을 행 수
+
+    Returns:
+        iterator: (시트 이름, 데이터프레임 조각 iterator) 튜플. 건너뛴 시트는 iterator가 None
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet_name in workbook.sheetnames:
+            if sheet_filter is not None and not sheet_filter(sheet_name):
+                yield sheet_name, None
+                continue
+            yield sheet_name, iter_sheet_chunks(workbook[sheet_name], chunk_size)
+    finally:
+        workbook.close()
+
+
+def read_sheet_headers(file_path):
+    """
+    워크북의 모든 시트에서 첫 행(컬럼 이름)만 읽는 함수
+    데이터 행은 읽지 않으므로 큰 파일도 금방 끝납니다
+
+    Args:
+        file_path (str): 엑셀 파일 경로 (.xlsx 또는 .xls)
+
+    Returns:
+        dict: {시트 이름: 컬럼 이름 목록}
+    """
+    if file_path.lower().endswith('.xls'):
+        # openpyxl은 .xls 파일을 읽지 못하므로 pandas로 헤더만 읽습니다
+        sheets = pd.read_excel(file_path, sheet_name=None, nrows=0)
+        return {name: list(df.columns) for name, df in sheets.items()}
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        headers = {}
+        for sheet_name in workbook.sheetnames:
+            header = next(workbook[sheet_name].iter_rows(max_row=1, values_only=True), None)
+            headers[sheet_name] = _make_header(header) if header is not None else []
+        return headers
+    finally:
+        workbook.close()
+
+
+def prefetch(iterable, depth=2):
+    """
+    다른 스레드에서 미리 읽어두면서 값을 돌려주는 함수
+    읽기와 포맷팅이 동시에 진행되고, 미리 읽는 양은 depth개로 제한됩니다
+
+    Args:
+        iterable: 읽어올 iterator
+        depth (int): 미리 읽어둘 최대 개수
+
+    Returns:
+        iterator: 원래 iterator와 같은 값들
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        # 소비하는 쪽이 멈추면 대기 중인 스레드도 끝낼 수 있도록 나눠서 기다립니다
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except Exception as e:
+            put((done, e))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,181 @@
+# 포맷팅된 시트를 파일로 쓰는 도구들
+import csv
+import os
+import pandas as pd
+from compressed_io import open_text_output
+
+# 사용할 수 있는 저장 방식
+# - pandas: 기본 pd.ExcelWriter (워크북 전체를 메모리에 올린 뒤 저장)
+# - xlsxwriter: constant_memory 모드로 행 단위 스트리밍 저장
+# - openpyxl: write_only 모드로 행 단위 스트리밍 저장
+# - csv: 엑셀 대신 시트마다 CSV 파일 하나씩 저장
+WRITER_BACKENDS = ('pandas', 'xlsxwriter', 'openpyxl', 'csv')
+
+
+def iter_sheet_rows(df):
+    """
+    데이터프레임의 행을 엑셀에 바로 쓸 수 있는 튜플로 바꿔주는 함수
+    NaN/NaT 같은 빈 값은 None(빈 셀)으로 바꿉니다
+
+    Args:
+        df (pandas.DataFrame): 저장할 데이터프레임
+
+    Returns:
+        iterator: 행 값 튜플
+    """
+    values = df.astype(object)
+    values = values.where(pd.notna(values), None)
+    return values.itertuples(index=False, name=None)
+
+
+class SheetWriter:
+    """
+    시트를 순서대로, 청크 단위로 저장하는 클래스
+
+    같은 시트에 여러 번 write_chunk를 호출하면 이어서 저장하고,
+    헤더(컬럼 이름)는 시트마다 처음 한 번만 씁니다.
+    시트는 한 번에 하나씩 순서대로 써야 합니다.
+    """
+
+    def __init__(self, output_path, backend='pandas', compression=None):
+        """
+        Args:
+            output_path (str): 저장할 엑셀 파일 경로 (csv 방식이면 CSV들을 담을 폴더 경로)
+            backend (str): 저장 방식 (WRITER_BACKENDS 중 하나)
+            compression (str, optional): csv 방식에서 'gzip'이면 시트마다 .csv.gz로 압축해서 저장
+        """
+        if backend not in WRITER_BACKENDS:
+            raise ValueError(f"❌ 지원하지 않는 저장 방식입니다: {backend}")
+
+        self.output_path = output_path
+        self.backend = backend
+        self.compression = compression
+        self.current_sheet = None
+        self.rows_written = 0
+        self.finished_sheets = []
+
+        self._book = None
+        self._sheet = None
+        self._header_format = None
+        self._csv_file = None
+        self._csv_writer = None
+
+        if backend == 'pandas':
+            self._book = pd.ExcelWriter(output_path)
+        elif backend == 'xlsxwriter':
+            import xlsxwriter
+            self._book = xlsxwriter.Workbook(output_path, {
+                'constant_memory': True,
+                'nan_inf_to_errors': True,
+                'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+            })
+            # pandas 기본 헤더 스타일과 동일하게 맞춥니다
+            self._header_format = self._book.add_format({
+                'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'
+            })
+        elif backend == 'openpyxl':
+            from openpyxl import Workbook
+            from openpyxl.styles import Alignment, Border, Font, Side
+            self._book = Workbook(write_only=True)
+            thin = Side(style='thin')
+            self._header_style = {
+                'font': Font(bold=True),
+                'border': Border(left=thin, right=thin, top=thin, bottom=thin),
+                'alignment': Alignment(horizontal='center', vertical='top'),
+            }
+        else:
+            os.makedirs(output_path, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _start_sheet(self, sheet_name, columns):
+        """새 시트를 만들고 헤더를 한 번만 씁니다"""
+        self._finish_sheet()
+        self.current_sheet = sheet_name
+        self.rows_written = 0
+        header = [str(col) for col in columns]
+
+        if self.backend == 'xlsxwriter':
+            self._sheet = self._book.add_worksheet(sheet_name)
+            self._sheet.write_row(0, 0, header, self._header_format)
+        elif self.backend == 'openpyxl':
+            from openpyxl.cell import WriteOnlyCell
+            self._sheet = self._book.create_sheet(title=sheet_name)
+            header_cells = []
+            for name in header:
+                cell = WriteOnlyCell(self._sheet, value=name)
+                cell.font = self._header_style['font']
+                cell.border = self._header_style['border']
+                cell.alignment = self._header_style['alignment']
+                header_cells.append(cell)
+            self._sheet.append(header_cells)
+        elif self.backend == 'csv':
+            extension = '.csv.gz' if self.compression == 'gzip' else '.csv'
+            csv_path = os.path.join(self.output_path, f"{sheet_name}{extension}")
+            self._csv_file = open_text_output(csv_path, self.compression)
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(header)
+
+    def _finish_sheet(self):
+        """현재 시트 쓰기를 마무리합니다"""
+        if self.current_sheet is None:
+            return
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+        self.finished_sheets.append(self.current_sheet)
+        self.current_sheet = None
+        self._sheet = None
+
+    def write_chunk(self, sheet_name, df):
+        """
+        데이터프레임 한 덩어리를 시트에 이어서 저장하는 함수
+
+        Args:
+            sheet_name (str): 저장할 시트 이름
+            df (pandas.DataFrame): 저장할 데이터
+        """
+        if sheet_name != self.current_sheet:
+            if sheet_name in self.finished_sheets:
+                raise ValueError(f"❌ 이미 저장이 끝난 시트입니다: {sheet_name}")
+            self._start_sheet(sheet_name, df.columns)
+            if self.backend == 'pandas':
+                df.to_excel(self._book, sheet_name=sheet_name, index=False)
+                self.rows_written = len(df)
+                return
+
+        if self.backend == 'pandas':
+            # 헤더 아래(1행)부터 이미 쓴 행 수만큼 내려서 이어 씁니다
+            df.to_excel(self._book, sheet_name=sheet_name, index=False,
+                        header=False, startrow=self.rows_written + 1)
+        elif self.backend == 'xlsxwriter':
+            row_index = self.rows_written + 1
+            for row in iter_sheet_rows(df):
+                self._sheet.write_row(row_index, 0, row)
+                row_index += 1
+        elif self.backend == 'openpyxl':
+            for row in iter_sheet_rows(df):
+                self._sheet.append(row)
+        else:
+            self._csv_writer.writerows(iter_sheet_rows(df))
+
+        self.rows_written += len(df)
+
+    def close(self):
+        """남은 시트를 마무리하고 파일을 저장합니다"""
+        self._finish_sheet()
+        if self._book is None:
+            return
+        if self.backend == 'pandas':
+            self._book.close()
+        elif self.backend == 'xlsxwriter':
+            self._book.close()
+        elif self.backend == 'openpyxl':
+            self._book.save(self.output_path)
+        self._book = None
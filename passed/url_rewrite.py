@@ -0,0 +1,211 @@
+# bubble.io 등 원본 파일 URL을 새 저장소 URL로 바꾸는 도구
+import re
+from urllib.parse import unquote
+import numpy as np
+import pandas as pd
+
+# 변환된 URL의 기본 형식 (S3 버킷)
+S3_URL_TEMPLATE = 'https://{bucket}.s3.ap-northeast-2.amazonaws.com/{prefix}'
+
+# bubble.io에서 옮긴 파일이 있는 S3 버킷
+DEFAULT_BUCKET = 'plpl-file-from-bubble'
+
+# bubble.io 파일 호스트 패턴 (예: abcd.cdn.bubble.io, bubble.io)
+BUBBLE_HOST_PATTERN = r'(?:[\w-]+\.)*bubble\.io'
+
+# 기본 변환 규칙 - 위에서부터 순서대로 확인하고 처음 맞는 규칙을 사용합니다
+# - host: 원본 호스트 정규식 (경로 앞부분까지 포함할 수 있음, 예: r's3\.amazonaws\.com/appforest_uf')
+# - bucket: 대상 버킷 이름
+# - prefix: 대상 경로 앞에 붙일 폴더 (선택)
+# - url_template: 대상 URL 형식 (선택, 기본값 S3_URL_TEMPLATE)
+# - tables / columns: 이 규칙을 적용할 테이블/컬럼 목록 (선택, 없으면 모든 테이블/컬럼)
+DEFAULT_REWRITE_RULES = [
+    {'host': BUBBLE_HOST_PATTERN, 'bucket': DEFAULT_BUCKET},
+]
+
+# URL 변환 결과 캐시의 최대 크기
+DEFAULT_CACHE_SIZE = 1_000_000
+
+
+def rules_from_bucket_configs(bucket_configs, host=BUBBLE_HOST_PATTERN, url_template=S3_URL_TEMPLATE,
+                              bucket=DEFAULT_BUCKET):
+    """
+    BUCKET_CONFIGS 설정으로 테이블/컬럼별 변환 규칙을 만드는 함수
+    BUCKET_CONFIGS의 'name'은 Supabase 스토리지 버킷 이름이라 S3 버킷으로 쓰지 않고,
+    모든 컬럼을 bucket 아래 'path' 폴더로 보냅니다
+    예시: album.cover의 '//x.cdn.bubble.io/f1/a.jpg'
+        -> 'https://plpl-file-from-bubble.s3.ap-northeast-2.amazonaws.com/album/f1/a.jpg'
+
+    Args:
+        bucket_configs (dict): formatter_config.BUCKET_CONFIGS 형식의 설정
+        host (str): 원본 호스트 정규식
+        url_template (str): 대상 URL 형식
+        bucket (str): 대상 S3 버킷 이름
+
+    Returns:
+        list: 변환 규칙 목록
+    """
+    rules = []
+    for table_name, columns in bucket_configs.items():
+        for column_name, config in columns.items():
+            rules.append({
+                'host': host,
+                'bucket': bucket,
+                'prefix': config.get('path', ''),
+                'url_template': url_template,
+                'tables': [table_name],
+                'columns': [column_name],
+            })
+    return rules
+
+
+class UrlRewriter:
+    """
+    변환 규칙 표를 컬럼 전체에 한 번에 적용하는 클래스
+
+    - 같은 URL은 한 번만 변환합니다 (pd.factorize + 결과 캐시)
+    - 컬럼별로 적용되는 규칙들을 하나의 정규식으로 묶어 pandas 문자열 연산으로 처리합니다
+    """
+
+    def __init__(self, rules=None, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            rules (list, optional): 변환 규칙 목록 (기본값 DEFAULT_REWRITE_RULES)
+            cache_size (int, optional): 변환 결과 캐시의 최대 크기
+        """
+        self.rules = list(DEFAULT_REWRITE_RULES if rules is None else rules)
+        self.cache_size = cache_size
+        self._bases = []
+        for rule in self.rules:
+            prefix = rule.get('prefix', '') or ''
+            if prefix and not prefix.endswith('/'):
+                prefix += '/'
+            template = rule.get('url_template', S3_URL_TEMPLATE)
+            self._bases.append(template.format(bucket=rule['bucket'], prefix=prefix))
+        self._patterns = {}
+        self._cache = {}
+
+    def _rules_for(self, column=None, table=None):
+        """컬럼/테이블에 적용되는 규칙 번호들"""
+        selected = []
+        for i, rule in enumerate(self.rules):
+            if rule.get('tables') and table not in rule['tables']:
+                continue
+            if rule.get('columns') and column not in rule['columns']:
+                continue
+            selected.append(i)
+        return tuple(selected)
+
+    def _pattern_for(self, rule_ids):
+        """규칙들을 하나로 묶은 정규식 (규칙 조합별로 한 번만 컴파일)"""
+        if rule_ids not in self._patterns:
+            hosts = '|'.join(f"(?P<r{i}>{self.rules[i]['host']})" for i in rule_ids)
+            self._patterns[rule_ids] = re.compile(
+                rf'^\s*(?:https?:)?(?://)?(?:{hosts})/(?P<path>.*?)\s*$',
+                re.IGNORECASE
+            )
+        return self._patterns[rule_ids]
+
+    def _rewrite_unique(self, values, rule_ids):
+        """
+        중복 없는 URL 값들을 변환하는 함수
+
+        Returns:
+            numpy.ndarray: 변환된 URL (규칙에 맞지 않으면 None)
+        """
+        pattern = self._pattern_for(rule_ids)
+        decoded = pd.Series([unquote(v) for v in values], dtype=object)
+        matches = decoded.str.extract(pattern)
+
+        group_columns = [f"r{i}" for i in rule_ids]
+        matched = matches[group_columns].notna().to_numpy()
+        has_match = matched.any(axis=1)
+
+        # 처음 맞은 규칙의 대상 주소 + 경로
+        first_rule = np.array(rule_ids)[matched.argmax(axis=1)]
+        bases = np.array(self._bases, dtype=object)[first_rule]
+        result = np.full(len(values), None, dtype=object)
+        result[has_match] = bases[has_match] + matches['path'].to_numpy(dtype=object)[has_match]
+        return result
+
+    def rewrite_series(self, series, column=None, table=None):
+        """
+        컬럼 하나의 URL을 변환하는 함수
+
+        Args:
+            series (pandas.Series): 변환할 컬럼
+            column (str, optional): 컬럼 이름 (컬럼별 규칙 선택용)
+            table (str, optional): 테이블 타입 (테이블별 규칙 선택용)
+
+        Returns:
+            tuple: (변환된 pandas.Series, 변환된 값 개수)
+        """
+        rule_ids = self._rules_for(column, table)
+        if not rule_ids or len(series) == 0:
+            return series, 0
+
+        codes, uniques = pd.factorize(series)
+        uniques = np.asarray(uniques, dtype=object)
+        rewritten = np.full(len(uniques), None, dtype=object)
+
+        # 캐시에 없는 문자열만 새로 변환합니다
+        missing = []
+        for i, value in enumerate(uniques):
+            if not isinstance(value, str):
+                continue
+            cached = self._cache.get((rule_ids, value), False)
+            if cached is False:
+                missing.append(i)
+            else:
+                rewritten[i] = cached
+
+        if missing:
+            missing_values = uniques[missing]
+            results = self._rewrite_unique(missing_values, rule_ids)
+            rewritten[missing] = results
+            if len(self._cache) + len(missing) > self.cache_size:
+                self._cache.clear()
+            self._cache.update(zip(((rule_ids, v) for v in missing_values), results))
+
+        changed = np.zeros(len(series), dtype=bool)
+        valid = codes >= 0
+        changed[valid] = pd.notna(rewritten)[codes[valid]]
+        if not changed.any():
+            return series, 0
+
+        values = series.to_numpy(dtype=object, copy=True)
+        values[changed] = rewritten[codes[changed]]
+        return pd.Series(values, index=series.index, name=series.name), int(changed.sum())
+
+    def rewrite_frame(self, df, columns=None, table=None):
+        """
+        데이터프레임의 URL 컬럼들을 변환하는 함수
+
+        Args:
+            df (pandas.DataFrame): 변환할 데이터프레임
+            columns (list, optional): 변환할 컬럼 목록 (없으면 문자열 컬럼 전체)
+            table (str, optional): 테이블 타입 (테이블별 규칙 선택용)
+
+        Returns:
+            tuple: (변환된 pandas.DataFrame, {컬럼 이름: 변환된 값 개수})
+        """
+        if columns is None:
+            columns = [
+                col for col in df.columns
+                if df[col].dtype == object or pd.api.types.is_string_dtype(df[col])
+            ]
+
+        counts = {}
+        for col in columns:
+            new_values, count = self.rewrite_series(df[col], column=col, table=table)
+            if count:
+                df[col] = new_values
+                counts[col] = count
+        return df, counts
+
+    def rewrite_value(self, value, column=None, table=None):
+        """
+        URL 하나를 변환하는 함수 (규칙에 맞지 않으면 그대로 돌려줍니다)
+        """
+        new_values, _ = self.rewrite_series(pd.Series([value], dtype=object), column=column, table=table)
+        return new_values.iloc[0]
@@ -0,0 +1,127 @@
+# 변환된 UUID에서 원래 Bubble 값을 찾는 역방향 색인 (SQLite)
+# generate_uuid_from_text는 되돌릴 수 없는 SHA-1이므로, 포맷팅할 때 (UUID → 원래 값)을 함께 저장해둡니다
+# 같은 색인 파일에 여러 번 실행한 결과가 계속 합쳐집니다
+import os
+import sqlite3
+from datetime import datetime
+
+# 역방향 색인 기본 파일 이름 (출력 폴더에 저장)
+UUID_INDEX_NAME = 'uuid_index.db'
+
+class UuidIndex:
+    """
+    UUID → (원래 값, 테이블, 컬럼, 파일) 역방향 색인
+
+    - 같은 텍스트는 어느 컬럼에서 나와도 같은 UUID가 되므로 (UUID, 테이블, 컬럼)을 기본 키로 둡니다
+    - 기본 키 색인으로 찾으므로 색인이 커도 한 번 찾는 데 몇 밀리초면 됩니다
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): 색인 파일 경로 (없으면 새로 만듦)
+        """
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS uuids (
+                uuid TEXT NOT NULL,
+                table_type TEXT NOT NULL,
+                column_name TEXT NOT NULL,
+                source TEXT NOT NULL,
+                file TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (uuid, table_type, column_name)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+    def add(self, table_type, df, uuid_columns, file=None):
+        """
+        포맷팅된 조각 하나의 (UUID → 원래 값)을 색인에 더하는 함수
+        UUID는 다시 계산하지 않고 포맷팅 결과 컬럼에서 그대로 가져옵니다
+
+        Args:
+            table_type (str): 테이블 타입
+            df (pandas.DataFrame): 포맷팅된 데이터프레임
+            uuid_columns (dict): {변환된 컬럼: 원래 컬럼} (TABLE_CONFIGS의 uuid_columns)
+            file (str, optional): 원본 파일 이름
+
+        Returns:
+            int: 더한 항목 수
+        """
+        updated_at = datetime.now().isoformat(timespec='seconds')
+        entries = []
+        for new_col, old_col in uuid_columns.items():
+            if new_col not in df.columns or old_col not in df.columns:
+                continue
+            pairs = df[[old_col, new_col]].drop_duplicates()
+            for source, formatted in pairs.itertuples(index=False, name=None):
+                # 쉼표로 구분된 값은 값마다 UUID가 만들어지므로 하나씩 나눠서 저장합니다
+                sources = [value.strip() for value in str(source).split(',') if value.strip()]
+                uuids = [value.strip() for value in str(formatted).split(',') if value.strip()]
+                for value, uuid in zip(sources, uuids):
+                    entries.append((uuid, table_type, old_col, value, file, updated_at))
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO uuids (uuid, table_type, column_name, source, file, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                entries
+            )
+        return len(entries)
+
+    def lookup(self, uuid):
+        """
+        UUID 하나의 원래 값을 찾는 함수
+
+        Args:
+            uuid (str): 찾을 UUID
+
+        Returns:
+            list: 찾은 항목 목록 (dict: uuid, table_type, column, source, file, updated_at)
+        """
+        rows = self._conn.execute(
+            "SELECT uuid, table_type, column_name, source, file, updated_at FROM uuids WHERE uuid = ?",
+            (uuid.strip().lower(),)
+        ).fetchall()
+        names = ('uuid', 'table_type', 'column', 'source', 'file', 'updated_at')
+        return [dict(zip(names, row)) for row in rows]
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM uuids").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+if __name__ == "__main__":
+    # 색인 파일 경로 입력 받기 (비워두면 현재 폴더의 uuid_index.db)
+    index_path = input(f"색인 파일 경로를 입력하세요 (기본값: {UUID_INDEX_NAME}): ").strip() or UUID_INDEX_NAME
+    if not os.path.exists(index_path):
+        print(f"❌ 색인 파일이 없습니다: {index_path}")
+    else:
+        with UuidIndex(index_path) as index:
+            print(f"📁 색인 항목 {len(index)}개")
+            while True:
+                try:
+                    uuid = input("\n찾을 UUID를 입력하세요 (끝내려면 Enter): ").strip()
+                except EOFError:
+                    break
+                if not uuid:
+                    break
+                results = index.lookup(uuid)
+                if not results:
+                    print("❌ 색인에 없는 UUID입니다")
+                for result in results:
+                    print(f"🔍 {result['table_type']}.{result['column']} = {result['source']} "
+                          f"(파일: {result['file']}, {result['updated_at']})")
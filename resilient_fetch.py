@@ -0,0 +1,213 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from passed.rate_limit import HostRateLimiter
+from passed.event_log import default_log
+
+# 연결/응답 대기 제한 시간(초)
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 60
+
+# 실패 시 재시도 횟수
+MAX_RETRIES = 5
+
+# 재시도 대기 시간(초): BACKOFF_BASE * 2^시도횟수 (최대 BACKOFF_MAX) + 지터
+BACKOFF_BASE = 1
+BACKOFF_MAX = 60
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 호스트별 초당 최대 요청 수
+PER_HOST_RATE = 10
+
+# 연속 실패가 이 횟수를 넘으면 해당 호스트 요청을 잠시 멈춥니다
+BREAKER_THRESHOLD = 5
+
+# 호스트 요청을 멈추는 시간(초)
+BREAKER_COOLDOWN = 60
+
+class FetchError(Exception):
+    """
+    재시도 후에도 요청이 실패했을 때 발생하는 예외
+
+    Attributes:
+        status (int): 마지막 HTTP 상태 코드 (연결 오류면 None)
+        retryable (bool): 나중에 다시 시도하면 성공할 수도 있는 오류인지 여부
+        attempts (int): 시도한 횟수
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None, retryable: bool = False,
+                 attempts: int = 1):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.attempts = attempts
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After 헤더 값을 대기 시간(초)으로 바꾸는 함수
+
+    Args:
+        value (str): 초 단위 숫자 또는 HTTP 날짜
+
+    Returns:
+        float: 대기 시간(초). 해석할 수 없으면 None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, maximum: float = BACKOFF_MAX) -> float:
+    """
+    지수 백오프 + 지터 대기 시간(초)을 계산하는 함수 (full jitter)
+    """
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
+
+class CircuitBreaker:
+    """
+    호스트별 서킷 브레이커
+
+    연속으로 threshold번 실패한 호스트는 cooldown초 동안 요청을 멈추고,
+    그 뒤 요청 하나가 다시 실패하면 곧바로 다시 멈춥니다.
+    멈출 때마다 log(EventLog)에 경고를 남깁니다.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN, log=None):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.log = log if log is not None else default_log
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str):
+        """호스트가 멈춰 있으면 풀릴 때까지 기다립니다"""
+        while True:
+            with self._lock:
+                remaining = self._open_until.get(host, 0) - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def record_success(self, host: str):
+        with self._lock:
+            self._failures[host] = 0
+
+    def record_failure(self, host: str):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            opened = failures >= self.threshold
+            if opened:
+                self._open_until[host] = time.monotonic() + self.cooldown
+                # 쿨다운 뒤 한 번만 더 실패해도 다시 멈추도록 합니다
+                self._failures[host] = self.threshold - 1
+        if opened:
+            self.log.warning(f"⏸️ {host} 요청이 계속 실패해서 {self.cooldown:.0f}초 동안 멈춥니다",
+                             item=host, cooldown=self.cooldown)
+
+class ResilientFetcher:
+    """
+    타임아웃, 재시도(지수 백오프 + 지터, Retry-After), 호스트별 속도 제한,
+    서킷 브레이커를 갖춘 요청 도구
+
+    여러 스레드에서 함께 쓸 수 있으며, 스레드마다 연결을 재사용하는 세션을 둡니다.
+    """
+
+    def __init__(self, connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT,
+                 max_retries: int = MAX_RETRIES, per_host_rate: float = PER_HOST_RATE,
+                 breaker_threshold: int = BREAKER_THRESHOLD, breaker_cooldown: float = BREAKER_COOLDOWN,
+                 pool_size: int = 16, log=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.limiter = HostRateLimiter(per_host_rate)
+        # 호스트를 멈춘 기록은 log(EventLog, 없으면 기본 로그)에 남깁니다
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown, log)
+        self.pool_size = pool_size
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """현재 스레드의 세션"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        재시도와 속도 제한을 적용해서 요청을 보내는 함수
+
+        Args:
+            method (str): HTTP 메서드
+            url (str): 요청할 URL
+            **kwargs: requests에 넘길 옵션 (stream, headers 등)
+
+        Returns:
+            requests.Response: 성공한 응답 (fetch_attempts 속성에 시도 횟수 기록)
+
+        Raises:
+            FetchError: 재시도 후에도 실패한 경우
+        """
+        host = urlsplit(url).netloc.lower()
+        kwargs.setdefault('timeout', self.timeout)
+        last_error = None
+        last_status = None
+
+        for attempt in range(self.max_retries + 1):
+            self.breaker.wait(host)
+            self.limiter.acquire(url)
+            retry_after = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = f"연결 오류: {e}"
+                last_status = None
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success(host)
+                    if response.status_code >= 400:
+                        response.close()
+                        raise FetchError(f"HTTP {response.status_code}", response.status_code,
+                                         retryable=False, attempts=attempt + 1)
+                    response.fetch_attempts = attempt + 1
+                    return response
+                last_status = response.status_code
+                last_error = f"HTTP {response.status_code}"
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                response.close()
+
+            self.breaker.record_failure(host)
+            if attempt < self.max_retries:
+                delay = retry_after if retry_after is not None else backoff_delay(attempt)
+                time.sleep(min(delay, BACKOFF_MAX * 5))
+
+        raise FetchError(f"{last_error} ({self.max_retries + 1}회 시도)", last_status,
+                         retryable=True, attempts=self.max_retries + 1)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('HEAD', url, **kwargs)
@@ -0,0 +1,11 @@
+# passed 폴더의 모듈은 같은 폴더의 다른 모듈을 바로 import하고 (예: from formatter_config import ...),
+# 저장소 루트의 스크립트는 passed 폴더의 공용 모듈(url_rewrite, rate_limit, event_log 등)을
+# `from passed.url_rewrite import ...`처럼 불러옵니다. 공용 모듈은 passed 폴더의 다른 모듈을 import하지 않으므로
+# 어느 쪽에서든 쓸 수 있습니다. 테스트는 두 방식을 모두 쓰므로 저장소 루트와 passed 폴더를 모두 import 경로에 넣습니다
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, 'passed')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
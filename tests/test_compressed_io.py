@@ -0,0 +1,57 @@
+import gzip
+import zipfile
+import pandas as pd
+from compressed_io import (ParallelGzipWriter, list_zip_members, open_zip_member, open_text_output,
+                           split_extension, zip_sheet_names)
+
+
+def test_split_extension():
+    assert split_extension('album.csv.gz') == ('.csv', 'gzip')
+    assert split_extension('export.ZIP') == ('.zip', 'zip')
+    assert split_extension('a.xlsx') == ('.xlsx', None)
+
+
+def test_zip_sheet_names_dedupe_truncated_names():
+    long_name = 'settlement_melon_export_2024_january'
+    members = [f"a/{long_name}_part1.csv", f"b/{long_name}_part2.csv.gz", 'Album.csv', 'dir/album.csv']
+    names = [sheet for _, sheet in zip_sheet_names(members)]
+    assert names == [long_name[:31], long_name[:29] + '_2', 'Album', 'album_2']
+    assert all(len(name) <= 31 for name in names)
+
+
+def test_open_zip_member_closes_everything(tmp_path):
+    zip_path = tmp_path / 'export.zip'
+    with zipfile.ZipFile(zip_path, 'w') as archive:
+        archive.writestr('album.csv', 'unique id\na\nb\n')
+        archive.writestr('track.csv.gz', gzip.compress(b'unique id\nc\n'))
+        archive.writestr('__MACOSX/._album.csv', 'x')
+
+    assert list_zip_members(zip_path) == ['album.csv', 'track.csv.gz']
+    with open_zip_member(zip_path, 'track.csv.gz') as handle:
+        assert list(pd.read_csv(handle)['unique id']) == ['c']
+        inner = (handle._gzip, handle._member, handle._archive)
+    assert handle.closed
+    assert inner[0].closed and inner[1].closed and inner[2].fp is None
+
+    with open_zip_member(zip_path, 'album.csv') as handle:
+        chunks = list(pd.read_csv(handle, chunksize=1))
+    assert [len(chunk) for chunk in chunks] == [1, 1]
+
+
+def test_parallel_gzip_output_round_trips(tmp_path):
+    # 작은 블록으로 나눠 여러 gzip 멤버로 써도 하나의 gzip 파일로 읽힙니다
+    path = tmp_path / 'blocks.gz'
+    data = ''.join(f"row{i},값{i}\n" for i in range(1000)).encode('utf-8')
+    with ParallelGzipWriter(str(path), block_size=64, workers=4) as writer:
+        for start in range(0, len(data), 100):
+            writer.write(data[start:start + 100])
+    assert gzip.decompress(path.read_bytes()) == data
+
+    text_path = tmp_path / 'out.csv.gz'
+    with open_text_output(str(text_path), 'gzip') as f:
+        f.write('unique_id\n가\n')
+    assert pd.read_csv(text_path)['unique_id'].tolist() == ['가']
+
+    empty = tmp_path / 'empty.csv.gz'
+    open_text_output(str(empty), 'gzip').close()
+    assert gzip.decompress(empty.read_bytes()) == b''
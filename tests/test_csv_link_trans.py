@@ -0,0 +1,13 @@
+from csv_link_trans import build_rewriter, process_chunks, process_csv
+
+
+def test_empty_csv_is_reported_as_empty(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    empty = tmp_path / 'album.csv'
+    empty.write_bytes(b'')
+
+    assert process_chunks(str(empty), str(tmp_path / 'out.csv'), build_rewriter()) == ({}, 0)
+    process_csv(str(empty))
+
+    assert 'CSV 파일이 비어있습니다' in capsys.readouterr().out
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['album.csv']
@@ -0,0 +1,19 @@
+import hashlib
+import io
+import pytest
+from download_archive import ArchiveWriter
+from download_manifest import ManifestWriter, verify_local
+
+
+@pytest.mark.parametrize('fmt', ['tar', 'zip'])
+def test_verify_local_reads_archived_files_through_index(tmp_path, fmt):
+    files = {'album/a.jpg': b'a' * 1500, 'album/b.jpg': b'b'}
+    with ArchiveWriter(str(tmp_path), 'album', fmt) as archive, \
+            ManifestWriter(str(tmp_path / 'manifest.jsonl')) as manifest:
+        for path, data in files.items():
+            archive.add(path, io.BytesIO(data), len(data))
+            manifest.add(path, 'https://x.bubble.io/' + path, len(data), hashlib.sha256(data).hexdigest())
+        manifest.add('album/c.jpg', 'https://x.bubble.io/album/c.jpg', 1, hashlib.sha256(b'c').hexdigest())
+
+    results = {r['path']: r['problem'] for r in verify_local(str(tmp_path / 'manifest.jsonl'))}
+    assert results == {'album/a.jpg': None, 'album/b.jpg': None, 'album/c.jpg': 'missing'}
@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+from duplicate_check import DuplicateChecker, DUPLICATE_POLICY, DUPLICATE_REPORT
+
+
+def frame(ids):
+    return pd.DataFrame({'unique_id': ids, 'value': range(len(ids))})
+
+
+def test_default_policy_only_reports():
+    assert DUPLICATE_POLICY == DUPLICATE_REPORT
+    checker = DuplicateChecker()
+    result = checker.filter(frame(['a', 'b', 'a']))
+    result = pd.concat([result, checker.filter(frame(['b', 'c']))])
+    assert len(result) == 5
+    assert checker.duplicates == 2
+    assert checker.samples == ['a', 'b']
+
+
+def test_keep_first_drops_across_chunks():
+    checker = DuplicateChecker('keep_first')
+    first = checker.filter(frame(['a', 'b', 'a']))
+    second = checker.filter(frame(['b', 'c']))
+    assert list(first['unique_id']) + list(second['unique_id']) == ['a', 'b', 'c']
+
+
+def test_side_file_writes_dropped_rows(tmp_path):
+    side_path = tmp_path / 'dups.csv'
+    with DuplicateChecker('side_file', str(side_path)) as checker:
+        result = checker.filter(frame(['a', 'a', 'b']))
+    assert list(result['unique_id']) == ['a', 'b']
+    assert list(pd.read_csv(side_path)['value']) == [1]
+
+
+def test_fail_raises():
+    with pytest.raises(ValueError):
+        DuplicateChecker('fail').filter(frame(['a', 'a']))
@@ -0,0 +1,140 @@
+import asyncio
+import csv
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+import link_mapping
+from link_mapping import SupabaseStorage, get_next_file_number, process_csv, transfer_files
+
+# 다운로드 원본으로 쓸 파일 (여러 조각으로 나눠 보내지도록 CHUNK_SIZE보다 크게)
+FILES = {
+    'a.jpg': b'a' * (link_mapping.CHUNK_SIZE * 3 + 7),
+    'b.png': b'b' * 100,
+    '로고.png': b'c' * 10,
+}
+
+
+class FakeBackend:
+    """bubble.io 다운로드와 Supabase 스토리지 업로드를 함께 흉내 내는 로컬 서버"""
+
+    def __init__(self):
+        self.uploads = []
+        self.requests = []
+        self.app = web.Application()
+        self.app.router.add_get('/cdn.bubble.io/{name}', self.download)
+        self.app.router.add_route('*', '/storage/v1/object/{bucket}/{path:.*}', self.storage)
+
+    async def download(self, request):
+        name = request.match_info['name']
+        if name not in FILES:
+            raise web.HTTPNotFound()
+        response = web.StreamResponse()
+        response.content_type = 'application/octet-stream'
+        await response.prepare(request)
+        body = FILES[name]
+        for start in range(0, len(body), 1000):
+            await response.write(body[start:start + 1000])
+        await response.write_eof()
+        return response
+
+    async def storage(self, request):
+        self.requests.append(request.method)
+        body = await request.read()
+        self.uploads.append({
+            'method': request.method,
+            'bucket': request.match_info['bucket'],
+            'path': request.match_info['path'],
+            'upsert': request.headers.get('x-upsert'),
+            'content_type': request.headers.get('content-type'),
+            'body': body,
+        })
+        return web.json_response({'Key': f"{request.match_info['bucket']}/{request.match_info['path']}"})
+
+
+@pytest.fixture(autouse=True)
+def reset_counters(monkeypatch):
+    monkeypatch.setattr(link_mapping, 'file_counters', {})
+
+
+def run_with_backend(test):
+    async def main():
+        backend = FakeBackend()
+        async with TestServer(backend.app) as server:
+            await test(backend, str(server.make_url('')).rstrip('/'))
+        return backend
+    return asyncio.run(main())
+
+
+def test_transfer_files_streams_each_file_with_single_upsert():
+    async def test(backend, base_url):
+        jobs = [{
+            'url': f"{base_url}/cdn.bubble.io/{name}",
+            'original_name': name,
+            'bucket_name': 'image',
+            'upload_path': f"label/{name}",
+            'mime_type': 'image/jpeg',
+        } for name in ('a.jpg', 'b.png', 'missing.jpg')]
+        async with aiohttp.ClientSession() as session:
+            storage = SupabaseStorage(session, base_url, 'test-key')
+            await transfer_files(jobs, session, storage, download_concurrency=2, upload_concurrency=2,
+                                 queue_size=1)
+
+        results = {job['original_name']: job for job in jobs}
+        assert results['a.jpg']['storage_path'] == 'image/label/a.jpg'
+        assert results['b.png']['storage_path'] == 'image/label/b.png'
+        assert 'error' in results['missing.jpg']
+        assert 'storage_path' not in results['missing.jpg']
+
+        # 파일마다 삭제 없이 x-upsert POST 요청 하나만 보냅니다
+        assert backend.requests == ['POST', 'POST']
+        uploads = {upload['path']: upload for upload in backend.uploads}
+        assert uploads['label/a.jpg']['body'] == FILES['a.jpg']
+        assert uploads['label/b.png']['body'] == FILES['b.png']
+        assert all(upload['upsert'] == 'true' for upload in backend.uploads)
+
+    run_with_backend(test)
+
+
+def test_process_csv_rewrites_urls_to_public_storage(tmp_path):
+    input_csv = tmp_path / 'label.csv'
+    output_csv = tmp_path / 'label_updated.csv'
+
+    async def test(backend, base_url):
+        with open(input_csv, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['name', 'logo'])
+            writer.writerow(['first', f"{base_url}/cdn.bubble.io/b.png"])
+            writer.writerow(['second', f"{base_url}/cdn.bubble.io/%EB%A1%9C%EA%B3%A0.png"])
+            writer.writerow(['third', ''])
+        await process_csv(str(input_csv), str(output_csv), storage_url=base_url, storage_key='test-key',
+                          download_concurrency=2, upload_concurrency=2)
+
+    backend = run_with_backend(test)
+
+    with open(output_csv, encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    base_url = rows[0]['logo'].split('/storage/')[0]
+    assert rows[0]['logo'] == f"{base_url}/storage/v1/object/public/image/label/b.png"
+    # 스토리지에서 쓸 수 없는 한글 이름은 테이블명_컬럼명_순번 이름으로 바꿉니다
+    assert rows[1]['logo'] == f"{base_url}/storage/v1/object/public/image/label/label_logo_1.png"
+    assert rows[2]['logo'] == ''
+    assert sorted(upload['path'] for upload in backend.uploads) == ['label/b.png', 'label/label_logo_1.png']
+    assert len(backend.requests) == 2
+
+
+def test_get_next_file_number_is_unique_under_concurrency():
+    start = threading.Barrier(8)
+
+    def take_numbers(_):
+        start.wait()
+        return [get_next_file_number('label', 'logo') for _ in range(500)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        numbers = [number for chunk in pool.map(take_numbers, range(8)) for number in chunk]
+
+    assert sorted(numbers) == list(range(1, 8 * 500 + 1))
+    # 다른 컬럼의 번호는 따로 셉니다
+    assert get_next_file_number('label', 'other') == 1
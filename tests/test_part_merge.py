@@ -0,0 +1,27 @@
+import os
+import pandas as pd
+import pytest
+from part_merge import group_parts, merge_parts
+from event_log import EventLog
+
+
+def test_group_parts_only_merges_numbered_parts_with_same_stem():
+    groups, others = group_parts(['album_2.csv', 'album_1.csv', 'label.csv', 'album_backup.csv',
+                                  'album.csv', 'album_backup_1.csv', 'notes_1.csv', 'notes_2.csv'])
+    assert groups == {('album', 'album'): ['album_1.csv', 'album_2.csv']}
+    assert sorted(others) == ['album.csv', 'album_backup.csv', 'album_backup_1.csv', 'label.csv',
+                              'notes_1.csv', 'notes_2.csv']
+
+
+def test_merge_parts_leaves_no_partial_output_on_failure(tmp_path):
+    pd.DataFrame({'unique id': ['a', 'b'], 'label': ['x', 'y']}).to_csv(tmp_path / 'album_1.csv', index=False)
+    pd.DataFrame({'unique id': ['a'], 'label': ['z']}).to_csv(tmp_path / 'album_2.csv', index=False)
+    parts = [str(tmp_path / 'album_1.csv'), str(tmp_path / 'album_2.csv')]
+
+    with pytest.raises(ValueError):
+        merge_parts(parts, chunk_size=1, duplicate_policy='fail', log=EventLog(console=None))
+    assert sorted(os.listdir(tmp_path)) == ['album_1.csv', 'album_2.csv']
+
+    output_path = merge_parts(parts, chunk_size=1, log=EventLog(console=None))
+    assert os.path.basename(output_path) == 'album_formatted.csv'
+    assert len(pd.read_csv(output_path)) == 3
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+from data_formatter import generate_uuid_from_text
+from formatter_config import DEFAULT_VALUE_MAPPING
+from reference_check import KeyIndex, ReferenceCollector, UUID_DTYPE
+
+
+def uuid(text):
+    return generate_uuid_from_text(text)
+
+
+def test_key_index_contains():
+    index = KeyIndex(np.array([uuid('b'), uuid('a'), uuid('b')], dtype=UUID_DTYPE))
+    values = np.array([uuid('a'), uuid('c'), uuid('b')], dtype=UUID_DTYPE)
+    assert len(index) == 2
+    assert list(index.contains(values)) == [True, False, True]
+    assert list(KeyIndex(np.empty(0, dtype=UUID_DTYPE)).contains(values)) == [False] * 3
+
+
+def test_default_fallbacks_are_not_dangling():
+    collector = ReferenceCollector()
+    collector.add('label', pd.DataFrame({'unique_id': [uuid('l1')]}))
+    default_uuid = uuid(DEFAULT_VALUE_MAPPING['label'])
+    collector.add('album', pd.DataFrame({
+        'unique_id': [uuid('a1'), uuid('a2'), uuid('a3')],
+        'label_formatted': [uuid('l1'), uuid('missing'), default_uuid],
+    }))
+
+    result, = collector.check()
+    assert result['references'] == 3
+    assert result['default_fallbacks'] == 1
+    assert result['dangling'] == 1
+    assert result['samples'] == [uuid('missing')]
@@ -0,0 +1,20 @@
+import event_log
+import passed.event_log
+from event_log import EventLog
+from resilient_fetch import CircuitBreaker
+
+
+def test_event_log_is_one_module_under_both_names():
+    assert event_log is passed.event_log
+    assert event_log.default_log is passed.event_log.default_log
+
+
+def test_breaker_logs_when_it_opens(capsys):
+    log = EventLog(console=None)
+    breaker = CircuitBreaker(threshold=2, cooldown=0, log=log)
+
+    breaker.record_failure('x.bubble.io')
+    breaker.record_failure('x.bubble.io')
+
+    assert log.counts['warning'] == 1
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,87 @@
+import os
+from result_cache import ResultCache, hash_config
+
+
+def make_output_path(output_dir, name):
+    counter = [0]
+
+    def make(extension):
+        counter[0] += 1
+        return os.path.join(output_dir, f"{name}_{counter[0]}{extension}")
+    return make
+
+
+def setup_entry(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    source = tmp_path / 'album.csv'
+    source.write_text('unique id\na\n', encoding='utf-8')
+    output_dir = tmp_path / 'out'
+    output_dir.mkdir()
+    output = output_dir / 'album_formatted.csv'
+    output.write_text('unique_id\nabc\n', encoding='utf-8')
+    key = cache.key(str(source), hash_config('test'))
+    cache.put(key, str(output), {'rows': 1})
+    return cache, key, output_dir, output
+
+
+def test_hit_copies_instead_of_linking(tmp_path):
+    cache, key, output_dir, output = setup_entry(tmp_path)
+    output.unlink()
+
+    path, meta = cache.get(key, str(output_dir), make_output_path(str(output_dir), 'album_formatted'))
+
+    assert meta == {'rows': 1}
+    assert os.stat(path).st_nlink == 1
+    # 돌려준 결과를 고쳐도 다음 캐시 결과는 그대로입니다
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('unique_id\nxyz\n')
+    again, _ = cache.get(key, str(output_dir), make_output_path(str(output_dir), 'album_again'))
+    assert again != path
+    assert open(again, encoding='utf-8').read() == 'unique_id\nabc\n'
+    cache.close()
+
+
+def test_existing_output_reused_only_when_content_matches(tmp_path):
+    cache, key, output_dir, output = setup_entry(tmp_path)
+    make = make_output_path(str(output_dir), 'album_formatted')
+
+    assert cache.get(key, str(output_dir), make)[0] == str(output)
+
+    # 크기가 같아도 내용이 바뀌었으면 새로 복사합니다
+    output.write_text('unique_id\nabd\n', encoding='utf-8')
+    path, _ = cache.get(key, str(output_dir), make)
+    assert path != str(output)
+    assert open(path, encoding='utf-8').read() == 'unique_id\nabc\n'
+    cache.close()
+
+
+def test_changed_cache_entry_is_dropped(tmp_path):
+    cache, key, output_dir, output = setup_entry(tmp_path)
+    output.unlink()
+    cached = tmp_path / 'cache' / 'results' / key / 'album_formatted.csv'
+    cached.write_text('unique_id\nzzz\n', encoding='utf-8')
+
+    assert cache.get(key, str(output_dir), make_output_path(str(output_dir), 'album_formatted')) is None
+    assert not cached.exists()
+    cache.close()
+
+
+def test_workbook_with_non_table_sheet_is_cached(tmp_path):
+    import pandas as pd
+    from data_formatter import format_data
+    from event_log import EventLog
+
+    workbook = tmp_path / 'wb.xlsx'
+    with pd.ExcelWriter(workbook) as writer:
+        pd.DataFrame({'unique id': ['a', 'b']}).to_excel(writer, sheet_name='label', index=False)
+        pd.DataFrame({'memo': ['x']}).to_excel(writer, sheet_name='notes', index=False)
+    cache = ResultCache(str(tmp_path / 'cache'))
+
+    outputs = []
+    for _ in range(2):
+        log = EventLog(console=None)
+        outputs.append(format_data(str(workbook), cache=cache, log=log))
+        assert not log.errors
+
+    assert outputs[0] == outputs[1] == str(tmp_path / 'wb_formatted.xlsx')
+    assert pd.ExcelFile(outputs[0]).sheet_names == ['label']
@@ -0,0 +1,35 @@
+import pandas as pd
+from url_rewrite import UrlRewriter, DEFAULT_REWRITE_RULES, rules_from_bucket_configs
+from formatter_config import BUCKET_CONFIGS
+
+
+def bucket_rewriter():
+    return UrlRewriter(rules_from_bucket_configs(BUCKET_CONFIGS) + DEFAULT_REWRITE_RULES)
+
+
+def test_bucket_configs_use_s3_bucket_with_path_prefix():
+    # BUCKET_CONFIGS의 'name'(Supabase 버킷)이 아니라 S3 버킷 아래 'path' 폴더로 보냅니다
+    url = bucket_rewriter().rewrite_value('//x.cdn.bubble.io/f1/a.jpg', column='cover', table='album')
+    assert url == 'https://plpl-file-from-bubble.s3.ap-northeast-2.amazonaws.com/album/f1/a.jpg'
+
+
+def test_bucket_configs_per_column_prefix():
+    rewriter = bucket_rewriter()
+    assert rewriter.rewrite_value('https://bubble.io/f2/b.mp3', column='mp3 (ar)', table='track') == \
+        'https://plpl-file-from-bubble.s3.ap-northeast-2.amazonaws.com/mp3/f2/b.mp3'
+    assert rewriter.rewrite_value('https://bubble.io/f3/c.png', column='imgprofile', table='user') == \
+        'https://plpl-file-from-bubble.s3.ap-northeast-2.amazonaws.com/profile-image/f3/c.png'
+
+
+def test_other_columns_fall_back_to_default_rule():
+    url = bucket_rewriter().rewrite_value('//x.cdn.bubble.io/f1/a.jpg', column='etc', table='album')
+    assert url == 'https://plpl-file-from-bubble.s3.ap-northeast-2.amazonaws.com/f1/a.jpg'
+
+
+def test_non_bubble_values_are_kept():
+    series = pd.Series(['https://example.com/a.jpg', None, '//x.cdn.bubble.io/f1/a%20b.jpg'])
+    rewritten, count = UrlRewriter().rewrite_series(series)
+    assert count == 1
+    assert rewritten.iloc[0] == 'https://example.com/a.jpg'
+    assert rewritten.iloc[1] is None
+    assert rewritten.iloc[2] == 'https://plpl-file-from-bubble.s3.ap-northeast-2.amazonaws.com/f1/a b.jpg'
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+import pytest
+import url_verify
+from download_manifest import ManifestWriter
+from url_inventory import UrlEntry, UrlInventory
+from url_verify import verify_urls, verify_csv, expected_from_local, urls_from_inventory
+
+# 로컬 테스트 서버가 돌려줄 파일 (경로: (크기, content-type))
+FILES = {
+    '/ok.jpg': (10, 'image/jpeg'),
+    '/big.jpg': (99, 'image/jpeg'),
+    '/flaky.jpg': (10, 'image/jpeg'),
+    '/raw.jpg': (10, 'binary/octet-stream'),
+}
+
+# /flaky.jpg는 처음 이 횟수만큼 503을 돌려줍니다
+FLAKY_FAILURES = 2
+
+
+class FakeS3Handler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            if self.path == '/flaky.jpg' and server.flaky_failures:
+                server.flaky_failures -= 1
+                self.send_response(503)
+                self.end_headers()
+                return
+        if self.path not in FILES:
+            self.send_response(404)
+            self.end_headers()
+            return
+        size, content_type = FILES[self.path]
+        self.send_response(200)
+        self.send_header('Content-Length', str(size))
+        self.send_header('Content-Type', content_type)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FakeS3Handler)
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.flaky_failures = FLAKY_FAILURES
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    # 재시도 대기 시간만 줄입니다 (요청과 재시도 횟수는 그대로)
+    monkeypatch.setattr(url_verify.random, 'uniform', lambda a, b: 0.01)
+
+
+def by_url(results):
+    return {result['url'].rsplit('/', 1)[1]: result for result in results}
+
+
+def test_verify_urls_reports_missing_and_size_mismatch(server):
+    urls = [f"{server.base_url}/{name}" for name in ('ok.jpg', 'big.jpg', 'missing.jpg')]
+    expected = {url: {'size': 10, 'content_type': 'image/jpeg'} for url in urls}
+
+    results = by_url(asyncio.run(verify_urls(urls, expected, retries=0)))
+
+    assert results['ok.jpg']['problem'] is None
+    assert results['big.jpg']['problem'] == 'size_mismatch'
+    assert results['big.jpg']['size'] == 99
+    assert results['missing.jpg']['problem'] == 'missing'
+    assert results['missing.jpg']['status'] == 404
+
+
+def test_verify_urls_retries_on_503(server):
+    url = f"{server.base_url}/flaky.jpg"
+
+    results = asyncio.run(verify_urls([url], {url: {'size': 10}}, retries=3))
+
+    assert results[0]['status'] == 200
+    assert results[0]['problem'] is None
+    assert server.requests.count('/flaky.jpg') == FLAKY_FAILURES + 1
+
+
+def test_verify_urls_gives_up_after_retries(server):
+    server.flaky_failures = 10
+    url = f"{server.base_url}/flaky.jpg"
+
+    results = asyncio.run(verify_urls([url], retries=1))
+
+    assert results[0]['status'] == 503
+    assert results[0]['problem'] == 'error'
+    assert server.requests.count('/flaky.jpg') == 2
+
+
+def test_verify_csv_writes_report_with_local_sizes(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    local_dir = tmp_path / 'downloads'
+    local_dir.mkdir()
+    (local_dir / 'ok.jpg').write_bytes(b'x' * 10)
+    (local_dir / 'big.jpg').write_bytes(b'x' * 10)
+    csv_path = tmp_path / 'album_converted.csv'
+    pd.DataFrame({
+        'cover': [f"{server.base_url}/ok.jpg", f"{server.base_url}/big.jpg", f"{server.base_url}/ok.jpg"],
+        'logo': [f"{server.base_url}/missing.jpg", 'not a url', ''],
+    }).to_csv(csv_path, index=False)
+
+    report_path = asyncio.run(verify_csv(str(csv_path), str(local_dir),
+                                         pattern=r'^http://127\.0\.0\.1:\d+/', retries=0))
+
+    report = pd.read_csv(tmp_path / report_path)
+    assert sorted(zip(report['problem'], report['url'].str.rsplit('/', n=1).str[1])) == [
+        ('missing', 'missing.jpg'),
+        ('size_mismatch', 'big.jpg'),
+    ]
+    # 같은 URL은 한 번만 검사합니다
+    assert server.requests.count('/ok.jpg') == 1
+
+
+def test_content_type_is_compared_only_with_manifest_values(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    url = f"{server.base_url}/raw.jpg"
+    csv_path = tmp_path / 'album_converted.csv'
+    pd.DataFrame({'cover': [url]}).to_csv(csv_path, index=False)
+
+    # 확장자로 추측하지 않으므로 binary/octet-stream으로 저장된 객체도 정상입니다
+    report_path = asyncio.run(verify_csv(str(csv_path), pattern=r'^http://127\.0\.0\.1:\d+/', retries=0))
+    assert pd.read_csv(tmp_path / report_path)['problem'].isna().all()
+
+    local_dir = tmp_path / 'downloads'
+    local_dir.mkdir()
+    assert expected_from_local([url], str(local_dir))[url]['content_type'] is None
+    with ManifestWriter(str(local_dir / 'manifest.jsonl')) as manifest:
+        manifest.add('raw.jpg', url, 10, '0' * 64, content_type='image/jpeg')
+
+    expected = expected_from_local([url], str(local_dir))
+    assert expected[url]['content_type'] == 'image/jpeg'
+    results = asyncio.run(verify_urls([url], expected, retries=0))
+    assert results[0]['problem'] == 'content_type_mismatch'
+
+
+def test_urls_from_inventory_uses_manifest_content_type(tmp_path):
+    entries = [UrlEntry(0, 'cover', '//x.cdn.bubble.io/f1/a.jpg', 'https://x.cdn.bubble.io/f1/a.jpg', 'f1/a.jpg'),
+               UrlEntry(0, 'logo', '//x.cdn.bubble.io/f1/b.png', 'https://x.cdn.bubble.io/f1/b.png', 'f1/b.png')]
+    inventory = UrlInventory(['cover', 'logo'], None, entries)
+    (tmp_path / 'f1').mkdir()
+    (tmp_path / 'f1' / 'a.jpg').write_bytes(b'x' * 3)
+    with ManifestWriter(str(tmp_path / 'manifest.jsonl')) as manifest:
+        manifest.add('f1/a.jpg', entries[0].normalized_url, 3, '0' * 64, content_type='binary/octet-stream')
+
+    expected = list(urls_from_inventory(inventory, local_dir=str(tmp_path)).values())
+    assert expected == [{'size': 3, 'content_type': 'binary/octet-stream'},
+                        {'size': None, 'content_type': None}]
+    assert [value['content_type'] for value in urls_from_inventory(inventory).values()] == [None, None]
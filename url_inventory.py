@@ -0,0 +1,189 @@
+import csv
+import os
+from typing import Dict, Iterator, List, NamedTuple, Optional
+from urllib.parse import unquote
+
+# 인벤토리 매니페스트 파일 이름
+INVENTORY_NAME = 'url_inventory.csv'
+
+def is_bubble_url(value: str) -> bool:
+    """
+    주어진 값이 bubble.io 파일 URL인지 확인하는 함수
+
+    Args:
+        value (str): 확인할 URL 문자열
+
+    Returns:
+        bool: bubble.io URL이면 True, 아니면 False
+    """
+    return isinstance(value, str) and 'bubble.io' in value
+
+def normalize_url(url: str) -> str:
+    """
+    URL을 정규화하는 함수
+    - '//'로 시작하는 URL을 'https://'로 변환
+
+    Args:
+        url (str): 정규화할 URL
+
+    Returns:
+        str: 정규화된 URL
+    """
+    # URL 디코딩
+    decoded_url = unquote(url)
+
+    # '//'로 시작하는 경우 'https:'를 추가
+    if decoded_url.startswith('//'):
+        return f'https:{decoded_url}'
+    # 'http://' 또는 'https://'로 시작하지 않는 경우 'https://'를 추가
+    elif not decoded_url.startswith(('http://', 'https://')):
+        return f'https://{decoded_url}'
+    return decoded_url
+
+def get_file_name(url: str) -> str:
+    """
+    URL에서 파일 경로를 추출하는 함수
+
+    Args:
+        url (str): 파일 URL
+
+    Returns:
+        str: 파일 경로
+    """
+    # URL 디코딩
+    decoded_url = unquote(url)
+
+    # bubble.io 도메인 이후의 경로를 추출
+    path = decoded_url.split('.bubble.io/')[-1]
+    if not path:
+        return decoded_url.split('/')[-1]
+
+    return path
+
+class UrlEntry(NamedTuple):
+    """인벤토리 항목 하나 (CSV의 셀 하나)"""
+    row: int  # 데이터 행 번호 (0부터)
+    column: str  # 컬럼 이름
+    url: str  # CSV에 있던 원본 값
+    normalized_url: str  # 정규화된 URL
+    target_path: str  # 다운로드/업로드 대상 상대 경로
+
+class UrlInventory:
+    """
+    CSV를 한 번만 훑어서 만든 bubble.io URL 목록
+
+    다운로드, 링크 변환, 검사 단계가 CSV를 다시 훑지 않고 이 목록을 함께 사용합니다.
+    같은 URL은 한 번만 정규화합니다.
+    """
+
+    def __init__(self, fieldnames: List[str], rows: Optional[List[Dict[str, str]]], entries: List[UrlEntry]):
+        """
+        Args:
+            fieldnames (List[str]): CSV 컬럼 목록
+            rows (List[Dict[str, str]], optional): CSV 행들 (매니페스트에서 읽은 경우 None)
+            entries (List[UrlEntry]): URL 항목들 (행 순서)
+        """
+        self.fieldnames = fieldnames
+        self.rows = rows
+        self.entries = entries
+
+    @property
+    def columns(self) -> List[str]:
+        """URL이 하나라도 있는 컬럼 (CSV 컬럼 순서)"""
+        found = {entry.column for entry in self.entries}
+        return [col for col in self.fieldnames if col in found]
+
+    def unique_urls(self) -> Dict[str, UrlEntry]:
+        """중복 없는 원본 URL별 첫 항목 (처음 나온 순서)"""
+        unique = {}
+        for entry in self.entries:
+            unique.setdefault(entry.url, entry)
+        return unique
+
+    def unique_targets(self) -> Dict[str, UrlEntry]:
+        """
+        중복 없는 대상 경로별 첫 항목 (처음 나온 순서)
+        원본 값이 달라도 정규화하면 같은 파일이 되는 URL은 한 번만 받아야 하므로 다운로드는 이것을 씁니다
+        """
+        unique = {}
+        for entry in self.entries:
+            unique.setdefault(entry.target_path, entry)
+        return unique
+
+    def by_row(self) -> Dict[int, List[UrlEntry]]:
+        """행 번호별 항목들"""
+        rows = {}
+        for entry in self.entries:
+            rows.setdefault(entry.row, []).append(entry)
+        return rows
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[UrlEntry]:
+        return iter(self.entries)
+
+    def write(self, manifest_path: str):
+        """
+        인벤토리를 CSV 매니페스트로 저장하는 함수
+
+        Args:
+            manifest_path (str): 저장할 파일 경로
+        """
+        with open(manifest_path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(UrlEntry._fields)
+            writer.writerows(self.entries)
+
+def build_inventory(csv_path: str, is_url=is_bubble_url) -> UrlInventory:
+    """
+    CSV 파일을 한 번만 읽고 훑어서 URL 인벤토리를 만드는 함수
+
+    Args:
+        csv_path (str): CSV 파일 경로
+        is_url (callable): 값이 처리할 URL인지 확인하는 함수
+
+    Returns:
+        UrlInventory: URL 인벤토리 (CSV 행도 함께 보관)
+    """
+    if not os.path.exists(csv_path):
+        raise Exception(f"CSV 파일을 찾을 수 없습니다: {csv_path}")
+
+    with open(csv_path, 'r', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        rows = list(reader)
+        fieldnames = list(reader.fieldnames or [])
+
+    entries = []
+    resolved = {}
+    for row_index, row in enumerate(rows):
+        for col in fieldnames:
+            value = row.get(col)
+            if not is_url(value):
+                continue
+            if value not in resolved:
+                normalized = normalize_url(value)
+                resolved[value] = (normalized, get_file_name(normalized))
+            normalized, target_path = resolved[value]
+            entries.append(UrlEntry(row_index, col, value, normalized, target_path))
+
+    return UrlInventory(fieldnames, rows, entries)
+
+def load_inventory(manifest_path: str) -> UrlInventory:
+    """
+    저장된 인벤토리 매니페스트를 읽는 함수 (CSV 행은 없음)
+
+    Args:
+        manifest_path (str): 매니페스트 파일 경로
+
+    Returns:
+        UrlInventory: URL 인벤토리
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        entries = [
+            UrlEntry(int(r['row']), r['column'], r['url'], r['normalized_url'], r['target_path'])
+            for r in reader
+        ]
+    fieldnames = list(dict.fromkeys(entry.column for entry in entries))
+    return UrlInventory(fieldnames, None, entries)
@@ -0,0 +1,353 @@
+import asyncio
+import csv
+import os
+import random
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import unquote, urlsplit
+import aiohttp
+import pandas as pd
+from tqdm import tqdm
+from passed.rate_limit import HostRateLimiter
+from passed.url_rewrite import UrlRewriter
+from url_inventory import UrlInventory, load_inventory, INVENTORY_NAME
+from download_layout import load_layout
+from download_manifest import load_manifest, MANIFEST_NAME
+
+# 검사할 URL 패턴 (변환된 S3 URL)
+TARGET_URL_PATTERN = r'^https?://[\w.-]+\.s3\.[\w-]+\.amazonaws\.com/'
+
+# 동시에 보낼 최대 요청 수
+CONCURRENCY = 64
+
+# 호스트별 초당 최대 요청 수
+PER_HOST_RATE = 200
+
+# 실패 시 재시도 횟수
+MAX_RETRIES = 3
+
+# 요청 제한 시간(초)
+TIMEOUT = 30
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 파일이 없다고 판단할 HTTP 상태 코드
+# (S3는 목록 조회 권한이 없으면 없는 파일에 403을 돌려줍니다)
+MISSING_STATUSES = {403, 404}
+
+def collect_urls(csv_path: str, pattern: str = TARGET_URL_PATTERN) -> List[str]:
+    """
+    CSV 파일에서 검사할 URL을 중복 없이 모으는 함수
+
+    Args:
+        csv_path (str): 변환된 CSV 파일 경로
+        pattern (str): 검사할 URL 정규식
+
+    Returns:
+        List[str]: 중복 없는 URL 목록 (처음 나온 순서)
+    """
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False, encoding='utf-8')
+    urls = {}
+    for col in df.columns:
+        values = df[col].str.strip()
+        matched = values[values.str.contains(pattern, regex=True, flags=re.IGNORECASE)]
+        for url in matched.unique():
+            urls.setdefault(url, None)
+    return list(urls)
+
+def load_content_types(local_dir: str) -> Dict[str, Optional[str]]:
+    """
+    다운로드 매니페스트에 기록된 파일별 Content-Type을 읽는 함수
+    확장자로 추측한 값은 실제 저장된 값(예: binary/octet-stream)과 다를 수 있으므로 쓰지 않습니다
+
+    Args:
+        local_dir (str): csv_file_download로 받은 파일 폴더
+
+    Returns:
+        Dict[str, str]: {다운로드 폴더 안의 상대 경로: Content-Type} (매니페스트가 없으면 빈 딕셔너리)
+    """
+    manifest_path = os.path.join(local_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    return {entry['path']: entry.get('content_type') for entry in load_manifest(manifest_path)}
+
+def expected_from_local(urls: Iterable[str], local_dir: str) -> Dict[str, Dict[str, Optional[object]]]:
+    """
+    다운로드 폴더의 파일로 URL별 기대 크기와 content-type을 구하는 함수
+    URL 경로(버킷 호스트 이후)와 다운로드 폴더 안의 상대 경로가 같다고 가정합니다
+    content-type은 다운로드 매니페스트에 기록된 값이 있을 때만 비교합니다
+
+    Args:
+        urls (Iterable[str]): URL 목록
+        local_dir (str): csv_file_download로 받은 파일 폴더
+
+    Returns:
+        Dict: {URL: {'size': 기대 크기, 'content_type': 기대 content-type}}
+    """
+    content_types = load_content_types(local_dir)
+    expected = {}
+    for url in urls:
+        key = unquote(urlsplit(url).path).lstrip('/')
+        local_path = os.path.join(local_dir, key)
+        expected[url] = {
+            'size': os.path.getsize(local_path) if os.path.isfile(local_path) else None,
+            'content_type': content_types.get(key),
+        }
+    return expected
+
+def urls_from_inventory(inventory: UrlInventory, rewriter: Optional[UrlRewriter] = None,
+                        table: Optional[str] = None,
+                        local_dir: Optional[str] = None) -> Dict[str, Dict[str, Optional[object]]]:
+    """
+    URL 인벤토리로 검사할 변환 URL과 기대값을 구하는 함수
+    변환된 CSV를 다시 훑지 않고, 다운로드 때 기록한 대상 경로로 로컬 파일을 바로 찾습니다
+
+    Args:
+        inventory (UrlInventory): URL 인벤토리
+        rewriter (UrlRewriter, optional): URL 변환기 (기본값: 기본 규칙)
+        table (str, optional): 테이블 이름 (테이블별 규칙 선택용)
+        local_dir (str, optional): 크기 비교에 쓸 다운로드 폴더
+
+    Returns:
+        Dict: {변환된 URL: {'size': 기대 크기, 'content_type': 기대 content-type}} (처음 나온 순서)
+    """
+    rewriter = rewriter or UrlRewriter()
+    # 해시 폴더로 나눠 저장한 경우 대응표로 실제 파일 위치를 찾습니다
+    stored_paths = load_layout(local_dir) if local_dir else {}
+    # content-type은 다운로드 매니페스트에 기록된 값이 있을 때만 비교합니다
+    content_types = load_content_types(local_dir) if local_dir else {}
+    expected = {}
+    for entry in inventory.unique_urls().values():
+        url = rewriter.rewrite_value(entry.url, column=entry.column, table=table)
+        if url == entry.url or url in expected:
+            continue
+        stored_path = stored_paths.get(entry.target_path, entry.target_path)
+        local_path = os.path.join(local_dir, stored_path) if local_dir else None
+        expected[url] = {
+            'size': os.path.getsize(local_path) if local_path and os.path.isfile(local_path) else None,
+            'content_type': content_types.get(stored_path.replace(os.sep, '/')),
+        }
+    return expected
+
+async def head_url(session: aiohttp.ClientSession, url: str, limiter: HostRateLimiter,
+                   retries: int = MAX_RETRIES) -> Dict[str, object]:
+    """
+    URL 하나에 HEAD 요청을 보내는 함수 (429/5xx/연결 오류는 재시도)
+
+    Args:
+        session (aiohttp.ClientSession): 공유 세션 (연결 재사용)
+        url (str): 검사할 URL
+        limiter (HostRateLimiter): 호스트별 속도 제한
+        retries (int): 재시도 횟수
+
+    Returns:
+        Dict: status, size, content_type, error
+    """
+    result = {'status': None, 'size': None, 'content_type': None, 'error': None}
+    for attempt in range(retries + 1):
+        await limiter.acquire_async(url)
+        try:
+            async with session.head(url, allow_redirects=True) as response:
+                result['status'] = response.status
+                result['size'] = response.content_length
+                result['content_type'] = response.content_type if 'Content-Type' in response.headers else None
+                result['error'] = None
+                if response.status not in RETRY_STATUSES:
+                    return result
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            result['error'] = str(e) or type(e).__name__
+
+        if attempt < retries:
+            # 지수 백오프 + 지터
+            await asyncio.sleep(min(30, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.5))
+    return result
+
+def find_problem(result: Dict[str, object], expected: Optional[Dict[str, object]]) -> Optional[str]:
+    """
+    HEAD 결과와 기대값을 비교해서 문제를 찾는 함수
+
+    Returns:
+        str: 문제 종류 (missing, error, size_mismatch, content_type_mismatch). 문제가 없으면 None
+    """
+    status = result['status']
+    if status is None or status in RETRY_STATUSES:
+        return 'error'
+    if status in MISSING_STATUSES:
+        return 'missing'
+    if status >= 400:
+        return 'error'
+    if not expected:
+        return None
+    if expected.get('size') is not None and result['size'] is not None and expected['size'] != result['size']:
+        return 'size_mismatch'
+    if expected.get('content_type') and result['content_type'] != expected['content_type']:
+        return 'content_type_mismatch'
+    return None
+
+async def verify_urls(urls: List[str], expected: Optional[Dict[str, Dict[str, object]]] = None,
+                      concurrency: int = CONCURRENCY, per_host_rate: float = PER_HOST_RATE,
+                      retries: int = MAX_RETRIES, timeout: float = TIMEOUT) -> List[Dict[str, object]]:
+    """
+    URL들이 실제로 존재하는지 동시에 HEAD 요청으로 확인하는 함수
+
+    Args:
+        urls (List[str]): 검사할 URL 목록
+        expected (Dict, optional): URL별 기대 크기/content-type
+        concurrency (int): 동시에 보낼 최대 요청 수
+        per_host_rate (float): 호스트별 초당 최대 요청 수
+        retries (int): 재시도 횟수
+        timeout (float): 요청 제한 시간(초)
+
+    Returns:
+        List[Dict]: URL별 검사 결과
+    """
+    expected = expected or {}
+    limiter = HostRateLimiter(per_host_rate)
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    results = []
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        async def check(url):
+            async with semaphore:
+                result = await head_url(session, url, limiter, retries)
+            url_expected = expected.get(url) or {}
+            result.update({
+                'url': url,
+                'expected_size': url_expected.get('size'),
+                'expected_content_type': url_expected.get('content_type'),
+            })
+            result['problem'] = find_problem(result, url_expected)
+            return result
+
+        tasks = [asyncio.ensure_future(check(url)) for url in urls]
+        with tqdm(total=len(tasks), desc="링크 검사 진행률") as pbar:
+            for task in asyncio.as_completed(tasks):
+                results.append(await task)
+                pbar.update(1)
+
+    return results
+
+def write_report(results: List[Dict[str, object]], report_path: str) -> int:
+    """
+    문제가 있는 URL만 CSV 보고서로 저장하는 함수
+
+    Returns:
+        int: 문제가 있는 URL 수
+    """
+    fieldnames = ['url', 'problem', 'status', 'size', 'expected_size',
+                  'content_type', 'expected_content_type', 'error']
+    problems = [r for r in results if r['problem']]
+    with open(report_path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(sorted(problems, key=lambda r: (r['problem'], r['url'])))
+    return len(problems)
+
+async def verify_csv(csv_path: str, local_dir: Optional[str] = None,
+                     pattern: str = TARGET_URL_PATTERN, **options) -> str:
+    """
+    변환된 CSV의 URL을 검사하고 보고서를 저장하는 메인 함수
+
+    Args:
+        csv_path (str): csv_link_trans로 변환된 CSV 파일 경로
+        local_dir (str, optional): 크기 비교에 쓸 다운로드 폴더
+        pattern (str): 검사할 URL 정규식 (로컬 테스트 서버 등을 검사할 때 변경)
+        **options: verify_urls에 넘길 옵션
+
+    Returns:
+        str: 보고서 파일 경로
+    """
+    if not os.path.exists(csv_path):
+        raise Exception(f"CSV 파일을 찾을 수 없습니다: {csv_path}")
+
+    urls = collect_urls(csv_path, pattern)
+    if not urls:
+        print("❌ 검사할 URL을 찾을 수 없습니다.")
+        return None
+
+    print(f"🔍 중복 없는 URL {len(urls)}개 검사 시작")
+    # 다운로드 폴더가 없으면 비교할 기대값이 없으므로 있는지만 확인합니다
+    expected = expected_from_local(urls, local_dir) if local_dir else None
+    results = await verify_urls(urls, expected, **options)
+
+    csv_name = os.path.splitext(os.path.basename(csv_path))[0]
+    return report_results(results, csv_name)
+
+async def verify_inventory(inventory_path: str, local_dir: Optional[str] = None,
+                           rewriter: Optional[UrlRewriter] = None, table: Optional[str] = None,
+                           **options) -> str:
+    """
+    URL 인벤토리의 URL을 변환 규칙대로 바꿔서 검사하고 보고서를 저장하는 함수
+
+    Args:
+        inventory_path (str): csv_file_download가 저장한 URL 인벤토리 경로
+        local_dir (str, optional): 크기 비교에 쓸 다운로드 폴더 (기본값: 인벤토리가 있는 폴더)
+        rewriter (UrlRewriter, optional): URL 변환기 (기본값: 기본 규칙)
+        table (str, optional): 테이블 이름 (테이블별 규칙 선택용)
+        **options: verify_urls에 넘길 옵션
+
+    Returns:
+        str: 보고서 파일 경로
+    """
+    if not os.path.exists(inventory_path):
+        raise Exception(f"인벤토리 파일을 찾을 수 없습니다: {inventory_path}")
+
+    local_dir = local_dir or os.path.dirname(os.path.abspath(inventory_path))
+    expected = urls_from_inventory(load_inventory(inventory_path), rewriter, table, local_dir)
+    if not expected:
+        print("❌ 검사할 URL을 찾을 수 없습니다.")
+        return None
+
+    print(f"🔍 중복 없는 URL {len(expected)}개 검사 시작")
+    results = await verify_urls(list(expected), expected, **options)
+    inventory_name = os.path.splitext(os.path.basename(inventory_path))[0]
+    return report_results(results, inventory_name)
+
+def report_results(results: List[Dict[str, object]], name: str) -> str:
+    """
+    검사 결과를 보고서로 저장하고 요약을 출력하는 함수
+
+    Args:
+        results (List[Dict]): verify_urls 결과
+        name (str): 보고서 파일 이름 앞부분
+
+    Returns:
+        str: 보고서 파일 경로
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    report_path = f"{name}_verify_{timestamp}.csv"
+    problem_count = write_report(results, report_path)
+
+    counts = {}
+    for result in results:
+        if result['problem']:
+            counts[result['problem']] = counts.get(result['problem'], 0) + 1
+
+    print(f"\n🎉 검사 완료!")
+    print(f"✅ 정상: {len(results) - problem_count}개")
+    for problem, count in sorted(counts.items()):
+        print(f"❌ {problem}: {count}개")
+    print(f"📁 보고서: {report_path}")
+    return report_path
+
+def main():
+    """
+    메인 함수
+    """
+    csv_path = input("변환된 CSV 또는 URL 인벤토리 파일 경로를 입력하세요: ").strip()
+    local_dir = input("다운로드 폴더 경로를 입력하세요 (크기 비교 생략은 Enter): ").strip() or None
+
+    try:
+        if os.path.basename(csv_path) == INVENTORY_NAME:
+            asyncio.run(verify_inventory(csv_path, local_dir))
+        else:
+            asyncio.run(verify_csv(csv_path, local_dir))
+    except Exception as e:
+        print(f"❌ 오류 발생: {str(e)}")
+
+if __name__ == "__main__":
+    main()